@@ -11,5 +11,7 @@ fi
 # Aplicar migraciones
 python manage.py migrate --noinput
 
-# Iniciar Django (puedes cambiar a gunicorn si es para prod)
-exec python manage.py runserver 0.0.0.0:8020
+# Iniciar Django con un servidor ASGI: los endpoints /eventos/ mantienen la
+# conexión abierta. Un solo worker, porque los suscriptores viven en memoria
+# del proceso (ver torneo/utils/difusion.py).
+exec uvicorn teamservice.asgi:application --host 0.0.0.0 --port 8020
@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "teamservice.settings")
 
 application = get_asgi_application()
+
+from torneo.utils.autocomplete import cargar_al_iniciar  # noqa: E402
+
+cargar_al_iniciar()
@@ -89,6 +89,23 @@ DATABASES = {
     }
 }
 
+# Caché
+# Por defecto en memoria del proceso; con varios procesos o réplicas conviene un
+# backend compartido (CACHE_BACKEND=django.core.cache.backends.redis.RedisCache y
+# CACHE_LOCATION=redis://...) para que las invalidaciones lleguen a todos.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="teamservice"),
+    }
+}
+# Segundos que se guardan las respuestas de listados y detalles (ver
+# torneo/utils/cache_vistas.py). Se invalidan solas al cambiar los datos; el
+# límite solo libera las claves que ya no se usan.
+RESPUESTAS_CACHE_TIMEOUT = config("RESPUESTAS_CACHE_TIMEOUT", default=300, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -137,3 +154,20 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ]
 }
+
+# Imágenes de equipos
+# Las variantes (miniaturas y WebP) se generan en un pool de procesos acotado.
+# IMAGENES_WORKERS=0 las genera en el mismo proceso (útil en tests).
+IMAGENES_WORKERS = config("IMAGENES_WORKERS", default=2, cast=int)
+IMAGENES_PENDIENTES_MAX = config("IMAGENES_PENDIENTES_MAX", default=32, cast=int)
+# Límites de las imágenes subidas (en bytes y en píxeles por lado).
+IMAGENES_TAMANO_MAX = config("IMAGENES_TAMANO_MAX", default=5 * 1024 * 1024, cast=int)
+IMAGENES_DIMENSION_MAX = config("IMAGENES_DIMENSION_MAX", default=4096, cast=int)
+
+# Carga masiva de partidos: elementos admitidos por petición.
+PARTIDOS_LOTE_MAX = config("PARTIDOS_LOTE_MAX", default=1000, cast=int)
+
+# Eventos en vivo (SSE): segundos entre comentarios de keep-alive y eventos que
+# se guardan por suscriptor si no alcanza a leerlos.
+EVENTOS_KEEPALIVE = config("EVENTOS_KEEPALIVE", default=15, cast=float)
+EVENTOS_COLA_MAX = config("EVENTOS_COLA_MAX", default=100, cast=int)
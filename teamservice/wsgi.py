@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "teamservice.settings")
 
 application = get_wsgi_application()
+
+from torneo.utils.autocomplete import cargar_al_iniciar  # noqa: E402
+
+cargar_al_iniciar()
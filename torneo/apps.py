@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TorneoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "torneo"
+
+    def ready(self):
+        from torneo import signals  # noqa: F401
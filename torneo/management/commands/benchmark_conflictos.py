@@ -0,0 +1,125 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.utils.conflictos import partidos_en_conflicto
+
+# Índices (equipo, fecha) que cubren la comprobación de choques.
+INDICES = ("partido_local_fecha_idx", "partido_visitante_fecha_idx")
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la latencia de la comprobación de choques de horario con y sin los "
+        "índices compuestos (equipo, fecha). Trabaja dentro de una transacción que "
+        "se revierte al final, pero conviene ejecutarlo contra una base de pruebas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--partidos", type=int, default=1_000_000)
+        parser.add_argument("--equipos", type=int, default=2_000)
+        parser.add_argument("--consultas", type=int, default=500)
+        parser.add_argument("--lote", type=int, default=10_000)
+        parser.add_argument("--semilla", type=int, default=0)
+
+    def handle(self, *args, **options):
+        aleatorio = random.Random(options["semilla"])
+        with transaction.atomic():
+            muestras = self._poblar(aleatorio, options)
+            con_indices = self._medir(muestras)
+            self._eliminar_indices()
+            sin_indices = self._medir(muestras)
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{options['partidos']} partidos, {len(muestras)} consultas "
+            f"({connection.vendor})"
+        )
+        self._reportar("Antes (solo índices de FK)", sin_indices)
+        self._reportar("Después (índices compuestos)", con_indices)
+
+    def _poblar(self, aleatorio, options):
+        inicio = timezone.now().replace(minute=0, second=0, microsecond=0)
+        institucion = Institucion.objects.create(nombreinstitucion="Benchmark")
+        temporada = Temporada.objects.create(
+            nombretemporada="Benchmark conflictos",
+            descripciontemporada="Benchmark",
+            tipotemporada="Oficial",
+            fechainiciotemporada=inicio,
+            fechafintemporada=inicio + timedelta(days=3650),
+        )
+        torneo = Torneo.objects.create(
+            idtemporada=temporada,
+            nombretorneo="Benchmark conflictos",
+            descripciontorneo="Benchmark",
+            fechainiciotorneo=inicio,
+            fechafintorneo=inicio + timedelta(days=3650),
+        )
+        equipos = Equipo.objects.bulk_create(
+            Equipo(idinstitucion=institucion, nombreequipo=f"Equipo {n}")
+            for n in range(options["equipos"])
+        )
+        ids = [equipo.idequipo for equipo in equipos]
+        horas = 24 * 3650
+
+        lote = []
+        for _ in range(options["partidos"]):
+            local, visitante = aleatorio.sample(ids, 2)
+            lote.append(
+                Partido(
+                    idequipolocal_id=local,
+                    idequipovisitante_id=visitante,
+                    idtorneo=torneo,
+                    idtemporada=temporada,
+                    fechapartido=inicio + timedelta(hours=aleatorio.randrange(horas)),
+                )
+            )
+            if len(lote) >= options["lote"]:
+                Partido.objects.bulk_create(lote)
+                lote = []
+        Partido.objects.bulk_create(lote)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        # Mitad de las consultas repiten una fecha existente (hay choque) y la
+        # otra mitad usan fechas al azar (normalmente sin choque).
+        existentes = list(
+            Partido.objects.filter(idtorneo=torneo)
+            .order_by("?")
+            .values_list("fechapartido", "idequipolocal")[: options["consultas"] // 2]
+        )
+        muestras = [
+            (fecha, [equipo, aleatorio.choice(ids)]) for fecha, equipo in existentes
+        ]
+        while len(muestras) < options["consultas"]:
+            fecha = inicio + timedelta(hours=aleatorio.randrange(horas))
+            muestras.append((fecha, aleatorio.sample(ids, 2)))
+        return muestras
+
+    def _eliminar_indices(self):
+        with connection.cursor() as cursor:
+            for nombre in INDICES:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(nombre)}")
+
+    def _medir(self, muestras):
+        tiempos = []
+        for fecha, equipos in muestras:
+            comienzo = time.perf_counter()
+            partidos_en_conflicto(fecha, equipos).exists()
+            tiempos.append((time.perf_counter() - comienzo) * 1000)
+        return tiempos
+
+    def _reportar(self, titulo, tiempos):
+        tiempos = sorted(tiempos)
+        p95 = tiempos[int(len(tiempos) * 0.95) - 1]
+        self.stdout.write(
+            f"{titulo}: media {statistics.mean(tiempos):.3f} ms, "
+            f"p50 {statistics.median(tiempos):.3f} ms, p95 {p95:.3f} ms"
+        )
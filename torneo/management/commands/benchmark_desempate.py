@@ -0,0 +1,137 @@
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from torneo.models import Equipo, Institucion, Partido, Posicion, Temporada, Torneo
+from torneo.utils.carga_masiva import crear_lote
+from torneo.utils.desempate import ordenar_posiciones
+from torneo.utils.fixture import generar_fixture
+from torneo.utils.posiciones import aportes, recalcular_posiciones
+
+CRITERIOS = "puntosdirectos,diferenciadirecta,golesdirectos,diferenciagoles,golesfavor"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el motor de desempate (matriz NumPy) con recalcular las mini "
+        "tablas consultando los partidos de cada grupo empatado. Trabaja dentro "
+        "de una transacción que se revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--equipos", type=int, default=100)
+        parser.add_argument("--repeticiones", type=int, default=20)
+        parser.add_argument("--semilla", type=int, default=0)
+
+    def handle(self, *args, **options):
+        aleatorio = random.Random(options["semilla"])
+        with transaction.atomic():
+            torneo = self._poblar(aleatorio, options["equipos"])
+            filas = list(Posicion.objects.filter(idtorneo=torneo).order_by("-puntos"))
+            grupos = Counter(fila.puntos for fila in filas)
+            empatados = sum(n for n in grupos.values() if n > 1)
+
+            motor, orden_motor = self._medir(
+                lambda: ordenar_posiciones(torneo, filas), options["repeticiones"]
+            )
+            ingenuo, orden_ingenuo = self._medir(
+                lambda: self._ingenuo(torneo, filas), options["repeticiones"]
+            )
+            partidos = Partido.objects.filter(idtorneo=torneo).count()
+            transaction.set_rollback(True)
+
+        if [f.idequipo_id for f in orden_motor] != [f.idequipo_id for f in orden_ingenuo]:
+            self.stderr.write("Los dos métodos no producen el mismo orden")
+        self.stdout.write(
+            f"{options['equipos']} equipos, {partidos} partidos, {empatados} equipos "
+            f"empatados en puntos ({connection.vendor})"
+        )
+        self._reportar("Mini tablas por consulta", ingenuo)
+        self._reportar("Matriz NumPy", motor)
+
+    def _poblar(self, aleatorio, cantidad):
+        inicio = timezone.now()
+        institucion = Institucion.objects.create(nombreinstitucion="Benchmark")
+        temporada = Temporada.objects.create(
+            nombretemporada="Benchmark desempate",
+            descripciontemporada="Benchmark",
+            tipotemporada="Oficial",
+            fechainiciotemporada=inicio,
+            fechafintemporada=inicio + timedelta(days=365),
+        )
+        torneo = Torneo.objects.create(
+            idtemporada=temporada,
+            nombretorneo="Benchmark desempate",
+            descripciontorneo="Benchmark",
+            fechainiciotorneo=inicio,
+            fechafintorneo=inicio + timedelta(days=365),
+            criteriosdesempate=CRITERIOS,
+        )
+        equipos = Equipo.objects.bulk_create(
+            Equipo(idinstitucion=institucion, nombreequipo=f"Equipo {n}")
+            for n in range(cantidad)
+        )
+        partidos = generar_fixture(torneo, equipos, ida_y_vuelta=True)
+        for partido in partidos:
+            partido.marcadorequipolocal = aleatorio.choice((0, 0, 1, 1, 2, 3))
+            partido.marcadorequipovisitante = aleatorio.choice((0, 0, 1, 1, 2))
+        crear_lote(partidos)
+        recalcular_posiciones([torneo.idtorneo])
+        return torneo
+
+    def _ingenuo(self, torneo, filas):
+        """Cada grupo empatado consulta sus partidos y arma su mini tabla."""
+        criterios = ["puntos", *torneo.criterios_desempate()]
+        return self._resolver_ingenuo(torneo, filas, criterios)
+
+    def _resolver_ingenuo(self, torneo, grupo, criterios):
+        if len(grupo) < 2:
+            return grupo
+        if not criterios:
+            return sorted(grupo, key=lambda fila: fila.idequipo_id)
+        criterio = criterios[0]
+        if hasattr(grupo[0], criterio):
+            claves = {fila.idequipo_id: getattr(fila, criterio) for fila in grupo}
+        else:
+            claves = self._mini_tabla(torneo, grupo, criterio)
+        ordenados = []
+        for valor in sorted(set(claves.values()), reverse=True):
+            subgrupo = [fila for fila in grupo if claves[fila.idequipo_id] == valor]
+            ordenados += self._resolver_ingenuo(torneo, subgrupo, criterios[1:])
+        return ordenados
+
+    def _mini_tabla(self, torneo, grupo, criterio):
+        ids = [fila.idequipo_id for fila in grupo]
+        campo = {
+            "puntosdirectos": "puntos",
+            "diferenciadirecta": "diferenciagoles",
+            "golesdirectos": "golesfavor",
+        }[criterio]
+        totales = Counter({equipo: 0 for equipo in ids})
+        partidos = Partido.objects.filter(
+            idtorneo=torneo, idequipolocal__in=ids, idequipovisitante__in=ids
+        )
+        for partido in partidos:
+            for _, equipo, aporte in aportes(partido.resultado()):
+                totales[equipo] += aporte[campo]
+        return totales
+
+    def _medir(self, funcion, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            comienzo = time.perf_counter()
+            resultado = funcion()
+            tiempos.append((time.perf_counter() - comienzo) * 1000)
+        return tiempos, resultado
+
+    def _reportar(self, titulo, tiempos):
+        self.stdout.write(
+            f"{titulo}: media {statistics.mean(tiempos):.2f} ms, "
+            f"p50 {statistics.median(tiempos):.2f} ms, máx {max(tiempos):.2f} ms"
+        )
@@ -0,0 +1,134 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.serializers import PartidoSerializer, TorneoSerializer
+from torneo.utils.carga_masiva import crear_lote
+from torneo.utils.lectura import plan_lectura
+from torneo.views import apply_select_related
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara las filas por segundo de los listados de partidos y torneos "
+        "con el serializador y con values_list() (utils/lectura.py), y verifica "
+        "que el JSON sea idéntico. Trabaja dentro de una transacción que se "
+        "revierte al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--partidos", type=int, default=5000)
+        parser.add_argument("--torneos", type=int, default=1000)
+        parser.add_argument("--pagina", type=int, default=1000)
+        parser.add_argument("--repeticiones", type=int, default=10)
+        parser.add_argument("--semilla", type=int, default=0)
+
+    def handle(self, *args, **options):
+        aleatorio = random.Random(options["semilla"])
+        with transaction.atomic():
+            temporada = self._poblar(aleatorio, options["partidos"], options["torneos"])
+            casos = [
+                (
+                    "Partidos",
+                    PartidoSerializer,
+                    Partido.objects.filter(idtemporada=temporada).order_by("idpartido"),
+                ),
+                (
+                    "Torneos",
+                    TorneoSerializer,
+                    Torneo.objects.filter(idtemporada=temporada).order_by("idtorneo"),
+                ),
+            ]
+            resultados = []
+            for titulo, serializer_class, queryset in casos:
+                pagina = queryset[: options["pagina"]]
+                serializador, json_serializador = self._medir(
+                    lambda: self._serializador(pagina, serializer_class),
+                    options["repeticiones"],
+                )
+                plan = plan_lectura(serializer_class)
+                lectura, json_lectura = self._medir(
+                    lambda: plan.leer(pagina), options["repeticiones"]
+                )
+                if json_serializador != json_lectura:
+                    self.stderr.write(f"{titulo}: el JSON no es idéntico")
+                filas = len(pagina)
+                resultados.append((titulo, filas, serializador, lectura))
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"Páginas de hasta {options['pagina']} filas, "
+            f"{options['repeticiones']} repeticiones ({connection.vendor})"
+        )
+        for titulo, filas, serializador, lectura in resultados:
+            self._reportar(f"{titulo} con el serializador", filas, serializador)
+            self._reportar(f"{titulo} con values_list()", filas, lectura)
+
+    def _poblar(self, aleatorio, partidos, torneos):
+        inicio = timezone.now()
+        institucion = Institucion.objects.create(nombreinstitucion="Benchmark")
+        temporada = Temporada.objects.create(
+            nombretemporada="Benchmark lectura",
+            descripciontemporada="Benchmark",
+            tipotemporada="Oficial",
+            fechainiciotemporada=inicio,
+            fechafintemporada=inicio + timedelta(days=365),
+        )
+        lista = Torneo.objects.bulk_create(
+            Torneo(
+                idtemporada=temporada,
+                nombretorneo=f"Benchmark lectura {n}",
+                descripciontorneo="Benchmark",
+                fechainiciotorneo=inicio,
+                fechafintorneo=inicio + timedelta(days=365),
+            )
+            for n in range(torneos)
+        )
+        equipos = Equipo.objects.bulk_create(
+            Equipo(idinstitucion=institucion, nombreequipo=f"Equipo {n}")
+            for n in range(60)
+        )
+        lote = []
+        for n in range(partidos):
+            local, visitante = aleatorio.sample(equipos, 2)
+            jugado = aleatorio.random() < 0.8
+            lote.append(
+                Partido(
+                    fechapartido=inicio + timedelta(minutes=n, microseconds=n),
+                    idequipolocal=local,
+                    idequipovisitante=visitante,
+                    idtorneo=aleatorio.choice(lista),
+                    idtemporada=temporada,
+                    marcadorequipolocal=aleatorio.randint(0, 4) if jugado else None,
+                    marcadorequipovisitante=aleatorio.randint(0, 4) if jugado else None,
+                )
+            )
+        crear_lote(lote)
+        return temporada
+
+    def _serializador(self, pagina, serializer_class):
+        return serializer_class(
+            apply_select_related(pagina, serializer_class), many=True
+        ).data
+
+    def _medir(self, funcion, repeticiones):
+        tiempos = []
+        for _ in range(repeticiones):
+            comienzo = time.perf_counter()
+            datos = funcion()
+            tiempos.append(time.perf_counter() - comienzo)
+        return tiempos, JSONRenderer().render(datos)
+
+    def _reportar(self, titulo, filas, tiempos):
+        mediana = statistics.median(tiempos)
+        self.stdout.write(
+            f"{titulo}: {filas / mediana:,.0f} filas/s "
+            f"(p50 {mediana * 1000:.2f} ms, máx {max(tiempos) * 1000:.2f} ms)"
+        )
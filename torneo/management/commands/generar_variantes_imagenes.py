@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from torneo.models import Imagen
+from torneo.utils.imagenes import generar_variantes, guardar_variantes
+
+
+class Command(BaseCommand):
+    help = "Genera las miniaturas de las imágenes de equipos que aún no las tienen."
+
+    def handle(self, *args, **options):
+        pendientes = Imagen.objects.filter(variantes__isnull=True).values_list(
+            "hashimagen", "datosimagen"
+        )
+
+        total = 0
+        for hashimagen, datos in pendientes.iterator(chunk_size=50):
+            try:
+                guardar_variantes(hashimagen, generar_variantes(bytes(datos)))
+            except Exception as e:
+                self.stderr.write(f"{hashimagen}: {e}")
+                continue
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Variantes generadas para {total} imágenes"))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from torneo.utils.posiciones import recalcular_posiciones
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero la tabla de posiciones materializada."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--torneo", type=int, action="append", help="Solo este torneo (repetible)."
+        )
+
+    def handle(self, *args, **options):
+        filas = recalcular_posiciones(options["torneo"])
+        self.stdout.write(self.style.SUCCESS(f"Tabla de posiciones: {filas} filas"))
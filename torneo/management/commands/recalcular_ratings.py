@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from torneo.utils.ratings import reconstruir_ratings
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero los ratings Elo repitiendo todos los partidos jugados."
+
+    def handle(self, *args, **options):
+        partidos = reconstruir_ratings()
+        self.stdout.write(self.style.SUCCESS(f"Ratings: {partidos} partidos procesados"))
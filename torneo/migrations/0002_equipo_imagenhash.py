@@ -0,0 +1,29 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def calcular_hashes(apps, schema_editor):
+    Equipo = apps.get_model("torneo", "Equipo")
+    equipos = Equipo.objects.exclude(imagenequipo=None).only("idequipo", "imagenequipo")
+    for equipo in equipos.iterator(chunk_size=100):
+        if equipo.imagenequipo:
+            Equipo.objects.filter(pk=equipo.pk).update(
+                imagenhash=hashlib.sha256(bytes(equipo.imagenequipo)).hexdigest()
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='equipo',
+            name='imagenhash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.RunPython(calcular_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0002_equipo_imagenhash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImagenVariante',
+            fields=[
+                ('idimagenvariante', models.AutoField(primary_key=True, serialize=False)),
+                ('hashorigen', models.CharField(max_length=64)),
+                ('tamanovariante', models.PositiveSmallIntegerField()),
+                ('formatovariante', models.CharField(max_length=10)),
+                ('datosvariante', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'imagenvariante',
+                'constraints': [models.UniqueConstraint(fields=('hashorigen', 'tamanovariante', 'formatovariante'), name='imagenvariante_unica')],
+            },
+        ),
+    ]
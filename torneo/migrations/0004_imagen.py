@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:55
+
+from django.db import migrations, models
+
+_FIRMAS = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+def _tipo(datos):
+    for firma, tipo in _FIRMAS:
+        if datos.startswith(firma):
+            return tipo
+    if datos[:4] == b"RIFF" and datos[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def copiar_imagenes(apps, schema_editor):
+    """Copia cada imagen distinta de equipo.imagenequipo a la tabla imagen."""
+    Equipo = apps.get_model("torneo", "Equipo")
+    Imagen = apps.get_model("torneo", "Imagen")
+    ImagenVariante = apps.get_model("torneo", "ImagenVariante")
+
+    copiadas = set()
+    equipos = (
+        Equipo.objects.filter(imagenhash__isnull=False)
+        .values_list("imagenhash", "imagenequipo")
+        .order_by("imagenhash")
+    )
+    for imagenhash, datos in equipos.iterator(chunk_size=100):
+        if imagenhash in copiadas or not datos:
+            continue
+        datos = bytes(datos)
+        Imagen.objects.create(
+            hashimagen=imagenhash,
+            datosimagen=datos,
+            tipoimagen=_tipo(datos),
+            tamanoimagen=len(datos),
+        )
+        copiadas.add(imagenhash)
+
+    Equipo.objects.filter(imagenhash__isnull=False).exclude(
+        imagenhash__in=Imagen.objects.values("hashimagen")
+    ).update(imagenhash=None)
+    ImagenVariante.objects.exclude(
+        hashorigen__in=Imagen.objects.values("hashimagen")
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0003_imagenvariante'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Imagen',
+            fields=[
+                ('hashimagen', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('datosimagen', models.BinaryField()),
+                ('tipoimagen', models.CharField(max_length=50)),
+                ('tamanoimagen', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'imagen',
+            },
+        ),
+        migrations.RunPython(copiar_imagenes, migrations.RunPython.noop),
+    ]
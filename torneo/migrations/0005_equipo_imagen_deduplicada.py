@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0004_imagen'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='equipo',
+            name='imagenequipo',
+        ),
+        migrations.AlterField(
+            model_name='equipo',
+            name='imagenhash',
+            field=models.ForeignKey(blank=True, db_column='imagenhash', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='equipos', to='torneo.imagen'),
+        ),
+        migrations.AlterField(
+            model_name='imagenvariante',
+            name='hashorigen',
+            field=models.ForeignKey(db_column='hashorigen', on_delete=django.db.models.deletion.CASCADE, related_name='variantes', to='torneo.imagen'),
+        ),
+    ]
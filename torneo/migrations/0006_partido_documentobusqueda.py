@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:20
+
+import unicodedata
+
+from django.db import migrations, models
+
+
+def _normalizar(texto):
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+def calcular_documentos(apps, schema_editor):
+    Partido = apps.get_model("torneo", "Partido")
+    partidos = Partido.objects.select_related(
+        "idequipolocal", "idequipovisitante", "idtorneo", "idtemporada"
+    )
+    lote = []
+    for partido in partidos.iterator(chunk_size=500):
+        partido.documentobusqueda = _normalizar(
+            " ".join(
+                (
+                    partido.idequipolocal.nombreequipo,
+                    partido.idequipovisitante.nombreequipo,
+                    partido.idtorneo.nombretorneo,
+                    partido.idtemporada.nombretemporada,
+                )
+            )
+        )
+        lote.append(partido)
+        if len(lote) >= 500:
+            Partido.objects.bulk_update(lote, ["documentobusqueda"])
+            lote = []
+    Partido.objects.bulk_update(lote, ["documentobusqueda"])
+
+
+def crear_indice_trigramas(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS partido_documentobusqueda_trgm "
+        "ON partido USING gin (documentobusqueda gin_trgm_ops)"
+    )
+
+
+def eliminar_indice_trigramas(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS partido_documentobusqueda_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0005_equipo_imagen_deduplicada'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partido',
+            name='documentobusqueda',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(calcular_documentos, migrations.RunPython.noop),
+        migrations.RunPython(crear_indice_trigramas, eliminar_indice_trigramas),
+    ]
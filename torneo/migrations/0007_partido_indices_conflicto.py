@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0006_partido_documentobusqueda'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partido',
+            index=models.Index(fields=['idequipolocal', 'fechapartido'], name='partido_local_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partido',
+            index=models.Index(fields=['idequipovisitante', 'fechapartido'], name='partido_visitante_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0007_partido_indices_conflicto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Llave',
+            fields=[
+                ('idllave', models.AutoField(primary_key=True, serialize=False)),
+                ('ronda', models.PositiveSmallIntegerField()),
+                ('posicion', models.PositiveSmallIntegerField()),
+                ('idequipolocal', models.ForeignKey(blank=True, db_column='idequipolocal', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='torneo.equipo')),
+                ('idequipovisitante', models.ForeignKey(blank=True, db_column='idequipovisitante', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='torneo.equipo')),
+                ('idpartido', models.OneToOneField(blank=True, db_column='idpartido', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='llave', to='torneo.partido')),
+                ('idtorneo', models.ForeignKey(db_column='idtorneo', on_delete=django.db.models.deletion.CASCADE, related_name='llaves', to='torneo.torneo')),
+            ],
+            options={
+                'db_table': 'llave',
+                'ordering': ['ronda', 'posicion'],
+                'constraints': [models.UniqueConstraint(fields=('idtorneo', 'ronda', 'posicion'), name='llave_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:30
+
+from collections import Counter, defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _sumar(totales, formas, clave, favor, contra):
+    gano, empato = favor > contra, favor == contra
+    totales[clave].update(
+        {
+            "puntos": 3 if gano else 1 if empato else 0,
+            "partidosjugados": 1,
+            "partidosganados": int(gano),
+            "partidosempatados": int(empato),
+            "partidosperdidos": int(favor < contra),
+            "golesfavor": favor,
+            "golescontra": contra,
+            "diferenciagoles": favor - contra,
+        }
+    )
+    formas[clave] = (formas[clave] + ("G" if gano else "E" if empato else "P"))[-5:]
+
+
+def calcular_posiciones(apps, schema_editor):
+    Partido = apps.get_model("torneo", "Partido")
+    Posicion = apps.get_model("torneo", "Posicion")
+    totales = defaultdict(Counter)
+    formas = defaultdict(str)
+    jugados = (
+        Partido.objects.filter(
+            marcadorequipolocal__isnull=False, marcadorequipovisitante__isnull=False
+        )
+        .order_by("fechapartido", "idpartido")
+        .values_list(
+            "idtorneo",
+            "idequipolocal",
+            "idequipovisitante",
+            "marcadorequipolocal",
+            "marcadorequipovisitante",
+        )
+    )
+    for torneo, local, visitante, gl, gv in jugados.iterator(chunk_size=2000):
+        _sumar(totales, formas, (torneo, local), gl, gv)
+        _sumar(totales, formas, (torneo, visitante), gv, gl)
+    Posicion.objects.bulk_create(
+        [
+            Posicion(idtorneo_id=torneo, idequipo_id=equipo, forma=formas[clave], **total)
+            for clave, total in totales.items()
+            for torneo, equipo in [clave]
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0008_llave'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Posicion',
+            fields=[
+                ('idposicion', models.AutoField(primary_key=True, serialize=False)),
+                ('puntos', models.IntegerField(default=0)),
+                ('partidosjugados', models.IntegerField(default=0)),
+                ('partidosganados', models.IntegerField(default=0)),
+                ('partidosempatados', models.IntegerField(default=0)),
+                ('partidosperdidos', models.IntegerField(default=0)),
+                ('golesfavor', models.IntegerField(default=0)),
+                ('golescontra', models.IntegerField(default=0)),
+                ('diferenciagoles', models.IntegerField(default=0)),
+                ('forma', models.CharField(blank=True, default='', max_length=5)),
+                ('idequipo', models.ForeignKey(db_column='idequipo', on_delete=django.db.models.deletion.CASCADE, related_name='posiciones', to='torneo.equipo')),
+                ('idtorneo', models.ForeignKey(db_column='idtorneo', on_delete=django.db.models.deletion.CASCADE, related_name='posiciones', to='torneo.torneo')),
+            ],
+            options={
+                'db_table': 'posicion',
+                'indexes': [models.Index(fields=['idtorneo', '-puntos', '-diferenciagoles', '-golesfavor'], name='posicion_orden_idx')],
+                'constraints': [models.UniqueConstraint(fields=('idtorneo', 'idequipo'), name='posicion_unica')],
+            },
+        ),
+        migrations.RunPython(calcular_posiciones, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0009_posicion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='torneo',
+            name='criteriosdesempate',
+            field=models.CharField(default='diferenciagoles,golesfavor,puntosdirectos,diferenciadirecta,golesdirectos', max_length=250),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:30
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0010_torneo_criteriosdesempate'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partido',
+            index=models.Index(django.db.models.functions.comparison.Least('idequipolocal', 'idequipovisitante'), django.db.models.functions.comparison.Greatest('idequipolocal', 'idequipovisitante'), models.OrderBy(models.F('fechapartido'), descending=True), name='partido_enfrentamiento_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def calcular_ratings(apps, schema_editor):
+    Partido = apps.get_model("torneo", "Partido")
+    Rating = apps.get_model("torneo", "Rating")
+    ratings = {}
+    filas = []
+    jugados = (
+        Partido.objects.filter(
+            marcadorequipolocal__isnull=False, marcadorequipovisitante__isnull=False
+        )
+        .order_by("fechapartido", "idpartido")
+        .values_list(
+            "idpartido",
+            "fechapartido",
+            "idequipolocal",
+            "idequipovisitante",
+            "marcadorequipolocal",
+            "marcadorequipovisitante",
+        )
+    )
+    for idpartido, fecha, local, visitante, gl, gv in jugados.iterator(chunk_size=2000):
+        rl, rv = ratings.get(local, 1500.0), ratings.get(visitante, 1500.0)
+        resultado = 1.0 if gl > gv else 0.5 if gl == gv else 0.0
+        cambio = round(20 * (resultado - 1 / (1 + 10 ** ((rv - rl - 100) / 400))), 2)
+        ratings[local], ratings[visitante] = round(rl + cambio, 2), round(rv - cambio, 2)
+        for equipo, delta in ((local, cambio), (visitante, -cambio)):
+            filas.append(
+                Rating(
+                    idequipo_id=equipo,
+                    idpartido_id=idpartido,
+                    fechapartido=fecha,
+                    rating=ratings[equipo],
+                    variacion=delta,
+                )
+            )
+    Rating.objects.bulk_create(filas, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0011_partido_indice_enfrentamiento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rating',
+            fields=[
+                ('idrating', models.AutoField(primary_key=True, serialize=False)),
+                ('fechapartido', models.DateTimeField()),
+                ('rating', models.FloatField()),
+                ('variacion', models.FloatField()),
+                ('idequipo', models.ForeignKey(db_column='idequipo', on_delete=django.db.models.deletion.CASCADE, related_name='ratings', to='torneo.equipo')),
+                ('idpartido', models.ForeignKey(db_column='idpartido', on_delete=django.db.models.deletion.CASCADE, related_name='ratings', to='torneo.partido')),
+            ],
+            options={
+                'db_table': 'rating',
+                'indexes': [models.Index(fields=['idequipo', 'fechapartido', 'idpartido'], name='rating_equipo_fecha_idx')],
+                'constraints': [models.UniqueConstraint(fields=('idequipo', 'idpartido'), name='rating_unico')],
+            },
+        ),
+        migrations.RunPython(calcular_ratings, migrations.RunPython.noop),
+    ]
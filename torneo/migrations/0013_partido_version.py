@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0012_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partido',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:00
+
+from django.db import migrations, models
+
+
+def registrar_existentes(apps, schema_editor):
+    # Todo lo que ya existe entra al registro, en el orden de utils/sincronizacion.py.
+    Cambio = apps.get_model("torneo", "Cambio")
+    for entidad in ("institucion", "temporada", "torneo", "equipo", "partido"):
+        modelo = apps.get_model("torneo", entidad)
+        ids = modelo.objects.order_by("pk").values_list("pk", flat=True)
+        Cambio.objects.bulk_create(
+            (Cambio(entidad=entidad, idobjeto=pk) for pk in ids.iterator(chunk_size=2000)),
+            batch_size=2000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneo', '0013_partido_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cambio',
+            fields=[
+                ('idcambio', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entidad', models.CharField(max_length=20)),
+                ('idobjeto', models.IntegerField()),
+                ('eliminado', models.BooleanField(default=False)),
+            ],
+            options={
+                'db_table': 'cambio',
+                'constraints': [models.UniqueConstraint(fields=('entidad', 'idobjeto'), name='cambio_unico')],
+            },
+        ),
+        migrations.RunPython(registrar_existentes, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,11 @@
+from .imagen import Imagen as Imagen
 from .equipo import Equipo as Equipo
 from .institucion import Institucion as Institucion
 from .partido import Partido as Partido
 from torneo.models.torneo import Torneo as Torneo
 from .temporada import Temporada as Temporada
+from .imagen_variante import ImagenVariante as ImagenVariante
+from .llave import Llave as Llave
+from .posicion import Posicion as Posicion
+from .rating import Rating as Rating
+from .cambio import Cambio as Cambio
@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class Cambio(models.Model):
+    """
+    Último cambio de cada fila que sincronizan los clientes (ver
+    utils/sincronizacion.py).
+
+    Hay una sola fila por objeto: al modificarlo se borra la anterior y se
+    inserta otra, así que ``idcambio`` crece con cada cambio y es la versión
+    que el cliente envía en ``/api/sync/?since=``. Un objeto borrado queda con
+    ``eliminado`` en verdadero para que los clientes lo quiten de su copia.
+    """
+
+    idcambio = models.BigAutoField(primary_key=True)
+    entidad = models.CharField(max_length=20)
+    idobjeto = models.IntegerField()
+    eliminado = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "cambio"
+        constraints = [
+            models.UniqueConstraint(fields=["entidad", "idobjeto"], name="cambio_unico")
+        ]
+
+    def __str__(self):
+        return f"{self.idcambio} {self.entidad} {self.idobjeto}"
@@ -1,5 +1,6 @@
 from django.db import models
 
+from .imagen import Imagen
 from .institucion import Institucion
 
 
@@ -9,7 +10,14 @@ class Equipo(models.Model):
         Institucion, on_delete=models.CASCADE, db_column="idinstitucion"
     )
     nombreequipo = models.CharField(max_length=250)
-    imagenequipo = models.BinaryField(null=True, blank=True)
+    imagenhash = models.ForeignKey(
+        Imagen,
+        null=True,
+        blank=True,
+        related_name="equipos",
+        on_delete=models.PROTECT,
+        db_column="imagenhash",
+    )
     equipoactivo = models.BooleanField(default=True)
 
     class Meta:
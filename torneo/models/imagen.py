@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class Imagen(models.Model):
+    """Imagen almacenada una sola vez, identificada por el SHA-256 de su contenido."""
+
+    hashimagen = models.CharField(max_length=64, primary_key=True)
+    datosimagen = models.BinaryField()
+    tipoimagen = models.CharField(max_length=50)
+    tamanoimagen = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = "imagen"
+
+    def __str__(self):
+        return self.hashimagen
@@ -0,0 +1,30 @@
+from django.db import models
+
+from .imagen import Imagen
+
+
+class ImagenVariante(models.Model):
+    """Miniatura o conversión de formato de una imagen, identificada por su hash."""
+
+    idimagenvariante = models.AutoField(primary_key=True)
+    hashorigen = models.ForeignKey(
+        Imagen,
+        related_name="variantes",
+        on_delete=models.CASCADE,
+        db_column="hashorigen",
+    )
+    tamanovariante = models.PositiveSmallIntegerField()
+    formatovariante = models.CharField(max_length=10)
+    datosvariante = models.BinaryField()
+
+    class Meta:
+        db_table = "imagenvariante"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hashorigen", "tamanovariante", "formatovariante"],
+                name="imagenvariante_unica",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.hashorigen_id[:12]} {self.tamanovariante}px {self.formatovariante}"
@@ -0,0 +1,58 @@
+from django.db import models
+from torneo.models.equipo import Equipo
+from torneo.models.partido import Partido
+from torneo.models.torneo import Torneo
+
+
+class Llave(models.Model):
+    """
+    Casilla de un cuadro de eliminación directa.
+
+    La ronda 1 es la primera; la casilla (ronda, posicion) la alimentan las
+    casillas (ronda - 1, 2 * posicion) y (ronda - 1, 2 * posicion + 1). Los
+    equipos se conocen antes que el partido: el partido se crea cuando ambos
+    están definidos.
+    """
+
+    idllave = models.AutoField(primary_key=True)
+    idtorneo = models.ForeignKey(
+        Torneo, related_name="llaves", on_delete=models.CASCADE, db_column="idtorneo"
+    )
+    ronda = models.PositiveSmallIntegerField()
+    posicion = models.PositiveSmallIntegerField()
+    idequipolocal = models.ForeignKey(
+        Equipo,
+        null=True,
+        blank=True,
+        related_name="+",
+        on_delete=models.CASCADE,
+        db_column="idequipolocal",
+    )
+    idequipovisitante = models.ForeignKey(
+        Equipo,
+        null=True,
+        blank=True,
+        related_name="+",
+        on_delete=models.CASCADE,
+        db_column="idequipovisitante",
+    )
+    idpartido = models.OneToOneField(
+        Partido,
+        null=True,
+        blank=True,
+        related_name="llave",
+        on_delete=models.SET_NULL,
+        db_column="idpartido",
+    )
+
+    class Meta:
+        db_table = "llave"
+        ordering = ["ronda", "posicion"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["idtorneo", "ronda", "posicion"], name="llave_unica"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.idtorneo_id} ronda {self.ronda} #{self.posicion}"
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Greatest, Least
 from torneo.models.equipo import Equipo
 from torneo.models.torneo import Torneo, Temporada
 from torneo.models.temporada import Temporada
@@ -10,6 +11,11 @@ class Partido(models.Model):
     marcadorequipolocal = models.IntegerField(null=True, blank=True)
     marcadorequipovisitante = models.IntegerField(null=True, blank=True)
     partidosubido = models.BooleanField(default=False)
+    # Nombres normalizados de equipos, torneo y temporada (ver utils/search.py).
+    documentobusqueda = models.TextField(default="", blank=True, editable=False)
+    # Aumenta con cada modificación; el marcador en vivo lo usa para detectar
+    # escrituras concurrentes (ver utils/marcador.py).
+    version = models.PositiveIntegerField(default=0, editable=False)
 
     idequipolocal = models.ForeignKey(
         Equipo,
@@ -28,8 +34,72 @@ class Partido(models.Model):
         Temporada, on_delete=models.CASCADE, db_column="idtemporada"
     )
 
+    # Campos que determinan el aporte del partido a la tabla de posiciones.
+    CAMPOS_RESULTADO = (
+        "idtorneo_id",
+        "idequipolocal_id",
+        "idequipovisitante_id",
+        "marcadorequipolocal",
+        "marcadorequipovisitante",
+    )
+    # Campos que determinan el aporte del partido a las estadísticas de sus
+    # equipos, que además se desglosan por temporada (ver utils/estadisticas.py).
+    CAMPOS_ESTADISTICAS = CAMPOS_RESULTADO + ("idtemporada_id",)
+
     class Meta:
         db_table = "partido"
+        # Cubren la búsqueda de choques de horario (ver utils/conflictos.py): cada
+        # rama del OR se resuelve con un acceso por (equipo, fecha).
+        indexes = [
+            models.Index(
+                fields=["idequipolocal", "fechapartido"],
+                name="partido_local_fecha_idx",
+            ),
+            models.Index(
+                fields=["idequipovisitante", "fechapartido"],
+                name="partido_visitante_fecha_idx",
+            ),
+            # Par de equipos sin orden (menor, mayor): el historial entre dos
+            # equipos es un solo rango del índice, sin importar quién fue local
+            # (ver utils/estadisticas.py).
+            models.Index(
+                Least("idequipolocal", "idequipovisitante"),
+                Greatest("idequipolocal", "idequipovisitante"),
+                models.F("fechapartido").desc(),
+                name="partido_enfrentamiento_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.idequipolocal} vs {self.idequipovisitante} ({self.fechapartido.date()})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            # Se incrementa en la base, no sobre el valor leído: una copia
+            # desactualizada no puede repetir una versión ya usada. La señal
+            # post_save lee el valor nuevo (ver signals.py).
+            self.version = models.F("version") + 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Resultado tal como está guardado: al guardar de nuevo solo se aplica la
+        # diferencia en la tabla de posiciones.
+        instance._resultado_guardado = instance.resultado()
+        instance._estadisticas_guardadas = instance.resultado(cls.CAMPOS_ESTADISTICAS)
+        return instance
+
+    def resultado(self, campos=CAMPOS_RESULTADO):
+        """
+        (torneo, local, visitante, goles local, goles visitante) según los valores
+        en memoria, o None si alguno de esos campos no se cargó (only/defer).
+        Con ``campos`` se arma la tupla con esos campos en su lugar.
+        """
+        try:
+            return tuple(self.__dict__[campo] for campo in campos)
+        except KeyError:
+            return None
@@ -0,0 +1,48 @@
+from django.db import models
+from torneo.models.equipo import Equipo
+from torneo.models.torneo import Torneo
+
+
+class Posicion(models.Model):
+    """
+    Fila de la tabla de posiciones de un equipo en un torneo.
+
+    Es una tabla materializada: se actualiza de forma incremental cada vez que
+    cambia el marcador de un partido (ver utils/posiciones.py) y se puede
+    reconstruir con ``python manage.py recalcular_posiciones``.
+    """
+
+    idposicion = models.AutoField(primary_key=True)
+    idtorneo = models.ForeignKey(
+        Torneo, related_name="posiciones", on_delete=models.CASCADE, db_column="idtorneo"
+    )
+    idequipo = models.ForeignKey(
+        Equipo, related_name="posiciones", on_delete=models.CASCADE, db_column="idequipo"
+    )
+    puntos = models.IntegerField(default=0)
+    partidosjugados = models.IntegerField(default=0)
+    partidosganados = models.IntegerField(default=0)
+    partidosempatados = models.IntegerField(default=0)
+    partidosperdidos = models.IntegerField(default=0)
+    golesfavor = models.IntegerField(default=0)
+    golescontra = models.IntegerField(default=0)
+    diferenciagoles = models.IntegerField(default=0)
+    # Últimos resultados, del más antiguo al más reciente: G, E o P.
+    forma = models.CharField(max_length=5, default="", blank=True)
+
+    class Meta:
+        db_table = "posicion"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["idtorneo", "idequipo"], name="posicion_unica"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["idtorneo", "-puntos", "-diferenciagoles", "-golesfavor"],
+                name="posicion_orden_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.idequipo} {self.puntos} pts"
@@ -0,0 +1,41 @@
+from django.db import models
+from torneo.models.equipo import Equipo
+from torneo.models.partido import Partido
+
+
+class Rating(models.Model):
+    """
+    Rating Elo de un equipo después de un partido jugado.
+
+    Hay una fila por equipo y partido; el rating actual de un equipo es el de su
+    último partido en orden (fechapartido, idpartido). Se agregan filas a medida
+    que se cargan marcadores (ver utils/ratings.py) y se pueden reconstruir con
+    ``python manage.py recalcular_ratings``.
+    """
+
+    idrating = models.AutoField(primary_key=True)
+    idequipo = models.ForeignKey(
+        Equipo, related_name="ratings", on_delete=models.CASCADE, db_column="idequipo"
+    )
+    idpartido = models.ForeignKey(
+        Partido, related_name="ratings", on_delete=models.CASCADE, db_column="idpartido"
+    )
+    # Copia de la fecha del partido: ordena el historial sin unir con partido.
+    fechapartido = models.DateTimeField()
+    rating = models.FloatField()
+    variacion = models.FloatField()
+
+    class Meta:
+        db_table = "rating"
+        constraints = [
+            models.UniqueConstraint(fields=["idequipo", "idpartido"], name="rating_unico")
+        ]
+        indexes = [
+            models.Index(
+                fields=["idequipo", "fechapartido", "idpartido"],
+                name="rating_equipo_fecha_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.idequipo} {self.rating:.0f}"
@@ -2,6 +2,20 @@ from django.db import models
 
 from .temporada import Temporada
 
+# Criterios de desempate de la tabla de posiciones (ver utils/desempate.py). Los
+# "directos" se calculan solo con los partidos entre los equipos empatados.
+CRITERIOS_DESEMPATE = (
+    "diferenciagoles",
+    "golesfavor",
+    "partidosganados",
+    "puntosdirectos",
+    "diferenciadirecta",
+    "golesdirectos",
+)
+DESEMPATE_POR_DEFECTO = (
+    "diferenciagoles,golesfavor,puntosdirectos,diferenciadirecta,golesdirectos"
+)
+
 
 class Torneo(models.Model):
     idtorneo = models.AutoField(primary_key=True)
@@ -13,9 +27,14 @@ class Torneo(models.Model):
     fechainiciotorneo = models.DateTimeField()
     fechafintorneo = models.DateTimeField()
     torneoactivo = models.BooleanField(default=False)
+    # Orden de los criterios de desempate, separados por comas.
+    criteriosdesempate = models.CharField(max_length=250, default=DESEMPATE_POR_DEFECTO)
 
     class Meta:
         db_table = "torneo"
 
     def __str__(self):
         return self.nombretorneo
+
+    def criterios_desempate(self):
+        return [c for c in self.criteriosdesempate.split(",") if c]
@@ -3,3 +3,12 @@ from .institucion_serializer import InstitucionSerializer as InstitucionSerializ
 from .partido_serializer import PartidoSerializer as PartidoSerializer
 from .torneo_serializer import TorneoSerializer as TorneoSerializer
 from .temporada_serializer import TemporadaSerializer as TemporadaSerializer
+from .partido_bulk_serializer import PartidoBulkItemSerializer as PartidoBulkItemSerializer
+from .fixture_serializer import (
+    FixtureSerializer as FixtureSerializer,
+    ParticipantesSerializer as ParticipantesSerializer,
+)
+from .llave_serializer import LlaveSerializer as LlaveSerializer
+from .posicion_serializer import PosicionSerializer as PosicionSerializer
+from .rating_serializer import RatingSerializer as RatingSerializer
+from .marcador_serializer import MarcadorSerializer as MarcadorSerializer
@@ -1,12 +1,74 @@
 import base64
+from django.core.files import File
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 from torneo.models import Equipo
+from torneo.utils.imagenes import (
+    guardar_imagen,
+    guardar_imagen_subida,
+    liberar_imagen,
+    programar_variantes,
+)
+from torneo.utils.subidas import validar_imagen
+
+
+class ImagenEquipoField(serializers.Field):
+    """
+    Campo de la imagen del equipo.
+
+    Al leer devuelve la URL de la miniatura de 256px (o None) usando solo el hash
+    de la imagen, sin cargar el binario. Al escribir acepta una cadena base64
+    "data:image/..." o un archivo subido (multipart u octet-stream); el
+    serializador la guarda en la tabla de imágenes al crear o actualizar el equipo.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "*")
+        kwargs.setdefault("required", False)
+        kwargs.setdefault("allow_null", True)
+        super().__init__(**kwargs)
+
+    def validate_empty_values(self, data):
+        if data is None or data == "":
+            return (True, {"imagenequipo": None})
+        return super().validate_empty_values(data)
+
+    def to_internal_value(self, data):
+        if isinstance(data, File):
+            # Subida multipart u octet-stream, ya validada al recibirla.
+            return {"imagenequipo": data}
+        if not isinstance(data, str) or not data.startswith("data:image"):
+            raise serializers.ValidationError("Formato Base64 inválido.")
+        try:
+            _, base64_data = data.split(",", 1)
+            imagen = base64.b64decode(base64_data)
+        except Exception:
+            raise serializers.ValidationError("Formato Base64 inválido.")
+        try:
+            validar_imagen(imagen)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return {"imagenequipo": imagen}
+
+    def to_representation(self, instance):
+        if not instance.imagenhash_id:
+            return None
+        # Los listados nunca piden el original: 256px cubre tarjetas y tablas.
+        url = reverse("equipo-imagen", args=[instance.pk])
+        url = f"{url}?size=256&v={instance.imagenhash_id[:16]}"
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
 
 
 class EquipoSerializer(serializers.ModelSerializer):
     institucion_nombre = serializers.StringRelatedField(
         source="idinstitucion", read_only=True
     )
+    imagenequipo = ImagenEquipoField()
+    # En multipart/form-data un booleano ausente se lee como False; sin el
+    # default explícito, crear un equipo subiendo el escudo lo dejaría inactivo.
+    equipoactivo = serializers.BooleanField(default=True)
 
     class Meta:
         model = Equipo
@@ -18,6 +80,7 @@ class EquipoSerializer(serializers.ModelSerializer):
             "idinstitucion",
             "institucion_nombre",
         ]
+        select_related = ("idinstitucion",)
 
     def validate_nombreequipo(self, value):
         """
@@ -27,47 +90,37 @@ class EquipoSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Ya existe un equipo con ese nombre.")
         return value
 
-    def to_internal_value(self, data):
-        """
-        Convierte el valor de 'imagenequipo' en base64 a bytes.
-        Si el valor es None o una cadena vacía, se deja como None.
-        Si el valor es una cadena que comienza con "data:image", se intenta
-        convertir a bytes. Si no se puede parsear, se devuelve un
-        ValidationError con el mensaje "Formato Base64 inválido.".
-        """
-        internal = super().to_internal_value(data)
-        imagen = data.get("imagenequipo")
-
-        if not imagen:
-            return internal
-
-        # Si viene como base64, la convertimos a bytes
-        if isinstance(imagen, str) and imagen.startswith("data:image"):
-            try:
-                _, base64_data = imagen.split(",", 1)
-                internal["imagenequipo"] = base64.b64decode(base64_data)
-            except Exception:
-                raise serializers.ValidationError(
-                    {"imagenequipo": "Formato Base64 inválido."}
-                )
-        elif imagen is None or imagen == "":
-            internal["imagenequipo"] = None
+    def create(self, validated_data):
+        self._guardar_imagen(validated_data)
+        return super().create(validated_data)
 
-        return internal
+    def update(self, instance, validated_data):
+        anterior = instance.imagenhash_id
+        self._guardar_imagen(validated_data)
+        equipo = super().update(instance, validated_data)
+        if anterior and anterior != equipo.imagenhash_id:
+            transaction.on_commit(lambda: liberar_imagen(anterior))
+        return equipo
 
-    def to_representation(self, instance):
+    def _guardar_imagen(self, validated_data):
         """
-        Convierte una instancia de Equipo en un objeto JSON.
-        Se convierte el campo 'imagenequipo' de bytes a base64
-        para enviar al frontend. Si el campo es None o una cadena
-        vacía, se deja como None.
+        Sustituye los bytes recibidos por la referencia a la imagen almacenada.
+        Las imágenes repetidas se reutilizan por hash; para las nuevas se generan
+        las miniaturas fuera del hilo de la petición, tras el commit.
         """
-        rep = super().to_representation(instance)
-        # Convertimos los bytes a base64 para enviar al frontend
-        if instance.imagenequipo:
-            rep["imagenequipo"] = (
-                f"data:image/png;base64,{base64.b64encode(instance.imagenequipo).decode('utf-8')}"
-            )
+        if "imagenequipo" not in validated_data:
+            return
+        datos = validated_data.pop("imagenequipo")
+        if not datos:
+            validated_data["imagenhash"] = None
+            return
+
+        if isinstance(datos, File):
+            imagen, creada, datos = guardar_imagen_subida(datos)
         else:
-            rep["imagenequipo"] = None
-        return rep
+            imagen, creada = guardar_imagen(datos)
+        validated_data["imagenhash"] = imagen
+        if creada:
+            transaction.on_commit(
+                lambda: programar_variantes(imagen.hashimagen, datos)
+            )
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+
+
+class ParticipantesSerializer(serializers.Serializer):
+    """Equipos participantes de un fixture o de un cuadro, en orden de siembra."""
+
+    equipos = serializers.ListField(
+        child=serializers.IntegerField(), min_length=2, max_length=256
+    )
+
+    def validate_equipos(self, value):
+        if len(set(value)) != len(value):
+            raise serializers.ValidationError("Hay equipos repetidos.")
+        return value
+
+
+class FixtureSerializer(ParticipantesSerializer):
+    """Parámetros de generación de un fixture todos contra todos."""
+
+    idayvuelta = serializers.BooleanField(default=False)
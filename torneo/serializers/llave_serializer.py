@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from torneo.models import Llave
+
+
+class LlaveSerializer(serializers.ModelSerializer):
+    equipo_local_nombre = serializers.StringRelatedField(
+        source="idequipolocal", read_only=True
+    )
+    equipo_visitante_nombre = serializers.StringRelatedField(
+        source="idequipovisitante", read_only=True
+    )
+    fechapartido = serializers.DateTimeField(
+        source="idpartido.fechapartido", read_only=True, allow_null=True
+    )
+    marcadorequipolocal = serializers.IntegerField(
+        source="idpartido.marcadorequipolocal", read_only=True, allow_null=True
+    )
+    marcadorequipovisitante = serializers.IntegerField(
+        source="idpartido.marcadorequipovisitante", read_only=True, allow_null=True
+    )
+
+    class Meta:
+        model = Llave
+        fields = [
+            "idllave",
+            "ronda",
+            "posicion",
+            "idequipolocal",
+            "idequipovisitante",
+            "equipo_local_nombre",
+            "equipo_visitante_nombre",
+            "idpartido",
+            "fechapartido",
+            "marcadorequipolocal",
+            "marcadorequipovisitante",
+        ]
+        select_related = ("idequipolocal", "idequipovisitante", "idpartido")
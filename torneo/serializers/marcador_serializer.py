@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+
+class MarcadorSerializer(serializers.Serializer):
+    """
+    Cambio de marcador en vivo. Cada lado se fija con ``marcadorequipo...`` o
+    se incrementa con ``sumar...`` (por ejemplo, un gol: {"sumarlocal": 1}).
+    ``version`` es opcional: si se envía, el cambio solo se aplica si nadie
+    modificó el partido desde esa versión.
+    """
+
+    marcadorequipolocal = serializers.IntegerField(
+        min_value=0, allow_null=True, required=False
+    )
+    marcadorequipovisitante = serializers.IntegerField(
+        min_value=0, allow_null=True, required=False
+    )
+    sumarlocal = serializers.IntegerField(min_value=1, required=False)
+    sumarvisitante = serializers.IntegerField(min_value=1, required=False)
+    version = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, attrs):
+        errores = {}
+        for campo, sumar in (
+            ("marcadorequipolocal", "sumarlocal"),
+            ("marcadorequipovisitante", "sumarvisitante"),
+        ):
+            if campo in attrs and sumar in attrs:
+                errores[sumar] = f"No se puede enviar junto con {campo}."
+        if errores:
+            raise serializers.ValidationError(errores)
+        if not set(attrs) - {"version"}:
+            raise serializers.ValidationError("No se envió ningún cambio de marcador.")
+        return attrs
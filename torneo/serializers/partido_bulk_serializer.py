@@ -0,0 +1,33 @@
+from rest_framework import serializers
+
+
+class PartidoBulkItemSerializer(serializers.Serializer):
+    """
+    Valida los campos simples de un elemento de la carga masiva de partidos.
+
+    Las claves foráneas se reciben como enteros y no se resuelven aquí: la vista
+    las busca todas juntas, con una consulta por tabla (ver utils/carga_masiva.py).
+    """
+
+    fechapartido = serializers.DateTimeField()
+    marcadorequipolocal = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        min_value=0,
+        error_messages={
+            "min_value": "El marcador del equipo local no puede ser negativo."
+        },
+    )
+    marcadorequipovisitante = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        min_value=0,
+        error_messages={
+            "min_value": "El marcador del equipo visitante no puede ser negativo."
+        },
+    )
+    idequipolocal = serializers.IntegerField()
+    idequipovisitante = serializers.IntegerField()
+    idtorneo = serializers.IntegerField()
+    idtemporada = serializers.IntegerField()
+    partidosubido = serializers.BooleanField(default=False)
@@ -1,6 +1,6 @@
 from rest_framework import serializers
-from django.db.models import Q
 from torneo.models import Partido
+from torneo.utils.conflictos import partidos_en_conflicto
 
 
 class PartidoSerializer(serializers.ModelSerializer):
@@ -32,7 +32,21 @@ class PartidoSerializer(serializers.ModelSerializer):
             "torneo_nombre",
             "temporada_nombre",
             "partidosubido",
+            "version",
         ]
+        select_related = (
+            "idequipolocal",
+            "idequipovisitante",
+            "idtorneo",
+            "idtemporada",
+        )
+        # Listados con values_list() en lugar del serializador (ver utils/lectura.py).
+        valores = {
+            "equipo_local_nombre": "idequipolocal__nombreequipo",
+            "equipo_visitante_nombre": "idequipovisitante__nombreequipo",
+            "torneo_nombre": "idtorneo__nombretorneo",
+            "temporada_nombre": "idtemporada__nombretemporada",
+        }
 
     def validate(self, attrs):
         """
@@ -74,19 +88,11 @@ class PartidoSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "La fecha del partido debe estar dentro del rango del torneo."
                 )
-            conflicting_partidos = Partido.objects.filter(
-                Q(fechapartido=fecha_partido)
-                & (
-                    Q(idequipolocal=equipo_local)
-                    | Q(idequipovisitante=equipo_local)
-                    | Q(idequipolocal=equipo_visitante)
-                    | Q(idequipovisitante=equipo_visitante)
-                )
+            conflicting_partidos = partidos_en_conflicto(
+                fecha_partido,
+                [equipo_local, equipo_visitante],
+                excluir=self.instance.idpartido if self.instance else None,
             )
-            if self.instance:
-                conflicting_partidos = conflicting_partidos.exclude(
-                    idpartido=self.instance.idpartido
-                )
             if conflicting_partidos.exists():
                 raise serializers.ValidationError(
                     "Un equipo no puede tener más de un partido en la misma fecha."
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+from torneo.models import Posicion
+
+
+class PosicionSerializer(serializers.ModelSerializer):
+    equipo_nombre = serializers.StringRelatedField(source="idequipo", read_only=True)
+
+    class Meta:
+        model = Posicion
+        fields = [
+            "idequipo",
+            "equipo_nombre",
+            "puntos",
+            "partidosjugados",
+            "partidosganados",
+            "partidosempatados",
+            "partidosperdidos",
+            "golesfavor",
+            "golescontra",
+            "diferenciagoles",
+            "forma",
+        ]
+        select_related = ("idequipo",)
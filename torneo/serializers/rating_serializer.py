@@ -0,0 +1,18 @@
+from rest_framework import serializers
+from torneo.models import Rating
+
+
+class RatingSerializer(serializers.ModelSerializer):
+    equipo_nombre = serializers.StringRelatedField(source="idequipo", read_only=True)
+
+    class Meta:
+        model = Rating
+        fields = [
+            "idequipo",
+            "equipo_nombre",
+            "idpartido",
+            "fechapartido",
+            "rating",
+            "variacion",
+        ]
+        select_related = ("idequipo",)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from torneo.models import Torneo
+from torneo.models.torneo import CRITERIOS_DESEMPATE
 
 
 class TorneoSerializer(serializers.ModelSerializer):
@@ -16,9 +17,25 @@ class TorneoSerializer(serializers.ModelSerializer):
             "fechainiciotorneo",
             "fechafintorneo",
             "torneoactivo",
+            "criteriosdesempate",
             "idtemporada",
             "temporada_nombre",
         ]
+        select_related = ("idtemporada",)
+        # Listados con values_list() en lugar del serializador (ver utils/lectura.py).
+        valores = {"temporada_nombre": "idtemporada__nombretemporada"}
+
+    def validate_criteriosdesempate(self, value):
+        criterios = [c.strip() for c in value.split(",") if c.strip()]
+        invalidos = [c for c in criterios if c not in CRITERIOS_DESEMPATE]
+        if invalidos:
+            raise serializers.ValidationError(
+                f"Criterios de desempate inválidos: {', '.join(invalidos)}. "
+                f"Disponibles: {', '.join(CRITERIOS_DESEMPATE)}."
+            )
+        if len(set(criterios)) != len(criterios):
+            raise serializers.ValidationError("Hay criterios de desempate repetidos.")
+        return ",".join(criterios)
 
     def validate(self, attrs):
         """
@@ -0,0 +1,293 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, pre_save, post_save
+from django.dispatch import receiver
+
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.utils.autocomplete import indice_autocompletado
+from torneo.utils.cache_vistas import invalidar_respuestas
+from torneo.utils.difusion import canales_partido, difusor, evento_partido
+from torneo.utils.estadisticas import invalidar_estadisticas
+from torneo.utils.llaves import avanzar_llave, avanzar_llaves
+from torneo.utils.posiciones import recalcular_posiciones, registrar_resultados
+from torneo.utils.ratings import actualizar_ratings, registrar_lote, registrar_partido
+from torneo.utils.search import actualizar_documentos, documento_partido
+from torneo.utils.sincronizacion import ENTIDAD_DE, registrar_cambios
+
+
+# ================= VERSIÓN =================
+# Va primero: Partido.save() incrementa la versión con una expresión F y las
+# demás señales (y la respuesta de la vista) necesitan el número.
+@receiver(post_save, sender=Partido)
+def leer_version(sender, instance, **kwargs):
+    if not isinstance(instance.version, int):
+        instance.refresh_from_db(fields=["version"])
+
+
+# ================= PARTIDOS NUEVOS =================
+# bulk_create no envía señales, así que todo lo que pasa al crear partidos está
+# en preparar_partidos y partidos_creados, que llaman tanto estas señales (con
+# un partido) como crear_lote (con el lote entero). Los receptores de post_save
+# de Partido de más abajo solo atienden las actualizaciones: un efecto nuevo al
+# crear partidos va en partidos_creados, no en un receptor aparte.
+def preparar_partidos(partidos):
+    """Calcula el documento de búsqueda de ``partidos`` antes de guardarlos."""
+    for partido in partidos:
+        partido.documentobusqueda = documento_partido(partido)
+
+
+def partidos_creados(partidos):
+    """
+    Efectos de insertar ``partidos``, en el orden de las secciones de abajo:
+    avanza las llaves, suma los resultados a los ratings, a las posiciones y a
+    las estadísticas, publica el evento "creado" al confirmar, invalida las
+    respuestas en caché y registra los partidos para la sincronización.
+    """
+    avanzar_llaves(partidos)
+    registrar_lote(partidos)
+    cambios = [(None, partido.resultado()) for partido in partidos]
+    registrar_resultados(cambios)
+    estadisticas = [partido.resultado(Partido.CAMPOS_ESTADISTICAS) for partido in partidos]
+    invalidar_estadisticas([(None, nuevo) for nuevo in estadisticas])
+    eventos = [
+        (canales_partido(partido), evento_partido(partido, "creado"))
+        for partido in partidos
+    ]
+
+    def difundir():
+        for canales, evento in eventos:
+            difusor.publicar(canales, evento)
+
+    transaction.on_commit(difundir)
+    invalidar_respuestas(Partido)
+    registrar_cambios("partido", [partido.pk for partido in partidos], nuevos=True)
+    for partido, (_, resultado), nuevo in zip(partidos, cambios, estadisticas):
+        partido._resultado_guardado = resultado
+        partido._estadisticas_guardadas = nuevo
+
+
+@receiver(post_save, sender=Partido)
+def crear_partido(sender, instance, created, **kwargs):
+    if created:
+        partidos_creados([instance])
+
+
+# ================= BÚSQUEDA =================
+@receiver(pre_save, sender=Partido)
+def calcular_documento_partido(sender, instance, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not {
+        "idequipolocal",
+        "idequipovisitante",
+        "idtorneo",
+        "idtemporada",
+    } & set(update_fields):
+        return
+    preparar_partidos([instance])
+
+
+_CAMPOS_NOMBRE = {
+    Equipo: "nombreequipo",
+    Torneo: "nombretorneo",
+    Temporada: "nombretemporada",
+}
+
+
+def _nombre_cambiado(sender, instance, update_fields):
+    campo = _CAMPOS_NOMBRE[sender]
+    if instance._state.adding:
+        return False
+    if update_fields is not None and campo not in update_fields:
+        return False
+    anterior = sender.objects.filter(pk=instance.pk).values_list(campo, flat=True)
+    return anterior.first() != getattr(instance, campo)
+
+
+@receiver(pre_save, sender=Equipo)
+@receiver(pre_save, sender=Torneo)
+@receiver(pre_save, sender=Temporada)
+def detectar_cambio_nombre(sender, instance, update_fields=None, **kwargs):
+    instance._nombre_cambiado = _nombre_cambiado(sender, instance, update_fields)
+
+
+@receiver(post_save, sender=Equipo)
+@receiver(post_save, sender=Torneo)
+@receiver(post_save, sender=Temporada)
+def actualizar_documentos_por_nombre(sender, instance, **kwargs):
+    if not getattr(instance, "_nombre_cambiado", False):
+        return
+    if sender is Equipo:
+        filtro = Q(idequipolocal=instance) | Q(idequipovisitante=instance)
+    elif sender is Torneo:
+        filtro = Q(idtorneo=instance)
+    else:
+        filtro = Q(idtemporada=instance)
+    actualizar_documentos(Partido.objects.filter(filtro))
+
+
+# ================= AUTOCOMPLETADO =================
+_TIPOS_AUTOCOMPLETADO = {
+    Equipo: ("equipo", "nombreequipo"),
+    Torneo: ("torneo", "nombretorneo"),
+    Institucion: ("institucion", "nombreinstitucion"),
+}
+
+
+@receiver(post_save, sender=Equipo)
+@receiver(post_save, sender=Torneo)
+@receiver(post_save, sender=Institucion)
+def indexar_nombre(sender, instance, **kwargs):
+    tipo, campo = _TIPOS_AUTOCOMPLETADO[sender]
+    pk, nombre = instance.pk, getattr(instance, campo)
+    transaction.on_commit(lambda: indice_autocompletado.agregar(tipo, pk, nombre))
+
+
+@receiver(post_delete, sender=Equipo)
+@receiver(post_delete, sender=Torneo)
+@receiver(post_delete, sender=Institucion)
+def desindexar_nombre(sender, instance, **kwargs):
+    tipo, _ = _TIPOS_AUTOCOMPLETADO[sender]
+    pk = instance.pk
+    transaction.on_commit(lambda: indice_autocompletado.eliminar(tipo, pk))
+
+
+# ================= LLAVES =================
+@receiver(post_save, sender=Partido)
+def avanzar_ganador(sender, instance, created, **kwargs):
+    if not created:
+        avanzar_llave(instance)
+
+
+# ================= RATINGS =================
+# Va antes que POSICIONES: compara con _resultado_guardado, que
+# actualizar_posiciones reemplaza al terminar.
+@receiver(post_save, sender=Partido)
+def actualizar_rating(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    campos = {campo.removesuffix("_id") for campo in Partido.CAMPOS_RESULTADO}
+    if update_fields is not None and not (campos | {"fechapartido"}) & set(update_fields):
+        return
+    cambiado = getattr(instance, "_resultado_guardado", None) != instance.resultado()
+    registrar_partido(instance, resultado_cambiado=cambiado)
+
+
+@receiver(post_delete, sender=Partido)
+def descontar_rating(sender, instance, **kwargs):
+    # Las filas del partido ya se borraron en cascada; falta recalcular las
+    # posteriores de sus equipos.
+    if instance.marcadorequipolocal is None or instance.marcadorequipovisitante is None:
+        return
+    actualizar_ratings(
+        (instance.fechapartido, instance.pk),
+        {instance.idequipolocal_id, instance.idequipovisitante_id},
+    )
+
+
+# ================= POSICIONES =================
+@receiver(post_save, sender=Partido)
+def actualizar_posiciones(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    campos = {campo.removesuffix("_id") for campo in Partido.CAMPOS_RESULTADO}
+    if update_fields is not None and not campos & set(update_fields):
+        return
+    nuevo = instance.resultado()
+    if hasattr(instance, "_resultado_guardado"):
+        registrar_resultados([(instance._resultado_guardado, nuevo)])
+    else:
+        # Instancia armada a mano: no se sabe qué había guardado.
+        recalcular_posiciones([instance.idtorneo_id])
+    instance._resultado_guardado = nuevo
+
+
+@receiver(post_delete, sender=Partido)
+def descontar_posiciones(sender, instance, **kwargs):
+    anterior = getattr(instance, "_resultado_guardado", instance.resultado())
+    registrar_resultados([(anterior, None)])
+
+
+# ================= ESTADÍSTICAS =================
+# Como las posiciones, pero también cuenta la temporada: un partido que pasa a
+# otra temporada cambia el desglose de sus equipos.
+@receiver(post_save, sender=Partido)
+def invalidar_estadisticas_partido(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+    campos = {campo.removesuffix("_id") for campo in Partido.CAMPOS_ESTADISTICAS}
+    if update_fields is not None and not campos & set(update_fields):
+        return
+    nuevo = instance.resultado(Partido.CAMPOS_ESTADISTICAS)
+    # Sin lo guardado (instancia armada a mano) se invalidan los equipos de ahora.
+    anterior = getattr(instance, "_estadisticas_guardadas", None)
+    invalidar_estadisticas([(anterior, nuevo)])
+    instance._estadisticas_guardadas = nuevo
+
+
+@receiver(post_delete, sender=Partido)
+def invalidar_estadisticas_eliminado(sender, instance, **kwargs):
+    anterior = getattr(
+        instance,
+        "_estadisticas_guardadas",
+        instance.resultado(Partido.CAMPOS_ESTADISTICAS),
+    )
+    invalidar_estadisticas([(anterior, None)])
+
+
+# ================= EN VIVO =================
+@receiver(post_save, sender=Partido)
+def difundir_partido(sender, instance, created, **kwargs):
+    if created:
+        return
+    canales = canales_partido(instance)
+    evento = evento_partido(instance, "actualizado")
+    transaction.on_commit(lambda: difusor.publicar(canales, evento))
+
+
+@receiver(post_delete, sender=Partido)
+def difundir_eliminacion(sender, instance, **kwargs):
+    canales = canales_partido(instance)
+    evento = evento_partido(instance, "eliminado")
+    transaction.on_commit(lambda: difusor.publicar(canales, evento))
+
+
+# ================= CACHÉ DE RESPUESTAS Y ETAG =================
+# Cada vista declara de qué modelos depende (ver utils/cache_vistas.py).
+@receiver(post_save, sender=Institucion)
+@receiver(post_save, sender=Temporada)
+@receiver(post_save, sender=Torneo)
+@receiver(post_save, sender=Equipo)
+@receiver(post_save, sender=Partido)
+@receiver(post_delete, sender=Institucion)
+@receiver(post_delete, sender=Temporada)
+@receiver(post_delete, sender=Torneo)
+@receiver(post_delete, sender=Equipo)
+@receiver(post_delete, sender=Partido)
+def invalidar_cache_respuestas(sender, instance, **kwargs):
+    if sender is Partido and kwargs.get("created"):
+        return
+    invalidar_respuestas(sender, instance.pk)
+
+
+# ================= SINCRONIZACIÓN =================
+# Van al final: en PostgreSQL registrar_cambios toma un lock compartido hasta
+# que termina la transacción y la lectura del registro espera a que se suelte
+# (ver utils/sincronizacion.py).
+@receiver(post_save, sender=Institucion)
+@receiver(post_save, sender=Temporada)
+@receiver(post_save, sender=Torneo)
+@receiver(post_save, sender=Equipo)
+@receiver(post_save, sender=Partido)
+def registrar_modificacion(sender, instance, created, **kwargs):
+    if sender is Partido and created:
+        return
+    registrar_cambios(ENTIDAD_DE[sender], [instance.pk], nuevos=created)
+
+
+@receiver(post_delete, sender=Institucion)
+@receiver(post_delete, sender=Temporada)
+@receiver(post_delete, sender=Torneo)
+@receiver(post_delete, sender=Equipo)
+@receiver(post_delete, sender=Partido)
+def registrar_eliminacion(sender, instance, **kwargs):
+    registrar_cambios(ENTIDAD_DE[sender], [instance.pk], eliminado=True)
@@ -1,6 +1,16 @@
+import io
 import json
 
+from PIL import Image
+
 
 def parse_response(response):
     """Helper function to parse JSON response data."""
     return json.loads(response.content.decode("utf-8"))
+
+
+def imagen_png(ancho=1, alto=1):
+    """Genera los bytes de una imagen PNG de prueba."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (ancho, alto), (200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
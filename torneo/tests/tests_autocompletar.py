@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion
+from torneo.tests.helpers import parse_response
+from torneo.utils.autocomplete import cargar_al_iniciar, indice_autocompletado
+
+
+class AutocompletarTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        indice_autocompletado.invalidar()
+        self.institucion = Institucion.objects.create(
+            nombreinstitucion="Universidad Técnica"
+        )
+        for nombre in ["Tigres FC", "Tiburones", "Águilas", "Leones Tigres"]:
+            Equipo.objects.create(idinstitucion=self.institucion, nombreequipo=nombre)
+
+    def _sugerir(self, query):
+        response = self.client.get(reverse("autocompletar") + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [s["nombre"] for s in parse_response(response)["data"]]
+
+    def test_prefijo_sin_tildes_ni_mayusculas(self):
+        self.assertEqual(self._sugerir("?q=AGUI"), ["Águilas"])
+        self.assertEqual(self._sugerir("?q=tecn"), ["Universidad Técnica"])
+
+    def test_prefijo_por_palabra_y_orden(self):
+        # Primero los nombres que empiezan por el prefijo, luego los que lo
+        # contienen como palabra.
+        self.assertEqual(
+            self._sugerir("?q=ti"), ["Tiburones", "Tigres FC", "Leones Tigres"]
+        )
+
+    def test_filtro_por_tipo_y_limite(self):
+        self.assertEqual(self._sugerir("?q=u&tipo=equipo"), [])
+        self.assertEqual(len(self._sugerir("?q=ti&limite=1")), 1)
+
+    def test_sin_consultas_a_la_base(self):
+        self._sugerir("?q=ti")
+        with self.assertNumQueries(0):
+            self._sugerir("?q=tig")
+
+    def test_se_carga_al_iniciar(self):
+        with mock.patch("torneo.utils.autocomplete.connections"):
+            cargar_al_iniciar()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._sugerir("?q=tib"), ["Tiburones"])
+
+    def test_sin_tablas_queda_para_la_primera_consulta(self):
+        with (
+            mock.patch("torneo.utils.autocomplete.connections"),
+            mock.patch.object(indice_autocompletado, "cargar", side_effect=DatabaseError),
+        ):
+            cargar_al_iniciar()
+        self.assertEqual(self._sugerir("?q=tib"), ["Tiburones"])
+
+    def test_indice_se_actualiza_con_senales(self):
+        self._sugerir("?q=ti")
+        with self.captureOnCommitCallbacks(execute=True):
+            equipo = Equipo.objects.create(
+                idinstitucion=self.institucion, nombreequipo="Titanes"
+            )
+        self.assertIn("Titanes", self._sugerir("?q=tit"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            equipo.nombreequipo = "Gigantes"
+            equipo.save()
+        self.assertEqual(self._sugerir("?q=tit"), [])
+        self.assertEqual(self._sugerir("?q=gig"), ["Gigantes"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            equipo.delete()
+        self.assertEqual(self._sugerir("?q=gig"), [])
+
+    def test_parametros_invalidos(self):
+        url = reverse("autocompletar")
+        for query in ["?q=a&tipo=partido", "?q=a&limite=0", "?q=a&limite=x"]:
+            response = self.client.get(url + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,377 @@
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion, Llave, Partido, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+from torneo.utils.cache_vistas import contadores, version_datos
+from torneo.utils.llaves import generar_llaves
+from torneo.utils.lectura import PlanLectura
+from torneo.views import partido_view
+
+
+class RespuestasBase(TransactionTestCase):
+    # Datos confirmados de verdad: la caché y los ETag no se usan dentro de una
+    # transacción y las invalidaciones corren al confirmar.
+
+    def setUp(self):
+        cache.clear()
+        contadores.reiniciar()
+        self.client = APIClient()
+        self.ahora = timezone.now()
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst C")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp C",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga C",
+            descripciontorneo="Desc",
+            fechainiciotorneo=self.ahora - timedelta(days=20),
+            fechafintorneo=self.ahora + timedelta(days=20),
+        )
+        self.local = Equipo.objects.create(
+            idinstitucion=self.institucion, nombreequipo="Local C"
+        )
+        self.visitante = Equipo.objects.create(
+            idinstitucion=self.institucion, nombreequipo="Visitante C"
+        )
+        self.partido = Partido.objects.create(
+            fechapartido=self.ahora,
+            idequipolocal=self.local,
+            idequipovisitante=self.visitante,
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+        )
+
+    def _get(self, url, params=None, estado="HIT"):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Cache"], estado)
+        return parse_response(response)
+
+
+class CacheRespuestasTests(RespuestasBase):
+    def test_segunda_lectura_sin_consultas(self):
+        url = reverse("temporada-detail", args=[self.temporada.pk])
+        primera = self._get(url, estado="MISS")
+        with self.assertNumQueries(0):
+            segunda = self._get(url)
+        self.assertEqual(primera, segunda)
+
+    def test_parametros_en_cualquier_orden_comparten_entrada(self):
+        url = reverse("torneo-all")
+        self._get(url, {"page": 1, "offset": 5}, estado="MISS")
+        self._get(f"{url}?offset=5&page=1")
+        self._get(url, {"page": 1, "offset": 6}, estado="MISS")
+
+    def test_modificacion_invalida_el_detalle_y_el_listado(self):
+        detalle = reverse("temporada-detail", args=[self.temporada.pk])
+        listado = reverse("temporada-all")
+        self._get(detalle, estado="MISS")
+        self._get(listado, estado="MISS")
+
+        response = self.client.patch(
+            reverse("temporada-update", args=[self.temporada.pk]),
+            {"descripciontemporada": "Nueva"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = self._get(detalle, estado="MISS")["data"]
+        self.assertEqual(data["descripciontemporada"], "Nueva")
+        self.assertEqual(
+            self._get(listado, estado="MISS")["results"][0]["descripciontemporada"],
+            "Nueva",
+        )
+        # Otras vistas que no dependen de temporadas siguen en caché.
+        self._get(reverse("institucion-all"), estado="MISS")
+        self._get(reverse("institucion-all"))
+
+    def test_renombrar_equipo_invalida_los_partidos(self):
+        detalle = reverse("partido-detail", args=[self.partido.pk])
+        listado = reverse("partido-all")
+        self._get(detalle, estado="MISS")
+        self._get(listado, estado="MISS")
+
+        self.local.nombreequipo = "Renombrado"
+        self.local.save()
+
+        data = self._get(detalle, estado="MISS")["data"]
+        self.assertEqual(data["equipo_local_nombre"], "Renombrado")
+        self.assertEqual(
+            self._get(listado, estado="MISS")["results"][0]["equipo_local_nombre"],
+            "Renombrado",
+        )
+
+    def test_marcador_en_vivo_invalida_el_partido(self):
+        detalle = reverse("partido-detail", args=[self.partido.pk])
+        self._get(detalle, estado="MISS")
+        response = self.client.patch(
+            reverse("partido-marcador", args=[self.partido.pk]),
+            {"sumarlocal": 1},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = self._get(detalle, estado="MISS")["data"]
+        self.assertEqual(data["marcadorequipolocal"], 1)
+
+    def test_errores_no_se_guardan(self):
+        url = reverse("temporada-detail", args=[9999])
+        for _ in range(2):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response["X-Cache"], "MISS")
+
+    def test_contadores(self):
+        url = reverse("institucion-detail", args=[self.institucion.pk])
+        self._get(url, estado="MISS")
+        self._get(url)
+        self._get(url)
+
+        data = parse_response(self.client.get(reverse("cache-respuestas")))["data"]
+        self.assertEqual(data["aciertos"], 2)
+        self.assertEqual(data["fallos"], 1)
+        self.assertEqual(
+            data["vistas"]["InstitucionDetailView"],
+            {"aciertos": 2, "fallos": 1, "obsoletos": 0, "compartidos": 0},
+        )
+
+    def test_contenido_armado_por_la_base(self):
+        url = reverse("partido-all")
+        contenido = b'{"count": 1, "results": []}'
+        with mock.patch.object(PlanLectura, "json_postgres", return_value=contenido):
+            primera = self.client.get(url, {"render": "db"})
+        self.assertEqual(primera["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            segunda = self.client.get(url, {"render": "db"})
+        self.assertEqual(segunda["X-Cache"], "HIT")
+        self.assertEqual(segunda.content, contenido)
+        self.assertEqual(segunda["Content-Type"], "application/json")
+        self.assertEqual(segunda["ETag"], primera["ETag"])
+
+    def test_respuesta_muy_pedida_no_vence(self):
+        url = reverse("temporada-detail", args=[self.temporada.pk])
+        ahora = time.time()
+        with override_settings(RESPUESTAS_CACHE_TIMEOUT=300):
+            self._get(url, estado="MISS")
+            # Pasada la mitad de su duración, un acierto la vuelve a guardar.
+            with mock.patch("time.time", return_value=ahora + 200):
+                self._get(url)
+            with mock.patch("time.time", return_value=ahora + 400):
+                self._get(url)
+
+
+class EtagTests(RespuestasBase):
+    def _etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response["ETag"]
+
+    def _condicional(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_304_sin_consultas_si_no_cambio(self):
+        url = reverse("partido-all")
+        etag = self._etag(url)
+        self.assertTrue(etag.startswith('W/"'))
+        with self.assertNumQueries(0):
+            response = self._condicional(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_cambio_de_datos_cambia_el_etag(self):
+        url = reverse("temporada-all")
+        etag = self._etag(url)
+        response = self.client.patch(
+            reverse("temporada-update", args=[self.temporada.pk]),
+            {"descripciontemporada": "Nueva"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self._condicional(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            self._condicional(url, response["ETag"]).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+    def test_detalle_por_fila(self):
+        otro = Partido.objects.create(
+            fechapartido=self.ahora + timedelta(days=1),
+            idequipolocal=self.visitante,
+            idequipovisitante=self.local,
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+        )
+        url = reverse("partido-detail", args=[self.partido.pk])
+        etag = self._etag(url)
+
+        otro.marcadorequipolocal = 1
+        otro.save()
+        self.assertEqual(self._condicional(url, etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.local.nombreequipo = "Renombrado"
+        self.local.save()
+        self.assertEqual(self._condicional(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_vistas_derivadas(self):
+        url = reverse("torneo-posiciones", args=[self.torneo.pk])
+        etag = self._etag(url)
+        with self.assertNumQueries(0):
+            response = self._condicional(url, etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.patch(
+            reverse("partido-marcador", args=[self.partido.pk]),
+            {"marcadorequipolocal": 2, "marcadorequipovisitante": 0},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._condicional(url, etag).status_code, status.HTTP_200_OK)
+
+    def test_reconstrucciones_invalidan_sus_vistas(self):
+        # Resultado escrito sin señales: la tabla y los ratings quedan atrasados
+        # hasta reconstruirlos.
+        Partido.objects.filter(pk=self.partido.pk).update(
+            marcadorequipolocal=1, marcadorequipovisitante=0
+        )
+        for nombre, args, comando in (
+            ("torneo-posiciones", [self.torneo.pk], "recalcular_posiciones"),
+            ("rating-list", [], "recalcular_ratings"),
+            ("equipo-ratings", [self.local.pk], "recalcular_ratings"),
+        ):
+            url = reverse(nombre, args=args)
+            etag = self._etag(url)
+            call_command(comando, stdout=StringIO())
+            self.assertEqual(
+                self._condicional(url, etag).status_code, status.HTTP_200_OK, nombre
+            )
+
+    def test_generar_llaves_invalida_el_cuadro(self):
+        antes = version_datos([Llave])
+        generar_llaves(self.torneo, [self.local, self.visitante])
+        self.assertNotEqual(version_datos([Llave]), antes)
+
+    def test_comparacion_debil_y_lista(self):
+        url = reverse("institucion-all")
+        etag = self._etag(url)
+        for cabecera in (etag.removeprefix("W/"), f'"otro", {etag}', "*"):
+            self.assertEqual(
+                self._condicional(url, cabecera).status_code,
+                status.HTTP_304_NOT_MODIFIED,
+            )
+        self.assertEqual(self._condicional(url, '"otro"').status_code, status.HTTP_200_OK)
+
+    def test_errores_sin_etag(self):
+        response = self.client.get(reverse("partido-detail", args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn("ETag", response)
+
+
+class VuelosTests(RespuestasBase):
+    """Peticiones idénticas simultáneas desde varios hilos, como en ASGI."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("partido-bytemporadas")
+        self.params = {"temporadaId": self.temporada.pk}
+        self.entro = threading.Event()
+        self.liberar = threading.Event()
+        self.ejecuciones = 0
+        original = partido_view.paginate_queryset
+
+        def lenta(*args, **kwargs):
+            self.ejecuciones += 1
+            self.entro.set()
+            self.liberar.wait(5)
+            return original(*args, **kwargs)
+
+        parche = mock.patch.object(partido_view, "paginate_queryset", lenta)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def _en_hilo(self, respuestas):
+        def pedir():
+            try:
+                respuestas.append(APIClient().get(self.url, self.params))
+            finally:
+                connection.close()
+
+        hilo = threading.Thread(target=pedir)
+        hilo.start()
+        return hilo
+
+    def test_una_sola_ejecucion(self):
+        respuestas = []
+        hilos = [self._en_hilo(respuestas)]
+        self.assertTrue(self.entro.wait(5))
+        hilos += [self._en_hilo(respuestas) for _ in range(4)]
+        time.sleep(0.1)
+        self.liberar.set()
+        for hilo in hilos:
+            hilo.join(5)
+
+        self.assertEqual(self.ejecuciones, 1)
+        self.assertEqual(len(respuestas), 5)
+        estados = [r["X-Cache"] for r in respuestas]
+        self.assertEqual(estados.count("MISS"), 1)
+        self.assertIn("SHARED", estados)
+        self.assertTrue(set(estados) <= {"MISS", "SHARED", "HIT"})
+        self.assertTrue(all(r.status_code == status.HTTP_200_OK for r in respuestas))
+        self.assertEqual(len({r["ETag"] for r in respuestas}), 1)
+        self.assertEqual(len({r.content for r in respuestas}), 1)
+
+    def test_datos_anteriores_mientras_se_recalcula(self):
+        self.liberar.set()
+        anterior = self.client.get(self.url, self.params)
+        self.assertEqual(anterior["X-Cache"], "MISS")
+        self.liberar.clear()
+        self.entro.clear()
+
+        self.partido.marcadorequipolocal = 3
+        self.partido.save()
+        respuestas = []
+        hilo = self._en_hilo(respuestas)
+        self.assertTrue(self.entro.wait(5))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, self.params)
+        self.assertEqual(response["X-Cache"], "STALE")
+        self.assertEqual(response["ETag"], anterior["ETag"])
+        self.assertEqual(response.content, anterior.content)
+
+        self.liberar.set()
+        hilo.join(5)
+        self.assertEqual(respuestas[0]["X-Cache"], "MISS")
+        data = self._get(self.url, self.params)
+        self.assertEqual(data["results"][0]["marcadorequipolocal"], 3)
+        self.assertEqual(self.ejecuciones, 2)
+        resumen = contadores.resumen()
+        self.assertEqual((resumen["obsoletos"], resumen["aciertos"]), (1, 1))
+
+
+class RespuestasTransaccionTests(TestCase):
+    def test_dentro_de_una_transaccion_no_se_usan(self):
+        response = APIClient().get(reverse("temporada-all"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Cache", response)
+        self.assertNotIn("ETag", response)
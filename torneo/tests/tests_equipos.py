@@ -1,9 +1,15 @@
+import base64
+import io
+
 from django.urls import reverse
-from django.test import TestCase
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 from rest_framework import status
-from torneo.models import Equipo, Institucion
-from torneo.tests.helpers import parse_response
+from torneo.models import Equipo, Imagen, ImagenVariante, Institucion
+from torneo.tests.helpers import imagen_png, parse_response
 
 
 class EquipoTests(TestCase):
@@ -137,3 +143,211 @@ class EquipoTests(TestCase):
         if response.status_code == status.HTTP_200_OK:
             data = parse_response(response)
             self.assertIn("results", data)
+
+    # ---------- Imagen (endpoint dedicado y cacheable) ----------
+    def _data_uri(self, datos):
+        return "data:image/png;base64," + base64.b64encode(datos).decode()
+
+    def _crear_equipo_con_imagen(self, ancho=1, alto=1):
+        self.png = imagen_png(ancho, alto)
+        url = reverse("equipo-list-create")
+        data = {
+            "idinstitucion": self.institucion.idinstitucion,
+            "nombreequipo": "Halcones",
+            "imagenequipo": self._data_uri(self.png),
+        }
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return parse_response(response)["data"]
+
+    def test_imagen_se_devuelve_como_url(self):
+        equipo = self._crear_equipo_con_imagen()
+        self.assertIn(
+            reverse("equipo-imagen", args=[equipo["idequipo"]]), equipo["imagenequipo"]
+        )
+
+        listado = parse_response(self.client.get(reverse("equipo-all") + "?offset=100"))
+        sin_imagen = [e for e in listado["results"] if e["idequipo"] != equipo["idequipo"]]
+        self.assertTrue(all(e["imagenequipo"] is None for e in sin_imagen))
+
+    def test_imagen_endpoint_etag_y_304(self):
+        equipo = self._crear_equipo_con_imagen()
+        url = reverse("equipo-imagen", args=[equipo["idequipo"]]) + "?size=original"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response.content, self.png)
+        self.assertIn("max-age", response["Cache-Control"])
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(IMAGENES_WORKERS=0)
+    def test_imagen_url_versionada_inmutable(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            equipo = self._crear_equipo_con_imagen()
+        response = self.client.get(equipo["imagenequipo"])
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_imagen_inexistente(self):
+        url = reverse("equipo-imagen", args=[self.equipos[0].idequipo])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            parse_response(response),
+            {"error": "Imagen no encontrada", "data": None, "status": 404},
+        )
+
+    def test_imagen_tamano_invalido(self):
+        equipo = self._crear_equipo_con_imagen()
+        url = reverse("equipo-imagen", args=[equipo["idequipo"]])
+        for size in ("abc", "0"):
+            response = self.client.get(url, {"size": size})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, size)
+            self.assertEqual(response["Content-Type"], "application/json")
+            self.assertEqual(parse_response(response)["error"], "Tamaño de imagen inválido")
+
+    def test_imagen_base64_invalida(self):
+        url = reverse("equipo-list-create")
+        data = dict(self.data, nombreequipo="Cóndores", imagenequipo="no-es-imagen")
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_imagen_repetida_se_guarda_una_vez(self):
+        primero = self._crear_equipo_con_imagen()
+        url = reverse("equipo-update", args=[self.equipos[0].idequipo])
+        response = self.client.patch(
+            url, {"imagenequipo": self._data_uri(self.png)}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Imagen.objects.count(), 1)
+        self.assertEqual(
+            parse_response(response)["data"]["imagenequipo"].split("?")[1],
+            primero["imagenequipo"].split("?")[1],
+        )
+
+    @override_settings(IMAGENES_WORKERS=0)
+    def test_imagen_reemplazada_se_libera(self):
+        equipo = self._crear_equipo_con_imagen()
+        url = reverse("equipo-update", args=[equipo["idequipo"]])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                url, {"imagenequipo": self._data_uri(imagen_png(2, 2))}, format="json"
+            )
+        self.assertEqual(Imagen.objects.count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {"imagenequipo": None}, format="json")
+        self.assertEqual(Imagen.objects.count(), 0)
+
+    # ---------- Variantes (miniaturas y WebP) ----------
+    @override_settings(IMAGENES_WORKERS=0)
+    def test_variantes_generadas_al_subir(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            equipo = self._crear_equipo_con_imagen(600, 400)
+        self.assertEqual(ImagenVariante.objects.count(), 4)
+        self.assertIn("size=256", equipo["imagenequipo"])
+
+        url = reverse("equipo-imagen", args=[equipo["idequipo"]])
+        response = self.client.get(url + "?size=64")
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (64, 43))
+
+        response = self.client.get(url + "?size=200", HTTP_ACCEPT="image/webp,*/*")
+        self.assertEqual(response["Content-Type"], "image/webp")
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (256, 171))
+        self.assertIn("Accept", response["Vary"])
+
+    def test_variante_pendiente_sirve_original(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            equipo = self._crear_equipo_con_imagen(300, 300)
+        response = self.client.get(equipo["imagenequipo"])
+        self.assertEqual(response.content, self.png)
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_variante_tamano_invalido(self):
+        equipo = self._crear_equipo_con_imagen()
+        url = reverse("equipo-imagen", args=[equipo["idequipo"]])
+        response = self.client.get(url + "?size=grande")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_comando_genera_variantes_pendientes(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            self._crear_equipo_con_imagen(100, 100)
+        call_command("generar_variantes_imagenes", stdout=io.StringIO())
+        self.assertEqual(ImagenVariante.objects.count(), 4)
+
+    # ---------- Subida multipart / octet-stream ----------
+    def test_crear_equipo_multipart(self):
+        png = imagen_png(40, 40)
+        data = {
+            "idinstitucion": self.institucion.idinstitucion,
+            "nombreequipo": "Búhos",
+            "imagenequipo": SimpleUploadedFile("buho.png", png, "image/png"),
+        }
+        response = self.client.post(reverse("equipo-list-create"), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        imagen = Imagen.objects.get()
+        self.assertEqual(bytes(imagen.datosimagen), png)
+        self.assertEqual(imagen.tipoimagen, "image/png")
+        self.assertTrue(parse_response(response)["data"]["equipoactivo"])
+        self.assertTrue(Equipo.objects.get(nombreequipo="Búhos").equipoactivo)
+
+    def test_actualizar_multipart_conserva_equipoactivo(self):
+        equipo = self.equipos[0]
+        Equipo.objects.filter(pk=equipo.pk).update(equipoactivo=False)
+        url = reverse("equipo-update", args=[equipo.idequipo])
+        response = self.client.patch(url, {"nombreequipo": "Renombrado"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        equipo.refresh_from_db()
+        self.assertFalse(equipo.equipoactivo)
+
+    def test_actualizar_imagen_octet_stream(self):
+        png = imagen_png(10, 10)
+        url = reverse("equipo-update", args=[self.equipos[0].idequipo])
+        response = self.client.patch(
+            url, png, content_type="application/octet-stream"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.equipos[0].refresh_from_db()
+        self.assertEqual(bytes(self.equipos[0].imagenhash.datosimagen), png)
+
+    def test_subida_repetida_no_duplica(self):
+        png = imagen_png(10, 10)
+        for equipo in self.equipos[:2]:
+            url = reverse("equipo-update", args=[equipo.idequipo])
+            self.client.patch(url, png, content_type="application/octet-stream")
+        self.assertEqual(Imagen.objects.count(), 1)
+
+    @override_settings(IMAGENES_TAMANO_MAX=1024)
+    def test_subida_demasiado_grande(self):
+        url = reverse("equipo-update", args=[self.equipos[0].idequipo])
+        response = self.client.patch(
+            url, b"\x89PNG" + b"0" * 2048, content_type="application/octet-stream"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Imagen.objects.count(), 0)
+
+    @override_settings(IMAGENES_DIMENSION_MAX=32)
+    def test_subida_dimensiones_excedidas(self):
+        url = reverse("equipo-update", args=[self.equipos[0].idequipo])
+        response = self.client.patch(
+            url, imagen_png(64, 16), content_type="application/octet-stream"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("32x32", parse_response(response)["error"])
+
+        response = self.client.patch(
+            url, {"imagenequipo": self._data_uri(imagen_png(64, 16))}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_subida_no_es_imagen(self):
+        url = reverse("equipo-update", args=[self.equipos[0].idequipo])
+        response = self.client.patch(
+            url, b"esto no es una imagen", content_type="application/octet-stream"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
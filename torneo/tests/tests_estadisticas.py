@@ -0,0 +1,225 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+
+
+class EstadisticasBase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.ahora = timezone.now()
+        institucion = Institucion.objects.create(nombreinstitucion="Inst E")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp E",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+        self.liga, self.copa = (
+            Torneo.objects.create(
+                idtemporada=self.temporada,
+                nombretorneo=nombre,
+                descripciontorneo="Desc",
+                fechainiciotorneo=self.ahora - timedelta(days=20),
+                fechafintorneo=self.ahora + timedelta(days=20),
+            )
+            for nombre in ("Liga E", "Copa E")
+        )
+        self.a, self.b = (
+            Equipo.objects.create(idinstitucion=institucion, nombreequipo=nombre)
+            for nombre in ("Alfa", "Beta")
+        )
+
+    def _partido(self, torneo, local, visitante, dias, marcador=(None, None)):
+        return Partido.objects.create(
+            fechapartido=self.ahora + timedelta(days=dias),
+            idequipolocal=local,
+            idequipovisitante=visitante,
+            idtorneo=torneo,
+            idtemporada=self.temporada,
+            marcadorequipolocal=marcador[0],
+            marcadorequipovisitante=marcador[1],
+        )
+
+
+class EstadisticasEquipoTests(EstadisticasBase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("equipo-estadisticas", args=[self.a.idequipo])
+
+    def _estadisticas(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return parse_response(response)["data"]
+
+    def test_totales_y_division_local_visitante(self):
+        self._partido(self.liga, self.a, self.b, 1, (3, 1))
+        self._partido(self.liga, self.b, self.a, 2, (2, 2))
+        self._partido(self.copa, self.b, self.a, 3, (1, 0))
+        self._partido(self.copa, self.a, self.b, 4)
+
+        data = self._estadisticas()
+        total = data["total"]
+        self.assertEqual(total["partidosjugados"], 3)
+        self.assertEqual(
+            (total["partidosganados"], total["partidosempatados"], total["partidosperdidos"]),
+            (1, 1, 1),
+        )
+        self.assertEqual((total["golesfavor"], total["golescontra"]), (5, 4))
+        self.assertEqual(total["diferenciagoles"], 1)
+        self.assertEqual(total["local"]["partidosganados"], 1)
+        self.assertEqual(total["local"]["golesfavor"], 3)
+        self.assertEqual(total["visitante"]["partidosjugados"], 2)
+        self.assertEqual(total["visitante"]["diferenciagoles"], -1)
+
+        [temporada] = data["temporadas"]
+        self.assertEqual(temporada["idtemporada"], self.temporada.idtemporada)
+        self.assertEqual(temporada["partidosjugados"], 3)
+        torneos = {torneo["idtorneo"]: torneo for torneo in temporada["torneos"]}
+        self.assertEqual(torneos[self.liga.idtorneo]["partidosjugados"], 2)
+        self.assertEqual(torneos[self.copa.idtorneo]["partidosperdidos"], 1)
+        self.assertEqual(torneos[self.copa.idtorneo]["visitante"]["golescontra"], 1)
+
+    def test_segunda_lectura_sale_de_la_cache(self):
+        self._partido(self.liga, self.a, self.b, 1, (1, 0))
+        self._estadisticas()
+        with self.assertNumQueries(0):
+            self._estadisticas()
+
+    def test_cambio_de_marcador_invalida_la_cache(self):
+        partido = self._partido(self.liga, self.a, self.b, 1, (1, 0))
+        self.assertEqual(self._estadisticas()["total"]["partidosganados"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("partido-update", args=[partido.idpartido]),
+                {"marcadorequipolocal": 0, "marcadorequipovisitante": 2},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        total = self._estadisticas()["total"]
+        self.assertEqual((total["partidosganados"], total["partidosperdidos"]), (0, 1))
+
+    def test_cambio_de_temporada_invalida_la_cache(self):
+        partido = self._partido(self.liga, self.a, self.b, 1, (1, 0))
+        [temporada] = self._estadisticas()["temporadas"]
+        self.assertEqual(temporada["idtemporada"], self.temporada.idtemporada)
+        otra = Temporada.objects.create(
+            nombretemporada="Temp F",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+
+        partido = Partido.objects.get(pk=partido.pk)
+        partido.idtemporada = otra
+        with self.captureOnCommitCallbacks(execute=True):
+            partido.save(update_fields=["idtemporada"])
+        [temporada] = self._estadisticas()["temporadas"]
+        self.assertEqual(temporada["idtemporada"], otra.idtemporada)
+
+    def test_cambio_de_otro_equipo_no_invalida(self):
+        self._partido(self.liga, self.a, self.b, 1, (1, 0))
+        self._estadisticas()
+        otro = Equipo.objects.create(
+            idinstitucion=self.a.idinstitucion, nombreequipo="Otro"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self._partido(self.liga, self.b, otro, 2, (2, 0))
+        with self.assertNumQueries(0):
+            self._estadisticas()
+
+    def test_equipo_sin_partidos(self):
+        data = self._estadisticas()
+        self.assertEqual(data["total"]["partidosjugados"], 0)
+        self.assertEqual(data["temporadas"], [])
+
+    def test_equipo_inexistente(self):
+        response = self.client.get(reverse("equipo-estadisticas", args=[99999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EnfrentamientoTests(EstadisticasBase):
+    def setUp(self):
+        super().setUp()
+        self.c = Equipo.objects.create(
+            idinstitucion=self.a.idinstitucion, nombreequipo="Gamma"
+        )
+        self.url = reverse("equipo-enfrentamiento", args=[self.a.idequipo, self.b.idequipo])
+
+    def _enfrentamiento(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return parse_response(response)["data"]
+
+    def test_resumen_desde_el_lado_del_equipo(self):
+        self._partido(self.liga, self.a, self.b, 1, (3, 1))
+        self._partido(self.liga, self.b, self.a, 2, (2, 0))
+        self._partido(self.copa, self.b, self.a, 3, (1, 1))
+        self._partido(self.liga, self.a, self.c, 4, (5, 0))
+        self._partido(self.copa, self.a, self.b, 5)
+
+        resumen = self._enfrentamiento()["resumen"]
+        self.assertEqual(resumen["partidosjugados"], 3)
+        self.assertEqual(
+            (
+                resumen["partidosganados"],
+                resumen["partidosempatados"],
+                resumen["partidosperdidos"],
+            ),
+            (1, 1, 1),
+        )
+        self.assertEqual((resumen["golesfavor"], resumen["golescontra"]), (4, 4))
+        self.assertEqual(resumen["local"]["partidosganados"], 1)
+        self.assertEqual(resumen["visitante"]["partidosperdidos"], 1)
+        self.assertEqual(resumen["visitante"]["golescontra"], 3)
+
+        inverso = self._enfrentamiento(
+            reverse("equipo-enfrentamiento", args=[self.b.idequipo, self.a.idequipo])
+        )["resumen"]
+        self.assertEqual(inverso["partidosganados"], resumen["partidosperdidos"])
+        self.assertEqual(inverso["local"]["golesfavor"], resumen["visitante"]["golescontra"])
+
+    def test_ultimos_partidos_jugados(self):
+        for dias in range(1, 6):
+            self._partido(self.liga, self.a, self.b, dias, (dias, 0))
+        self._partido(self.liga, self.a, self.b, 6)
+
+        partidos = self._enfrentamiento(ultimos=3)["partidos"]
+        self.assertEqual(
+            [partido["marcadorequipolocal"] for partido in partidos], [5, 4, 3]
+        )
+        self.assertEqual(partidos[0]["equipo_visitante_nombre"], "Beta")
+
+    def test_consultas_acotadas(self):
+        for dias in range(1, 6):
+            self._partido(self.liga, self.a, self.b, dias, (1, 0))
+        with self.assertNumQueries(2):
+            self._enfrentamiento()
+
+    def test_sin_partidos(self):
+        data = self._enfrentamiento()
+        self.assertEqual(data["resumen"]["partidosjugados"], 0)
+        self.assertEqual(data["partidos"], [])
+
+    def test_parametros_invalidos(self):
+        for params in ({"ultimos": 0}, {"ultimos": "x"}, {"ultimos": 51}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mismo = reverse("equipo-enfrentamiento", args=[self.a.idequipo, self.a.idequipo])
+        self.assertEqual(self.client.get(mismo).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_equipo_inexistente(self):
+        response = self.client.get(
+            reverse("equipo-enfrentamiento", args=[self.a.idequipo, 99999])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.utils.difusion import Difusor, difusor
+
+
+def _evento(fragmento):
+    """Convierte un fragmento SSE en (nombre, datos)."""
+    lineas = dict(
+        linea.split(": ", 1) for linea in fragmento.decode().strip().split("\n")
+    )
+    return lineas["event"], json.loads(lineas["data"])
+
+
+class DifusorTests(TestCase):
+    async def test_entrega_desde_otro_hilo(self):
+        hub = Difusor()
+        with hub.suscribir(("partido", 1)) as suscripcion:
+            hilo = threading.Thread(
+                target=hub.publicar, args=([("partido", 1), ("torneo", 2)], {"n": 1})
+            )
+            hilo.start()
+            hilo.join()
+            self.assertEqual(await suscripcion.recibir(1), {"n": 1})
+            hub.publicar([("partido", 2)], {"n": 2})
+            self.assertIsNone(await suscripcion.recibir(0.05))
+        self.assertEqual(hub.total(), 0)
+
+    async def test_cola_llena_conserva_lo_ultimo(self):
+        hub = Difusor()
+        with hub.suscribir(("torneo", 1), maximo=2) as suscripcion:
+            for n in range(5):
+                hub.publicar([("torneo", 1)], n)
+            await asyncio.sleep(0)
+            self.assertEqual(
+                [await suscripcion.recibir(1), await suscripcion.recibir(1)], [3, 4]
+            )
+
+
+class EventosTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        ahora = timezone.now()
+        institucion = Institucion.objects.create(nombreinstitucion="Inst V")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp V",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=ahora - timedelta(days=5),
+            fechafintemporada=ahora + timedelta(days=10),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga V",
+            descripciontorneo="Desc",
+            fechainiciotorneo=ahora - timedelta(days=2),
+            fechafintorneo=ahora + timedelta(days=4),
+        )
+        local, visitante = (
+            Equipo.objects.create(idinstitucion=institucion, nombreequipo=nombre)
+            for nombre in ("Alfa", "Beta")
+        )
+        self.partido = Partido.objects.create(
+            fechapartido=ahora + timedelta(days=1),
+            idequipolocal=local,
+            idequipovisitante=visitante,
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+        )
+
+    def _sumar_gol(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("partido-marcador", args=[self.partido.idpartido]),
+                {"sumarlocal": 1},
+                format="json",
+            )
+
+    def _cargar_lote(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("partido-bulk-create"),
+                [
+                    {
+                        "fechapartido": (self.partido.fechapartido + timedelta(days=1)).isoformat(),
+                        "idequipolocal": self.partido.idequipolocal_id,
+                        "idequipovisitante": self.partido.idequipovisitante_id,
+                        "idtorneo": self.torneo.idtorneo,
+                        "idtemporada": self.temporada.idtemporada,
+                    }
+                ],
+                format="json",
+            )
+        self.assertEqual(response.status_code, 201)
+
+    async def _abrir(self, url):
+        response = await self.async_client.get(url)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        contenido = aiter(response.streaming_content)
+        self.assertTrue((await anext(contenido)).startswith(b"retry:"))
+        return contenido
+
+    async def _desconectar(self, contenido):
+        """Al desconectarse el cliente, el servidor ASGI cancela la respuesta."""
+        esperando = asyncio.ensure_future(anext(contenido))
+        await asyncio.sleep(0.01)
+        esperando.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await esperando
+
+    async def test_estado_inicial_y_cambios_del_partido(self):
+        contenido = await self._abrir(
+            reverse("partido-eventos", args=[self.partido.idpartido])
+        )
+        nombre, datos = _evento(await anext(contenido))
+        self.assertEqual(nombre, "estado")
+        self.assertIsNone(datos["marcadorequipolocal"])
+
+        await sync_to_async(self._sumar_gol)()
+        nombre, datos = _evento(await asyncio.wait_for(anext(contenido), 1))
+        self.assertEqual(nombre, "actualizado")
+        self.assertEqual(datos["marcadorequipolocal"], 1)
+        self.assertEqual(datos["version"], 1)
+        self.assertEqual(difusor.total(), 1)
+        await self._desconectar(contenido)
+        self.assertEqual(difusor.total(), 0)
+
+    async def test_cambios_del_torneo(self):
+        contenido = await self._abrir(reverse("torneo-eventos", args=[self.torneo.idtorneo]))
+        await sync_to_async(self._sumar_gol)()
+        nombre, datos = _evento(await asyncio.wait_for(anext(contenido), 1))
+        self.assertEqual((nombre, datos["idpartido"]), ("actualizado", self.partido.idpartido))
+        await self._desconectar(contenido)
+
+    @override_settings(EVENTOS_KEEPALIVE=0.05)
+    async def test_keep_alive(self):
+        contenido = await self._abrir(
+            reverse("temporada-eventos", args=[self.temporada.idtemporada])
+        )
+        self.assertEqual(await asyncio.wait_for(anext(contenido), 1), b": keep-alive\n\n")
+        await self._desconectar(contenido)
+
+    async def test_carga_masiva(self):
+        contenido = await self._abrir(reverse("torneo-eventos", args=[self.torneo.idtorneo]))
+        await sync_to_async(self._cargar_lote)()
+        nombre, datos = _evento(await asyncio.wait_for(anext(contenido), 1))
+        self.assertEqual(nombre, "creado")
+        self.assertNotEqual(datos["idpartido"], self.partido.idpartido)
+        self.assertEqual((datos["idtorneo"], datos["version"]), (self.torneo.idtorneo, 0))
+        await self._desconectar(contenido)
+
+    async def test_inexistente(self):
+        response = await self.async_client.get(reverse("torneo-eventos", args=[99999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            json.loads(response.content),
+            {"error": "Torneo no encontrado", "data": None, "status": 404},
+        )
@@ -0,0 +1,150 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import connection
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+from torneo.utils.fixture import rondas_todos_contra_todos
+
+
+class RondasTests(TestCase):
+    def _comprobar(self, equipos, rondas, partidos_por_par):
+        pares = Counter(frozenset(par) for ronda in rondas for par in ronda)
+        self.assertEqual(len(pares), len(equipos) * (len(equipos) - 1) // 2)
+        self.assertEqual(set(pares.values()), {partidos_por_par})
+        for ronda in rondas:
+            jugando = [equipo for par in ronda for equipo in par]
+            self.assertEqual(len(jugando), len(set(jugando)))
+
+    def test_numero_par_de_equipos(self):
+        equipos = list(range(6))
+        rondas = rondas_todos_contra_todos(equipos)
+        self.assertEqual(len(rondas), 5)
+        self._comprobar(equipos, rondas, 1)
+
+    def test_numero_impar_descansa_uno(self):
+        equipos = list(range(5))
+        rondas = rondas_todos_contra_todos(equipos)
+        self.assertEqual(len(rondas), 5)
+        self.assertTrue(all(len(ronda) == 2 for ronda in rondas))
+        self._comprobar(equipos, rondas, 1)
+
+    def test_ida_y_vuelta_invierte_localia(self):
+        equipos = list(range(4))
+        rondas = rondas_todos_contra_todos(equipos, ida_y_vuelta=True)
+        self.assertEqual(len(rondas), 6)
+        self._comprobar(equipos, rondas, 2)
+        partidos = Counter(par for ronda in rondas for par in ronda)
+        self.assertEqual(set(partidos.values()), {1})
+
+
+class FixtureTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        ahora = timezone.now()
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst F")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp F",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=ahora,
+            fechafintemporada=ahora + timedelta(days=200),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga F",
+            descripciontorneo="Desc",
+            fechainiciotorneo=ahora,
+            fechafintorneo=ahora + timedelta(days=180),
+        )
+        self.equipos = Equipo.objects.bulk_create(
+            Equipo(idinstitucion=self.institucion, nombreequipo=f"Equipo {n}")
+            for n in range(64)
+        )
+        self.url = reverse("torneo-fixture", args=[self.torneo.idtorneo])
+
+    def _ids(self, cantidad):
+        return [equipo.idequipo for equipo in self.equipos[:cantidad]]
+
+    def test_fixture_64_equipos(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.post(
+                self.url, {"equipos": self._ids(64)}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Torneo, equipos y partidos existentes; el resto son INSERT por lotes
+        # (y, en PostgreSQL, el lock del registro de sincronización).
+        lecturas = [
+            q
+            for q in consultas
+            if q["sql"].startswith("SELECT") and "pg_advisory" not in q["sql"]
+        ]
+        self.assertEqual(len(lecturas), 3)
+        self.assertEqual(len(parse_response(response)["data"]), 2016)
+
+        partidos = Partido.objects.filter(idtorneo=self.torneo)
+        self.assertEqual(partidos.count(), 2016)
+        ocupados = Counter()
+        for local, visitante, fecha in partidos.values_list(
+            "idequipolocal", "idequipovisitante", "fechapartido"
+        ):
+            self.assertTrue(
+                self.torneo.fechainiciotorneo <= fecha <= self.torneo.fechafintorneo
+            )
+            ocupados[(local, fecha)] += 1
+            ocupados[(visitante, fecha)] += 1
+        self.assertEqual(set(ocupados.values()), {1})
+
+    def test_ida_y_vuelta(self):
+        response = self.client.post(
+            self.url, {"equipos": self._ids(4), "idayvuelta": True}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Partido.objects.filter(idtorneo=self.torneo).count(), 12)
+
+    def test_evita_partidos_existentes(self):
+        # El primer partido del fixture caería justo en la fecha de inicio.
+        existente = Partido.objects.create(
+            fechapartido=self.torneo.fechainiciotorneo.replace(second=0, microsecond=0)
+            + timedelta(minutes=1),
+            idequipolocal=self.equipos[0],
+            idequipovisitante=self.equipos[10],
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+        )
+        response = self.client.post(self.url, {"equipos": self._ids(4)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        nuevos = Partido.objects.filter(idtorneo=self.torneo).exclude(pk=existente.pk)
+        self.assertFalse(
+            nuevos.filter(
+                idequipolocal=self.equipos[0], fechapartido=existente.fechapartido
+            ).exists()
+        )
+        self.assertFalse(
+            nuevos.filter(
+                idequipovisitante=self.equipos[0], fechapartido=existente.fechapartido
+            ).exists()
+        )
+
+    def test_sin_fechas_libres(self):
+        self.torneo.fechafintorneo = self.torneo.fechainiciotorneo
+        self.torneo.save()
+        response = self.client.post(self.url, {"equipos": self._ids(4)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Partido.objects.exists())
+
+    def test_parametros_invalidos(self):
+        for equipos in ([self.equipos[0].idequipo], self._ids(2) * 2, [9999, 9998]):
+            response = self.client.post(self.url, {"equipos": equipos}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_torneo_inexistente(self):
+        url = reverse("torneo-fixture", args=[9999])
+        response = self.client.post(url, {"equipos": self._ids(2)}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
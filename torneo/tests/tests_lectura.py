@@ -0,0 +1,122 @@
+import json
+from datetime import timedelta
+from unittest import skipIf, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.serializers import EquipoSerializer, PartidoSerializer, TorneoSerializer
+from torneo.tests.helpers import parse_response
+from torneo.utils.lectura import plan_lectura
+from torneo.views import apply_select_related
+
+
+class LecturaTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.ahora = timezone.now().replace(microsecond=123456)
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst L")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp Ñandú",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga \"L\"",
+            descripciontorneo="Desc",
+            fechainiciotorneo=self.ahora - timedelta(days=20),
+            fechafintorneo=self.ahora.replace(microsecond=0) + timedelta(days=20),
+        )
+        self.local = Equipo.objects.create(
+            idinstitucion=self.institucion, nombreequipo="Local L"
+        )
+        self.visitante = Equipo.objects.create(
+            idinstitucion=self.institucion, nombreequipo="Visitante L"
+        )
+        for dias, marcador in ((0, None), (1, 2), (2, 0)):
+            Partido.objects.create(
+                fechapartido=self.ahora + timedelta(days=dias),
+                idequipolocal=self.local,
+                idequipovisitante=self.visitante,
+                idtorneo=self.torneo,
+                idtemporada=self.temporada,
+                marcadorequipolocal=marcador,
+                marcadorequipovisitante=marcador,
+                partidosubido=bool(dias),
+            )
+
+    def _json_identico(self, serializer_class, queryset):
+        esperado = serializer_class(
+            apply_select_related(queryset, serializer_class), many=True
+        ).data
+        self.assertEqual(
+            JSONRenderer().render(plan_lectura(serializer_class).leer(queryset)),
+            JSONRenderer().render(esperado),
+        )
+
+    def test_partidos_identicos_al_serializador(self):
+        self._json_identico(PartidoSerializer, Partido.objects.order_by("idpartido"))
+
+    def test_torneos_identicos_al_serializador(self):
+        self._json_identico(TorneoSerializer, Torneo.objects.order_by("idtorneo"))
+
+    def test_listado_en_una_consulta(self):
+        # Conteo y página; en modo cursor, solo la página.
+        for params, consultas, filas in (({}, 2, 3), ({"cursor": "", "offset": 2}, 1, 2)):
+            with self.assertNumQueries(consultas):
+                response = self.client.get(reverse("partido-all"), params)
+            data = parse_response(response)
+            self.assertEqual(len(data["results"]), filas)
+            self.assertEqual(data["results"][0]["equipo_local_nombre"], "Local L")
+
+        siguiente = self.client.get(
+            reverse("partido-all"), {"cursor": data["next"], "offset": 2}
+        )
+        self.assertEqual(len(parse_response(siguiente)["results"]), 1)
+
+    def test_solo_serializadores_que_lo_declaran(self):
+        self.assertIsNone(plan_lectura(EquipoSerializer))
+
+    @skipIf(connection.vendor == "postgresql", "en PostgreSQL el JSON lo arma la base")
+    def test_render_db_sin_postgresql_responde_como_siempre(self):
+        url = reverse("partido-bytemporadas")
+        params = {"temporadaId": self.temporada.pk, "offset": 2}
+        normal = self.client.get(url, params)
+        response = self.client.get(url, {**params, "render": "db"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, normal.content)
+
+    @skipUnless(connection.vendor == "postgresql", "render=db solo se arma en PostgreSQL")
+    def test_render_db_igual_a_la_pagina_normal(self):
+        casos = (
+            ("partido-bytemporadas", {"temporadaId": self.temporada.pk}),
+            ("partido-all", {}),
+            ("torneo-all", {}),
+        )
+        for nombre, params in casos:
+            for page in (1, 2):
+                params = {**params, "offset": 2, "page": page}
+                normal = self.client.get(reverse(nombre), params)
+                response = self.client.get(reverse(nombre), {**params, "render": "db"})
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertEqual(
+                    json.loads(response.content), parse_response(normal), (nombre, page)
+                )
+
+    @skipUnless(connection.vendor == "postgresql", "render=db solo se arma en PostgreSQL")
+    def test_render_db_respeta_el_orden(self):
+        plan = plan_lectura(PartidoSerializer)
+        for orden in ("-fechapartido", "marcadorequipolocal"):
+            queryset = Partido.objects.order_by(orden, "idpartido")
+            self.assertEqual(
+                json.loads(plan.json_postgres(queryset[:2]))["results"],
+                json.loads(JSONRenderer().render(plan.leer(queryset[:2]))),
+                orden,
+            )
@@ -0,0 +1,181 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion, Llave, Partido, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+from torneo.utils.llaves import orden_siembra
+
+
+class LlavesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        ahora = timezone.now()
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst L")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp L",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=ahora,
+            fechafintemporada=ahora + timedelta(days=60),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Copa L",
+            descripciontorneo="Desc",
+            fechainiciotorneo=ahora,
+            fechafintorneo=ahora + timedelta(days=30),
+        )
+        self.equipos = Equipo.objects.bulk_create(
+            Equipo(idinstitucion=self.institucion, nombreequipo=f"Sembrado {n}")
+            for n in range(1, 9)
+        )
+        self.url = reverse("torneo-llaves", args=[self.torneo.idtorneo])
+
+    def _generar(self, cantidad):
+        ids = [equipo.idequipo for equipo in self.equipos[:cantidad]]
+        response = self.client.post(self.url, {"equipos": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return parse_response(response)["data"]
+
+    def _llave(self, ronda, posicion):
+        return Llave.objects.get(idtorneo=self.torneo, ronda=ronda, posicion=posicion)
+
+    def _marcar(self, llave, local, visitante):
+        url = reverse("partido-update", args=[llave.idpartido_id])
+        response = self.client.patch(
+            url,
+            {"marcadorequipolocal": local, "marcadorequipovisitante": visitante},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_orden_siembra(self):
+        self.assertEqual(orden_siembra(2), [1, 2])
+        self.assertEqual(orden_siembra(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+    def test_cuadro_completo(self):
+        cuadro = self._generar(8)
+        self.assertEqual([len(r["llaves"]) for r in cuadro["rondas"]], [4, 2, 1])
+        primera = cuadro["rondas"][0]["llaves"]
+        self.assertEqual(
+            [(ll["equipo_local_nombre"], ll["equipo_visitante_nombre"]) for ll in primera],
+            [
+                ("Sembrado 1", "Sembrado 8"),
+                ("Sembrado 4", "Sembrado 5"),
+                ("Sembrado 2", "Sembrado 7"),
+                ("Sembrado 3", "Sembrado 6"),
+            ],
+        )
+        self.assertTrue(all(ll["idpartido"] for ll in primera))
+        self.assertEqual(Partido.objects.filter(idtorneo=self.torneo).count(), 4)
+
+    def test_pases_directos(self):
+        cuadro = self._generar(5)
+        primera, segunda = cuadro["rondas"][0]["llaves"], cuadro["rondas"][1]["llaves"]
+        # Solo 4 contra 5 juega la primera ronda; 1, 2 y 3 pasan directo.
+        jugadas = [ll["idpartido"] is not None for ll in primera]
+        self.assertEqual(jugadas, [False, True, False, False])
+        self.assertEqual(segunda[0]["equipo_local_nombre"], "Sembrado 1")
+        self.assertIsNone(segunda[0]["idequipovisitante"])
+        # 2 y 3 ya se conocen, así que su semifinal se crea de entrada.
+        self.assertEqual(
+            (segunda[1]["equipo_local_nombre"], segunda[1]["equipo_visitante_nombre"]),
+            ("Sembrado 2", "Sembrado 3"),
+        )
+        self.assertIsNotNone(segunda[1]["idpartido"])
+
+    def test_avanza_al_completar_ambos_marcadores(self):
+        self._generar(4)
+        semi1, semi2 = self._llave(1, 0), self._llave(1, 1)
+        self._marcar(semi1, 2, 1)
+        final = self._llave(2, 0)
+        self.assertEqual(final.idequipolocal_id, semi1.idequipolocal_id)
+        self.assertIsNone(final.idpartido_id)
+
+        self._marcar(semi2, 0, 3)
+        final = self._llave(2, 0)
+        self.assertIsNotNone(final.idpartido_id)
+        self.assertEqual(
+            (final.idpartido.idequipolocal_id, final.idpartido.idequipovisitante_id),
+            (semi1.idequipolocal_id, semi2.idequipovisitante_id),
+        )
+        self.assertGreater(final.idpartido.fechapartido, semi2.idpartido.fechapartido)
+
+        # Corregir una semifinal antes de jugar la final cambia el finalista.
+        self._marcar(semi1, 0, 1)
+        final = self._llave(2, 0)
+        self.assertEqual(final.idpartido.idequipolocal_id, semi1.idequipovisitante_id)
+
+    def test_sin_fecha_para_el_partido_siguiente(self):
+        self._generar(4)
+        semi1, semi2 = self._llave(1, 0), self._llave(1, 1)
+        # El torneo termina con las semifinales: la final no cabe.
+        Torneo.objects.filter(pk=self.torneo.pk).update(
+            fechafintorneo=semi2.idpartido.fechapartido
+        )
+        self._marcar(semi1, 2, 1)
+
+        url = reverse("partido-update", args=[semi2.idpartido_id])
+        response = self.client.patch(
+            url,
+            {"marcadorequipolocal": 0, "marcadorequipovisitante": 3},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn("ronda 2", parse_response(response)["error"])
+        # No queda nada a medias: ni el marcador ni el equipo en la final.
+        semi2.idpartido.refresh_from_db()
+        self.assertIsNone(semi2.idpartido.marcadorequipolocal)
+        final = self._llave(2, 0)
+        self.assertIsNone(final.idequipovisitante_id)
+        self.assertIsNone(final.idpartido_id)
+
+    def test_no_cambia_el_ganador_si_el_siguiente_ya_se_jugo(self):
+        self._generar(4)
+        semi1, semi2 = self._llave(1, 0), self._llave(1, 1)
+        self._marcar(semi1, 2, 1)
+        self._marcar(semi2, 0, 1)
+        self._marcar(self._llave(2, 0), 1, 0)
+
+        # Corregir el marcador sin cambiar el ganador se permite.
+        self._marcar(semi1, 3, 1)
+        url = reverse("partido-update", args=[semi1.idpartido_id])
+        response = self.client.patch(
+            url,
+            {"marcadorequipolocal": 0, "marcadorequipovisitante": 1},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn("ronda 2", parse_response(response)["error"])
+        # La casilla y el partido de la final siguen nombrando al mismo equipo.
+        semi1.idpartido.refresh_from_db()
+        self.assertEqual(semi1.idpartido.marcadorequipolocal, 3)
+        final = self._llave(2, 0)
+        self.assertEqual(final.idequipolocal_id, semi1.idequipolocal_id)
+        self.assertEqual(final.idpartido.idequipolocal_id, semi1.idequipolocal_id)
+
+    def test_empate_no_avanza(self):
+        self._generar(4)
+        self._marcar(self._llave(1, 0), 1, 1)
+        self.assertIsNone(self._llave(2, 0).idequipolocal_id)
+
+    def test_ver_cuadro_consultas_constantes(self):
+        self._generar(8)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(parse_response(response)["data"]["rondas"]), 3)
+
+    def test_no_se_genera_dos_veces(self):
+        self._generar(4)
+        ids = [equipo.idequipo for equipo in self.equipos[:4]]
+        response = self.client.post(self.url, {"equipos": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_torneo_inexistente(self):
+        response = self.client.get(reverse("torneo-llaves", args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
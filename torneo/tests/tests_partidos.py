@@ -1,8 +1,23 @@
+from django.db import connection, transaction
 from django.urls import reverse
 from django.test import TestCase
-from rest_framework.test import APIClient
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
-from torneo.models import Partido, Equipo, Institucion, Temporada, Torneo
+from torneo.models import (
+    Cambio,
+    Equipo,
+    Institucion,
+    Partido,
+    Posicion,
+    Rating,
+    Temporada,
+    Torneo,
+)
+from torneo.serializers import PartidoSerializer
+from torneo.utils.carga_masiva import crear_lote
+from torneo.views import paginate_queryset
 from datetime import datetime, timedelta
 
 from torneo.tests.helpers import parse_response
@@ -107,6 +122,7 @@ class PartidoTests(TestCase):
         url = reverse("partido-delete", args=[partido.idpartido])
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Partido.objects.filter(pk=partido.pk).exists())
 
     def test_eliminar_partido_analizado(self):
         partido = self.partidos[3]
@@ -149,3 +165,362 @@ class PartidoTests(TestCase):
         self.assertIn(
             response.status_code, (status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST)
         )
+
+    # ---------- Paginación por cursor ----------
+    def test_paginacion_cursor_recorre_todo(self):
+        url = reverse("partido-all")
+        response = self.client.get(url + "?cursor=&offset=2")
+        data = parse_response(response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(data["count"])
+        self.assertIsNone(data["previous"])
+
+        vistos = [p["idpartido"] for p in data["results"]]
+        while data["next"]:
+            data = parse_response(self.client.get(f"{url}?cursor={data['next']}&offset=2"))
+            vistos.extend(p["idpartido"] for p in data["results"])
+
+        self.assertEqual(vistos, [p.idpartido for p in self.partidos])
+
+    def test_paginacion_cursor_anterior(self):
+        url = reverse("partido-all")
+        primera = parse_response(self.client.get(url + "?cursor=&offset=2"))
+        segunda = parse_response(
+            self.client.get(f"{url}?cursor={primera['next']}&offset=2")
+        )
+        anterior = parse_response(
+            self.client.get(f"{url}?cursor={segunda['previous']}&offset=2")
+        )
+        self.assertEqual(anterior["results"], primera["results"])
+        self.assertIsNone(anterior["previous"])
+
+    def test_paginacion_cursor_con_conteo(self):
+        url = reverse("partido-all") + "?cursor=&offset=2&count=true"
+        data = parse_response(self.client.get(url))
+        self.assertEqual(data["count"], len(self.partidos))
+
+    def test_paginacion_cursor_invalido(self):
+        url = reverse("partido-all") + "?cursor=no-es-un-cursor"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_paginacion_cursor_rechaza_otro_orden(self):
+        request = Request(APIRequestFactory().get("/", {"cursor": ""}))
+        response = paginate_queryset(
+            Partido.objects.order_by("-fechapartido", "idpartido"),
+            PartidoSerializer,
+            request,
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_paginacion_sin_conteo(self):
+        url = reverse("partido-all") + "?page=1&offset=2&count=false"
+        data = parse_response(self.client.get(url))
+        self.assertIsNone(data["count"])
+        self.assertEqual(len(data["results"]), 2)
+
+    # ---------- Consultas (regresión N+1) ----------
+    def _crear_partidos_extra(self, cantidad):
+        for i in range(cantidad):
+            local = Equipo.objects.create(
+                idinstitucion=self.institucion, nombreequipo=f"Local {i}"
+            )
+            visitante = Equipo.objects.create(
+                idinstitucion=self.institucion, nombreequipo=f"Visitante {i}"
+            )
+            Partido.objects.create(
+                fechapartido=datetime.now(),
+                idequipolocal=local,
+                idequipovisitante=visitante,
+                idtorneo=self.torneo,
+                idtemporada=self.temp,
+            )
+
+    def test_listado_consultas_constantes(self):
+        self._crear_partidos_extra(20)
+        url = reverse("partido-all") + "?page=1&offset=100"
+        # conteo + página con los objetos relacionados en un solo JOIN
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(parse_response(response)["results"]), 25)
+
+    def test_busqueda_consultas_constantes(self):
+        self._crear_partidos_extra(10)
+        url = reverse("partido-search") + "?search=Local&offset=100"
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(parse_response(response)["results"]), 10)
+
+    def test_detalle_una_consulta(self):
+        url = reverse("partido-detail", args=[self.partidos[0].idpartido])
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        data = parse_response(response)["data"]
+        self.assertEqual(data["equipo_local_nombre"], "Equipo A")
+        self.assertEqual(data["torneo_nombre"], "Torneo P")
+
+    # ---------- Búsqueda (documento normalizado) ----------
+    def _buscar(self, termino):
+        url = reverse("partido-search") + f"?search={termino}&offset=100"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return parse_response(response)["results"]
+
+    def test_buscar_sin_tildes_ni_mayusculas(self):
+        self.equipo1.nombreequipo = "Águilas Doradas"
+        self.equipo1.save()
+        self.assertEqual(len(self._buscar("AGUILAS")), len(self.partidos))
+        self.assertEqual(len(self._buscar("águilas dor")), len(self.partidos))
+        self.assertEqual(self._buscar("aguilas plateadas"), [])
+
+    def test_buscar_por_torneo_y_temporada(self):
+        self.assertEqual(len(self._buscar("torneo p")), len(self.partidos))
+        self.assertEqual(len(self._buscar("Temp P")), len(self.partidos))
+        self.assertEqual(self._buscar("inexistente"), [])
+
+    def test_buscar_refleja_renombre(self):
+        self.torneo.nombretorneo = "Copa Andina"
+        self.torneo.save()
+        self.assertEqual(self._buscar("Torneo P"), [])
+        self.assertEqual(len(self._buscar("andina")), len(self.partidos))
+
+    # ---------- Carga masiva ----------
+    def _lote(self, cantidad, equipos):
+        inicio = datetime.now() + timedelta(hours=1)
+        return [
+            {
+                **self.data,
+                "fechapartido": (inicio + timedelta(hours=i)).isoformat(),
+                "idequipolocal": equipos[0].idequipo,
+                "idequipovisitante": equipos[1].idequipo,
+            }
+            for i in range(cantidad)
+        ]
+
+    def _equipos_nuevos(self):
+        return [
+            Equipo.objects.create(idinstitucion=self.institucion, nombreequipo=nombre)
+            for nombre in ("Equipo C", "Equipo D")
+        ]
+
+    def test_carga_masiva_valida(self):
+        url = reverse("partido-bulk-create")
+        response = self.client.post(url, self._lote(3, self._equipos_nuevos()), format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = parse_response(response)["data"]
+        self.assertEqual(len(data), 3)
+        self.assertTrue(all(p["idpartido"] for p in data))
+        self.assertEqual(data[0]["equipo_local_nombre"], "Equipo C")
+        self.assertEqual(len(self._buscar("equipo c")), 3)
+
+    def test_carga_masiva_consultas_constantes(self):
+        url = reverse("partido-bulk-create")
+        equipos = self._equipos_nuevos()
+        # En PostgreSQL se suma el lock del registro de sincronización.
+        consultas = 9 if connection.vendor == "postgresql" else 8
+        with self.assertNumQueries(consultas):
+            self.client.post(url, self._lote(2, equipos), format="json")
+        Partido.objects.filter(idequipolocal=equipos[0]).delete()
+        with self.assertNumQueries(consultas):
+            self.client.post(url, self._lote(40, equipos), format="json")
+
+    def _partidos_jugados(self, equipos, inicio):
+        marcadores = [(2, 1), (0, 0), (1, 3), (4, 2), (1, 1), (0, 2)]
+        return [
+            Partido(
+                fechapartido=inicio + timedelta(hours=i),
+                idequipolocal=equipos[i % 4],
+                idequipovisitante=equipos[(i + 1) % 4],
+                idtorneo=self.torneo,
+                idtemporada=self.temp,
+                marcadorequipolocal=local,
+                marcadorequipovisitante=visitante,
+            )
+            for i, (local, visitante) in enumerate(marcadores)
+        ]
+
+    def _estado_derivado(self, partidos):
+        """Posiciones, ratings y cambios, con los partidos nuevos por su orden."""
+        orden = {partido.pk: f"nuevo {i}" for i, partido in enumerate(partidos)}
+        posiciones = list(
+            Posicion.objects.order_by("idtorneo", "idequipo").values_list(
+                "idtorneo", "idequipo", "puntos", "partidosjugados", "partidosganados",
+                "partidosempatados", "partidosperdidos", "golesfavor", "golescontra",
+                "diferenciagoles", "forma",
+            )
+        )
+        ratings = sorted(
+            (equipo, orden.get(partido, str(partido)), fecha, rating, variacion)
+            for equipo, partido, fecha, rating, variacion in Rating.objects.values_list(
+                "idequipo", "idpartido", "fechapartido", "rating", "variacion"
+            )
+        )
+        cambios = sorted(
+            (entidad, orden.get(idobjeto, str(idobjeto)) if entidad == "partido"
+             else str(idobjeto), eliminado)
+            for entidad, idobjeto, eliminado in Cambio.objects.values_list(
+                "entidad", "idobjeto", "eliminado"
+            )
+        )
+        return posiciones, ratings, cambios
+
+    def test_carga_masiva_igual_que_creaciones_sueltas(self):
+        equipos = [self.equipo1, self.equipo2, *self._equipos_nuevos()]
+        inicio = datetime.now() + timedelta(minutes=30)
+        with transaction.atomic():
+            partidos = crear_lote(self._partidos_jugados(equipos, inicio))
+            en_lote = self._estado_derivado(partidos)
+            transaction.set_rollback(True)
+
+        partidos = []
+        for partido in self._partidos_jugados(equipos, inicio):
+            partido.save()
+            partidos.append(partido)
+        sueltos = self._estado_derivado(partidos)
+
+        self.assertTrue(en_lote[0] and en_lote[1])
+        self.assertEqual(en_lote, sueltos)
+
+    def test_carga_masiva_errores_por_elemento(self):
+        url = reverse("partido-bulk-create")
+        equipos = self._equipos_nuevos()
+        valido, mismo_equipo, inexistente, choque_lote, choque_guardado, negativo = (
+            self._lote(6, equipos)
+        )
+        mismo_equipo["idequipovisitante"] = mismo_equipo["idequipolocal"]
+        inexistente["idtorneo"] = 9999
+        choque_lote["fechapartido"] = valido["fechapartido"]
+        choque_guardado["idequipolocal"] = self.equipo1.idequipo
+        choque_guardado["fechapartido"] = self.partidos[0].fechapartido.isoformat()
+        negativo["marcadorequipolocal"] = -1
+        lote = [valido, mismo_equipo, inexistente, choque_lote, choque_guardado, negativo]
+
+        total = Partido.objects.count()
+        response = self.client.post(url, lote, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errores = parse_response(response)["data"]
+        self.assertEqual([e["indice"] for e in errores], [1, 2, 3, 4, 5])
+        self.assertIn("9999", errores[1]["error"])
+        self.assertIn("elemento 0", errores[2]["error"])
+        self.assertEqual(Partido.objects.count(), total)
+
+    def test_carga_masiva_requiere_lista(self):
+        url = reverse("partido-bulk-create")
+        response = self.client.post(url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    # ---------- Marcador en vivo ----------
+    def _marcador(self, partido, datos):
+        url = reverse("partido-marcador", args=[partido.idpartido])
+        return self.client.patch(url, datos, format="json")
+
+    def test_marcador_sumar_goles(self):
+        partido = self.partidos[0]
+        response = self._marcador(
+            partido, {"marcadorequipolocal": 0, "marcadorequipovisitante": 0}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self._marcador(partido, {"sumarlocal": 1})
+        response = self._marcador(partido, {"sumarlocal": 1, "sumarvisitante": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = parse_response(response)["data"]
+        self.assertEqual((data["marcadorequipolocal"], data["marcadorequipovisitante"]), (2, 1))
+        self.assertEqual(data["version"], 3)
+
+        posicion = Posicion.objects.get(idtorneo=self.torneo, idequipo=self.equipo1)
+        self.assertEqual((posicion.puntos, posicion.golesfavor, posicion.golescontra), (3, 2, 1))
+
+    def test_marcador_sumar_sin_marcador_previo(self):
+        partido = self.partidos[0]
+        response = self._marcador(partido, {"sumarvisitante": 1})
+        data = parse_response(response)["data"]
+        self.assertEqual((data["marcadorequipolocal"], data["marcadorequipovisitante"]), (None, 1))
+        partido.refresh_from_db()
+        self.assertEqual(partido.marcadorequipovisitante, 1)
+
+    def test_marcador_version_desactualizada(self):
+        partido = self.partidos[0]
+        response = self._marcador(partido, {"marcadorequipolocal": 1, "version": 0})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self._marcador(partido, {"marcadorequipolocal": 5, "version": 0})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        data = parse_response(response)["data"]
+        self.assertEqual((data["marcadorequipolocal"], data["version"]), (1, 1))
+        partido.refresh_from_db()
+        self.assertEqual(partido.marcadorequipolocal, 1)
+
+    def test_marcador_actualizacion_completa_cambia_version(self):
+        partido = self.partidos[0]
+        url = reverse("partido-update", args=[partido.idpartido])
+        self.client.patch(url, {"marcadorequipolocal": 2}, format="json")
+        response = self._marcador(partido, {"sumarlocal": 1, "version": 0})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_actualizacion_completa_con_version(self):
+        partido = self.partidos[0]
+        url = reverse("partido-update", args=[partido.idpartido])
+        response = self.client.patch(
+            url, {"marcadorequipolocal": 2, "version": 0}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(parse_response(response)["data"]["version"], 1)
+
+        response = self.client.patch(
+            url, {"marcadorequipolocal": 5, "version": 0}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        data = parse_response(response)["data"]
+        self.assertEqual((data["marcadorequipolocal"], data["version"]), (2, 1))
+        partido.refresh_from_db()
+        self.assertEqual(partido.marcadorequipolocal, 2)
+
+    def test_actualizacion_completa_version_invalida(self):
+        url = reverse("partido-update", args=[self.partidos[0].idpartido])
+        for version in (-1, "x"):
+            response = self.client.patch(
+                url, {"marcadorequipolocal": 1, "version": version}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, version)
+
+    def test_actualizacion_completa_cuerpo_no_objeto(self):
+        url = reverse("partido-update", args=[self.partidos[0].idpartido])
+        response = self.client.patch(url, [{"marcadorequipolocal": 1}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", parse_response(response))
+
+    def test_guardar_copia_desactualizada_cambia_version(self):
+        partido = self.partidos[0]
+        copia = Partido.objects.get(pk=partido.pk)
+        self._marcador(partido, {"marcadorequipolocal": 1})
+        copia.partidosubido = True
+        copia.save()
+        self.assertEqual(copia.version, 2)
+        partido.refresh_from_db()
+        self.assertEqual(partido.version, 2)
+
+    def test_marcador_invalido(self):
+        partido = self.partidos[0]
+        for datos in (
+            {},
+            {"version": 0},
+            {"marcadorequipolocal": -1},
+            {"sumarlocal": 0},
+            {"marcadorequipolocal": 1, "sumarlocal": 1},
+        ):
+            response = self._marcador(partido, datos)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, datos)
+
+    def test_marcador_partido_inexistente(self):
+        url = reverse("partido-marcador", args=[99999])
+        response = self.client.patch(url, {"sumarlocal": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_marcador_menos_consultas_que_actualizar(self):
+        partido, otro = self.partidos[:2]
+        datos = {"marcadorequipolocal": 1, "marcadorequipovisitante": 0}
+        with CaptureQueriesContext(connection) as completa:
+            url = reverse("partido-update", args=[partido.idpartido])
+            self.client.patch(url, datos, format="json")
+        with CaptureQueriesContext(connection) as rapida:
+            self._marcador(otro, datos)
+        self.assertLess(len(rapida), len(completa))
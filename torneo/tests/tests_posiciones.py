@@ -0,0 +1,261 @@
+import threading
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import pre_delete, pre_save
+from django.urls import reverse
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion, Partido, Posicion, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+
+CAMPOS = (
+    "puntos",
+    "partidosjugados",
+    "partidosganados",
+    "partidosempatados",
+    "partidosperdidos",
+    "golesfavor",
+    "golescontra",
+    "diferenciagoles",
+    "forma",
+)
+
+
+class PosicionesTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.ahora = timezone.now()
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst P")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp P",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga P",
+            descripciontorneo="Desc",
+            fechainiciotorneo=self.ahora - timedelta(days=20),
+            fechafintorneo=self.ahora + timedelta(days=20),
+        )
+        self.a, self.b, self.c = (
+            Equipo.objects.create(idinstitucion=self.institucion, nombreequipo=nombre)
+            for nombre in ("Alfa", "Beta", "Gamma")
+        )
+        self.url = reverse("torneo-posiciones", args=[self.torneo.idtorneo])
+
+    def _partido(self, local, visitante, dias, marcador=(None, None)):
+        return Partido.objects.create(
+            fechapartido=self.ahora + timedelta(days=dias),
+            idequipolocal=local,
+            idequipovisitante=visitante,
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+            marcadorequipolocal=marcador[0],
+            marcadorequipovisitante=marcador[1],
+        )
+
+    def _marcar(self, partido, local, visitante):
+        url = reverse("partido-update", args=[partido.idpartido])
+        response = self.client.patch(
+            url,
+            {"marcadorequipolocal": local, "marcadorequipovisitante": visitante},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _tabla(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {fila["equipo_nombre"]: fila for fila in parse_response(response)["data"]}
+
+    def _filas(self):
+        return {
+            fila.idequipo_id: tuple(getattr(fila, campo) for campo in CAMPOS)
+            for fila in Posicion.objects.filter(idtorneo=self.torneo)
+        }
+
+    def test_marcador_actualiza_tabla(self):
+        partido = self._partido(self.a, self.b, 1)
+        self.assertEqual(self._tabla(), {})
+        self._marcar(partido, 2, 1)
+        tabla = self._tabla()
+        self.assertEqual(tabla["Alfa"]["puntos"], 3)
+        self.assertEqual(tabla["Alfa"]["posicion"], 1)
+        self.assertEqual(tabla["Alfa"]["diferenciagoles"], 1)
+        self.assertEqual(tabla["Beta"]["partidosperdidos"], 1)
+        self.assertEqual(tabla["Beta"]["forma"], "P")
+
+    def test_correccion_aplica_solo_la_diferencia(self):
+        partido = self._partido(self.a, self.b, 1)
+        self._marcar(partido, 2, 1)
+        self._marcar(partido, 1, 1)
+        tabla = self._tabla()
+        for nombre in ("Alfa", "Beta"):
+            self.assertEqual(tabla[nombre]["puntos"], 1)
+            self.assertEqual(tabla[nombre]["partidosjugados"], 1)
+            self.assertEqual(tabla[nombre]["partidosganados"], 0)
+            self.assertEqual(tabla[nombre]["forma"], "E")
+        self.assertEqual(tabla["Alfa"]["golesfavor"], 1)
+
+    def test_forma_en_orden_de_fecha(self):
+        segundo = self._partido(self.a, self.c, 2)
+        primero = self._partido(self.b, self.a, 1)
+        self._marcar(segundo, 0, 3)
+        self._marcar(primero, 1, 1)
+        self.assertEqual(self._tabla()["Alfa"]["forma"], "EP")
+
+    def test_cambio_de_equipo_y_borrado(self):
+        partido = self._partido(self.a, self.b, 1, (3, 0))
+        partido.idequipovisitante = self.c
+        partido.save()
+        tabla = self._tabla()
+        self.assertEqual(tabla["Beta"]["partidosjugados"], 0)
+        self.assertEqual(tabla["Gamma"]["golescontra"], 3)
+
+        partido.delete()
+        tabla = self._tabla()
+        self.assertEqual(tabla["Alfa"]["puntos"], 0)
+        self.assertEqual(tabla["Gamma"]["partidosjugados"], 0)
+
+    def test_incremental_coincide_con_recalculo(self):
+        self._partido(self.a, self.b, 1, (2, 2))
+        self._partido(self.b, self.c, 2, (0, 1))
+        partido = self._partido(self.c, self.a, 3, (1, 4))
+        self._marcar(partido, 2, 0)
+        incremental = self._filas()
+        call_command("recalcular_posiciones", stdout=StringIO())
+        self.assertEqual(self._filas(), incremental)
+
+    def test_lectura_una_consulta(self):
+        self._partido(self.a, self.b, 1, (1, 0))
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(len(parse_response(response)["data"]), 2)
+
+    def test_torneo_inexistente(self):
+        response = self.client.get(reverse("torneo-posiciones", args=[9999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # ---------- Desempate ----------
+    def _empate_triple(self):
+        # Alfa, Beta y Delta terminan con 3 puntos. Entre ellos: Alfa le ganó a
+        # Beta y Delta a Alfa. En el total, Beta tiene la mejor diferencia.
+        delta = Equipo.objects.create(idinstitucion=self.institucion, nombreequipo="Delta")
+        self._partido(self.a, self.b, 1, (1, 0))
+        self._partido(self.b, self.c, 2, (5, 0))
+        self._partido(delta, self.a, 3, (1, 0))
+
+    def _orden(self):
+        response = self.client.get(self.url)
+        return [fila["equipo_nombre"] for fila in parse_response(response)["data"]]
+
+    def test_desempate_por_defecto_diferencia_de_goles(self):
+        self._empate_triple()
+        self.assertEqual(self._orden(), ["Beta", "Delta", "Alfa", "Gamma"])
+
+    def test_desempate_configurable_por_torneo(self):
+        self._empate_triple()
+        url = reverse("torneo-update", args=[self.torneo.idtorneo])
+        response = self.client.patch(
+            url, {"criteriosdesempate": "puntosdirectos, diferenciagoles"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Directos: Alfa 3, Delta 3, Beta 0; Delta supera a Alfa por diferencia.
+        with self.assertNumQueries(2):
+            self.assertEqual(self._orden(), ["Delta", "Alfa", "Beta", "Gamma"])
+
+    def test_criterio_desempate_invalido(self):
+        url = reverse("torneo-update", args=[self.torneo.idtorneo])
+        for criterios in ("fairplay", "golesfavor,golesfavor"):
+            response = self.client.patch(
+                url, {"criteriosdesempate": criterios}, format="json"
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor == "postgresql", "SQLite no bloquea filas")
+class PosicionesConcurrenciaTests(TransactionTestCase):
+    """
+    Una escritura de /marcador/ llega mientras otra petición ya leyó el
+    partido: la tabla debe quedar igual que un recálculo completo.
+    """
+
+    setUp = PosicionesTests.setUp
+    _partido = PosicionesTests._partido
+    _filas = PosicionesTests._filas
+
+    def _intercalar(self, senal, metodo, url, datos=None):
+        # La petición A se detiene justo antes de guardar o borrar, con el
+        # partido ya leído; mientras tanto B intenta sumar un gol.
+        entro = threading.Event()
+        liberar = threading.Event()
+
+        def pausa(sender, **kwargs):
+            if not entro.is_set():
+                entro.set()
+                liberar.wait(5)
+
+        def pedir(funcion):
+            try:
+                funcion()
+            finally:
+                connection.close()
+
+        partido = self._partido(self.a, self.b, 1, (1, 0))
+        senal.connect(pausa, sender=Partido, weak=False)
+        self.addCleanup(senal.disconnect, pausa, sender=Partido)
+        a = threading.Thread(
+            target=pedir,
+            args=(lambda: getattr(APIClient(), metodo)(url(partido), datos, format="json"),),
+        )
+        marcador = reverse("partido-marcador", args=[partido.idpartido])
+        b = threading.Thread(
+            target=pedir,
+            args=(lambda: APIClient().patch(marcador, {"sumarvisitante": 2}, format="json"),),
+        )
+        a.start()
+        self.assertTrue(entro.wait(5))
+        b.start()
+        time.sleep(0.2)
+        # B espera el bloqueo de A en lugar de escribir sobre lo que A leyó.
+        self.assertTrue(b.is_alive())
+        liberar.set()
+        a.join(5)
+        b.join(5)
+
+        # El recálculo no deja filas en cero; la actualización incremental sí.
+        def jugadas():
+            return {k: v for k, v in self._filas().items() if v[CAMPOS.index("partidosjugados")]}
+
+        incremental = jugadas()
+        call_command("recalcular_posiciones", stdout=StringIO())
+        self.assertEqual(jugadas(), incremental)
+        return partido
+
+    def test_actualizacion_completa(self):
+        partido = self._intercalar(
+            pre_save,
+            "patch",
+            lambda p: reverse("partido-update", args=[p.idpartido]),
+            {"marcadorequipolocal": 3, "marcadorequipovisitante": 3},
+        )
+        partido.refresh_from_db()
+        self.assertEqual(
+            (partido.marcadorequipolocal, partido.marcadorequipovisitante), (3, 5)
+        )
+
+    def test_borrado(self):
+        partido = self._intercalar(
+            pre_delete, "delete", lambda p: reverse("partido-delete", args=[p.idpartido])
+        )
+        self.assertFalse(Partido.objects.filter(pk=partido.pk).exists())
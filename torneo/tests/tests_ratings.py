@@ -0,0 +1,175 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Equipo, Institucion, Partido, Rating, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+from torneo.utils.ratings import RATING_INICIAL, reconstruir_ratings
+
+
+class RatingsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.ahora = timezone.now()
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst R")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp R",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga R",
+            descripciontorneo="Desc",
+            fechainiciotorneo=self.ahora - timedelta(days=20),
+            fechafintorneo=self.ahora + timedelta(days=20),
+        )
+        self.a, self.b, self.c, self.d = (
+            Equipo.objects.create(idinstitucion=self.institucion, nombreequipo=nombre)
+            for nombre in ("Alfa", "Beta", "Gamma", "Delta")
+        )
+
+    def _partido(self, local, visitante, dias, marcador=(None, None)):
+        return Partido.objects.create(
+            fechapartido=self.ahora + timedelta(days=dias),
+            idequipolocal=local,
+            idequipovisitante=visitante,
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+            marcadorequipolocal=marcador[0],
+            marcadorequipovisitante=marcador[1],
+        )
+
+    def _marcar(self, partido, local, visitante):
+        response = self.client.patch(
+            reverse("partido-update", args=[partido.idpartido]),
+            {"marcadorequipolocal": local, "marcadorequipovisitante": visitante},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def _filas(self):
+        return sorted(
+            Rating.objects.values_list("idequipo", "idpartido", "rating", "variacion")
+        )
+
+    def _actual(self, equipo):
+        return (
+            Rating.objects.filter(idequipo=equipo)
+            .order_by("-fechapartido", "-idpartido")
+            .values_list("rating", flat=True)
+            .first()
+        )
+
+    def test_un_partido(self):
+        self._partido(self.a, self.b, 1, (2, 0))
+        ganador, perdedor = self._actual(self.a), self._actual(self.b)
+        self.assertGreater(ganador, RATING_INICIAL)
+        self.assertAlmostEqual(ganador + perdedor, 2 * RATING_INICIAL)
+        self.assertEqual(Rating.objects.count(), 2)
+
+    def test_partido_sin_marcador_no_cuenta(self):
+        self._partido(self.a, self.b, 1)
+        self.assertFalse(Rating.objects.exists())
+
+    def test_incremental_igual_a_reconstruir(self):
+        p1 = self._partido(self.a, self.b, 1, (1, 0))
+        self._partido(self.c, self.d, 2, (0, 0))
+        p3 = self._partido(self.b, self.c, 3, (2, 1))
+        self._partido(self.a, self.d, 5, (0, 3))
+        # Partido cargado fuera de orden, antes de otros ya jugados.
+        self._partido(self.d, self.b, 4, (1, 1))
+        p6 = self._partido(self.c, self.a, 6)
+
+        self._marcar(p1, 0, 2)
+        self._marcar(p6, 1, 0)
+        self._marcar(p3, None, None)
+        p6.fechapartido = self.ahora + timedelta(days=0.5)
+        p6.save(update_fields=["fechapartido"])
+        Partido.objects.get(pk=p1.pk).delete()
+
+        incremental = self._filas()
+        reconstruir_ratings()
+        self.assertEqual(incremental, self._filas())
+        self.assertEqual(len(incremental), 8)
+
+    def test_ultimo_partido_no_reescribe_historia(self):
+        self._partido(self.a, self.b, 1, (1, 0))
+        self._partido(self.c, self.d, 2, (2, 2))
+        anteriores = set(Rating.objects.values_list("idrating", flat=True))
+        partido = self._partido(self.a, self.c, 3)
+
+        self._marcar(partido, 3, 1)
+        nuevas = set(Rating.objects.values_list("idrating", flat=True))
+        self.assertEqual(anteriores, nuevas & anteriores)
+        self.assertEqual(len(nuevas - anteriores), 2)
+
+    def test_carga_masiva(self):
+        fecha = self.ahora + timedelta(days=1)
+        response = self.client.post(
+            reverse("partido-bulk-create"),
+            [
+                {
+                    "fechapartido": (fecha + timedelta(days=n)).isoformat(),
+                    "idequipolocal": local.idequipo,
+                    "idequipovisitante": visitante.idequipo,
+                    "idtorneo": self.torneo.idtorneo,
+                    "idtemporada": self.temporada.idtemporada,
+                    "marcadorequipolocal": 1,
+                    "marcadorequipovisitante": 0,
+                }
+                for n, (local, visitante) in enumerate(((self.a, self.b), (self.b, self.c)))
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        incremental = self._filas()
+        reconstruir_ratings()
+        self.assertEqual(incremental, self._filas())
+        self.assertEqual(len(incremental), 4)
+
+    def test_ranking(self):
+        self._partido(self.a, self.b, 1, (3, 0))
+        self._partido(self.c, self.a, 2, (2, 0))
+        response = self.client.get(reverse("rating-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = parse_response(response)["data"]
+        self.assertEqual([fila["posicion"] for fila in data], [1, 2, 3])
+        self.assertEqual(
+            [fila["rating"] for fila in data],
+            sorted((fila["rating"] for fila in data), reverse=True),
+        )
+        self.assertEqual(data[0]["equipo_nombre"], "Gamma")
+        self.assertEqual(
+            {fila["idequipo"]: fila["rating"] for fila in data}[self.a.idequipo],
+            self._actual(self.a),
+        )
+
+    def test_historial_del_equipo(self):
+        self._partido(self.a, self.b, 1, (3, 0))
+        self._partido(self.c, self.a, 2, (2, 0))
+        response = self.client.get(reverse("equipo-ratings", args=[self.a.idequipo]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = parse_response(response)["data"]
+        self.assertEqual(len(data), 2)
+        self.assertGreater(data[0]["variacion"], 0)
+        self.assertLess(data[1]["variacion"], 0)
+
+        response = self.client.get(reverse("equipo-ratings", args=[99999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_comando_reconstruir(self):
+        self._partido(self.a, self.b, 1, (3, 0))
+        antes = self._filas()
+        Rating.objects.all().delete()
+        salida = StringIO()
+        call_command("recalcular_ratings", stdout=salida)
+        self.assertIn("1 partidos", salida.getvalue())
+        self.assertEqual(antes, self._filas())
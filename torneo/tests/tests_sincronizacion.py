@@ -0,0 +1,195 @@
+import threading
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection, transaction
+from django.urls import reverse
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from torneo.models import Cambio, Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.tests.helpers import parse_response
+from torneo.utils.sincronizacion import cambios_desde, registrar_cambios
+
+
+class SincronizacionTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.ahora = timezone.now()
+        self.institucion = Institucion.objects.create(nombreinstitucion="Inst S")
+        self.temporada = Temporada.objects.create(
+            nombretemporada="Temp S",
+            descripciontemporada="Desc",
+            tipotemporada="Oficial",
+            fechainiciotemporada=self.ahora - timedelta(days=30),
+            fechafintemporada=self.ahora + timedelta(days=30),
+        )
+        self.torneo = Torneo.objects.create(
+            idtemporada=self.temporada,
+            nombretorneo="Liga S",
+            descripciontorneo="Desc",
+            fechainiciotorneo=self.ahora - timedelta(days=20),
+            fechafintorneo=self.ahora + timedelta(days=20),
+        )
+        self.local = Equipo.objects.create(
+            idinstitucion=self.institucion, nombreequipo="Local S"
+        )
+        self.visitante = Equipo.objects.create(
+            idinstitucion=self.institucion, nombreequipo="Visitante S"
+        )
+        self.partido = Partido.objects.create(
+            fechapartido=self.ahora,
+            idequipolocal=self.local,
+            idequipovisitante=self.visitante,
+            idtorneo=self.torneo,
+            idtemporada=self.temporada,
+        )
+
+    def _sync(self, **params):
+        response = self.client.get(reverse("sync"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return parse_response(response)["data"]
+
+    def _claves(self, data):
+        return [(c["entidad"], c["id"], c["eliminado"]) for c in data["cambios"]]
+
+    def test_primera_sincronizacion_trae_todo_en_orden(self):
+        data = self._sync()
+
+        self.assertEqual(
+            self._claves(data),
+            [
+                ("institucion", self.institucion.pk, False),
+                ("temporada", self.temporada.pk, False),
+                ("torneo", self.torneo.pk, False),
+                ("equipo", self.local.pk, False),
+                ("equipo", self.visitante.pk, False),
+                ("partido", self.partido.pk, False),
+            ],
+        )
+        self.assertFalse(data["mas"])
+        self.assertEqual(data["version"], data["cambios"][-1]["version"])
+        datos = data["cambios"][-1]["datos"]
+        self.assertEqual(datos["idequipolocal"], self.local.pk)
+        self.assertEqual(datos["idtorneo"], self.torneo.pk)
+        self.assertIn("version", datos)
+        self.assertNotIn("documentobusqueda", datos)
+
+    def test_solo_trae_lo_modificado_despues_de_la_version(self):
+        version = self._sync()["version"]
+        self.assertEqual(self._sync(since=version)["cambios"], [])
+
+        for goles in (1, 2, 3):
+            response = self.client.patch(
+                reverse("partido-marcador", args=[self.partido.pk]),
+                {"marcadorequipolocal": goles, "marcadorequipovisitante": 0},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = self._sync(since=version)
+        self.assertEqual(self._claves(data), [("partido", self.partido.pk, False)])
+        self.assertEqual(data["cambios"][0]["datos"]["marcadorequipolocal"], 3)
+        self.assertGreater(data["version"], version)
+        self.assertEqual(Cambio.objects.filter(entidad="partido").count(), 1)
+
+    def test_borrados_en_cascada_quedan_como_bajas(self):
+        version = self._sync()["version"]
+
+        # El endpoint solo desactiva el equipo; el borrado real arrastra sus partidos.
+        equipo, partido = self.local.pk, self.partido.pk
+        self.local.delete()
+
+        data = self._sync(since=version)
+        self.assertCountEqual(
+            self._claves(data),
+            [("equipo", equipo, True), ("partido", partido, True)],
+        )
+        self.assertTrue(all(c["datos"] is None for c in data["cambios"]))
+
+    def test_carga_masiva_se_registra(self):
+        version = self._sync()["version"]
+        response = self.client.post(
+            reverse("partido-bulk-create"),
+            [
+                {
+                    "fechapartido": (self.ahora + timedelta(days=dias)).isoformat(),
+                    "idequipolocal": self.local.pk,
+                    "idequipovisitante": self.visitante.pk,
+                    "idtorneo": self.torneo.pk,
+                    "idtemporada": self.temporada.pk,
+                }
+                for dias in (1, 2)
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        data = self._sync(since=version)
+        self.assertEqual([c["entidad"] for c in data["cambios"]], ["partido", "partido"])
+
+    def test_limite_reparte_en_varias_respuestas(self):
+        primera = self._sync(limit=4)
+        self.assertEqual(len(primera["cambios"]), 4)
+        self.assertTrue(primera["mas"])
+
+        segunda = self._sync(since=primera["version"], limit=4)
+        self.assertEqual(len(segunda["cambios"]), 2)
+        self.assertFalse(segunda["mas"])
+        self.assertEqual(
+            self._claves(primera) + self._claves(segunda), self._claves(self._sync())
+        )
+
+    def test_parametros_invalidos(self):
+        for params in ({"since": "x"}, {"since": -1}, {"limit": 0}, {"limit": 5001}):
+            response = self.client.get(reverse("sync"), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@skipUnless(connection.vendor == "postgresql", "SQLite serializa las escrituras")
+class SincronizacionConcurrenciaTests(TransactionTestCase):
+    setUp = SincronizacionTests.setUp
+
+    def _en_hilo(self, funcion):
+        def correr():
+            try:
+                funcion()
+            finally:
+                connection.close()
+
+        hilo = threading.Thread(target=correr)
+        hilo.start()
+        return hilo
+
+    def test_escrituras_no_se_esperan_y_la_lectura_si(self):
+        version = cambios_desde(0, 100)[1]
+        registrado = threading.Event()
+        confirmar = threading.Event()
+
+        def abierta():
+            with transaction.atomic():
+                registrar_cambios("equipo", [self.local.pk])
+                registrado.set()
+                confirmar.wait(5)
+
+        primera = self._en_hilo(abierta)
+        self.assertTrue(registrado.wait(5))
+        # Otra escritura confirma mientras la primera sigue abierta.
+        segunda = self._en_hilo(lambda: registrar_cambios("equipo", [self.visitante.pk]))
+        segunda.join(5)
+        self.assertFalse(segunda.is_alive())
+
+        resultado = []
+        lectura = self._en_hilo(lambda: resultado.append(cambios_desde(version, 100)))
+        lectura.join(0.2)
+        # La lectura no avanza la versión por encima de la escritura sin confirmar.
+        self.assertTrue(lectura.is_alive())
+        confirmar.set()
+        primera.join(5)
+        lectura.join(5)
+
+        cambios, _, _ = resultado[0]
+        self.assertEqual(
+            sorted(c["id"] for c in cambios), sorted([self.local.pk, self.visitante.pk])
+        )
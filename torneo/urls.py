@@ -8,6 +8,22 @@ urlpatterns = [
     path("equipos/<int:pk>/", views.EquipoDetailView.as_view(), name="equipo-detail"),
     path("equipos/<int:pk>/update/", views.EquipoUpdateView.as_view(), name="equipo-update"),
     path("equipos/<int:pk>/delete/", views.EquipoDeleteView.as_view(), name="equipo-delete"),
+    path(
+        "equipos/<int:pk>/imagen/", views.EquipoImagenView.as_view(), name="equipo-imagen"
+    ),
+    path(
+        "equipos/<int:pk>/estadisticas/",
+        views.EquipoEstadisticasView.as_view(),
+        name="equipo-estadisticas",
+    ),
+    path(
+        "equipos/<int:pk>/vs/<int:rival>/",
+        views.EquipoEnfrentamientoView.as_view(),
+        name="equipo-enfrentamiento",
+    ),
+    path(
+        "equipos/<int:pk>/ratings/", views.EquipoRatingsView.as_view(), name="equipo-ratings"
+    ),
     path(
         "equipos/search/<str:name>/",
         views.EquipoSearchByNameView.as_view(),
@@ -16,10 +32,18 @@ urlpatterns = [
     # ================= PARTIDOS =================
     path("partidos/", views.PartidoListCreateView.as_view(), name="partido-list-create"),
     path("partidos/all/", views.PartidoAllView.as_view(), name="partido-all"),
+    path(
+        "partidos/bulk/", views.PartidoBulkCreateView.as_view(), name="partido-bulk-create"
+    ),
     path("partidos/<int:pk>/", views.PartidoDetailView.as_view(), name="partido-detail"),
     path(
         "partidos/<int:pk>/update/", views.PartidoUpdateView.as_view(), name="partido-update"
     ),
+    path(
+        "partidos/<int:pk>/marcador/",
+        views.PartidoMarcadorView.as_view(),
+        name="partido-marcador",
+    ),
     path(
         "partidos/<int:pk>/delete/", views.PartidoDeleteView.as_view(), name="partido-delete"
     ),
@@ -31,6 +55,17 @@ urlpatterns = [
     path("torneos/<int:pk>/", views.TorneoDetailView.as_view(), name="torneo-detail"),
     path("torneos/<int:pk>/update/", views.TorneoUpdateView.as_view(), name="torneo-update"),
     path("torneos/<int:pk>/delete/", views.TorneoDeleteView.as_view(), name="torneo-delete"),
+    path(
+        "torneos/<int:pk>/fixture/", views.TorneoFixtureView.as_view(), name="torneo-fixture"
+    ),
+    path(
+        "torneos/<int:pk>/llaves/", views.TorneoLlavesView.as_view(), name="torneo-llaves"
+    ),
+    path(
+        "torneos/<int:pk>/posiciones/",
+        views.TorneoPosicionesView.as_view(),
+        name="torneo-posiciones",
+    ),
     # ================= TEMPORADAS =================
     path(
         "temporadas/", views.TemporadaListCreateView.as_view(), name="temporada-list-create"
@@ -71,4 +106,28 @@ urlpatterns = [
         views.InstitucionDeleteView.as_view(),
         name="institucion-delete",
     ),
+    # ================= AUTOCOMPLETADO =================
+    path("autocompletar/", views.AutocompletarView.as_view(), name="autocompletar"),
+    # ================= EVENTOS EN VIVO =================
+    path(
+        "partidos/<int:pk>/eventos/",
+        views.EventosView.as_view(tipo="partido"),
+        name="partido-eventos",
+    ),
+    path(
+        "torneos/<int:pk>/eventos/",
+        views.EventosView.as_view(tipo="torneo"),
+        name="torneo-eventos",
+    ),
+    path(
+        "temporadas/<int:pk>/eventos/",
+        views.EventosView.as_view(tipo="temporada"),
+        name="temporada-eventos",
+    ),
+    # ================= RATINGS =================
+    path("ratings/", views.RatingListView.as_view(), name="rating-list"),
+    # ================= SINCRONIZACIÓN =================
+    path("sync/", views.SincronizacionView.as_view(), name="sync"),
+    # ================= CACHÉ =================
+    path("cache/", views.CacheRespuestasView.as_view(), name="cache-respuestas"),
 ]
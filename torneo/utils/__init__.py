@@ -1,4 +1,5 @@
 from .responses import (
     error_response as error_response,
     success_response as success_response,
-    pagination_response as pagination_response)
+    pagination_response as pagination_response,
+    cursor_pagination_response as cursor_pagination_response)
@@ -0,0 +1,148 @@
+import threading
+from bisect import bisect_left, insort
+
+from django.db import DatabaseError, connections
+
+from torneo.utils.search import normalizar
+
+# tipo -> (modelo, campo del nombre)
+ENTIDADES = {
+    "equipo": ("Equipo", "nombreequipo"),
+    "torneo": ("Torneo", "nombretorneo"),
+    "institucion": ("Institucion", "nombreinstitucion"),
+}
+
+
+def claves_nombre(nombre):
+    """
+    Claves por las que se encuentra un nombre: el nombre normalizado completo y
+    cada sufijo que empieza en una palabra ("tigres fc" -> "tigres fc", "fc").
+    """
+    palabras = normalizar(nombre).split()
+    return [" ".join(palabras[i:]) for i in range(len(palabras))]
+
+
+class IndiceAutocompletado:
+    """
+    Índice en memoria para autocompletar nombres por prefijo.
+
+    Es un arreglo ordenado de (clave, tipo, id) sobre el que se busca con
+    bisect, así que una consulta no toca la base de datos. Se construye al
+    arrancar cada proceso del servidor (ver cargar_al_iniciar) y las señales de
+    los modelos lo mantienen al día (ver torneo/signals.py). Si se invalida, o
+    no se pudo construir al arrancar, se reconstruye en la siguiente consulta.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._claves = []
+        self._entidades = {}
+        self._cargado = False
+
+    def invalidar(self):
+        """Descarta el índice; se reconstruye en la siguiente consulta."""
+        with self._lock:
+            self._claves = []
+            self._entidades = {}
+            self._cargado = False
+
+    def cargar(self):
+        from torneo import models
+
+        claves = []
+        entidades = {}
+        for tipo, (modelo, campo) in ENTIDADES.items():
+            filas = getattr(models, modelo).objects.values_list("pk", campo)
+            for pk, nombre in filas.iterator():
+                entidades[(tipo, pk)] = nombre
+                claves.extend((clave, tipo, pk) for clave in claves_nombre(nombre))
+        claves.sort()
+        with self._lock:
+            self._claves = claves
+            self._entidades = entidades
+            self._cargado = True
+
+    def _asegurar_cargado(self):
+        if not self._cargado:
+            with self._lock:
+                if not self._cargado:
+                    self.cargar()
+
+    def agregar(self, tipo, pk, nombre):
+        with self._lock:
+            if not self._cargado:
+                return
+            self._quitar(tipo, pk)
+            self._entidades[(tipo, pk)] = nombre
+            for clave in claves_nombre(nombre):
+                insort(self._claves, (clave, tipo, pk))
+
+    def eliminar(self, tipo, pk):
+        with self._lock:
+            if self._cargado:
+                self._quitar(tipo, pk)
+
+    def _quitar(self, tipo, pk):
+        nombre = self._entidades.pop((tipo, pk), None)
+        if nombre is None:
+            return
+        for clave in claves_nombre(nombre):
+            i = bisect_left(self._claves, (clave, tipo, pk))
+            if i < len(self._claves) and self._claves[i] == (clave, tipo, pk):
+                del self._claves[i]
+
+    def buscar(self, prefijo, tipos=None, limite=10):
+        """
+        Devuelve hasta `limite` coincidencias {tipo, id, nombre} cuyo nombre (o
+        alguna de sus palabras) empieza por el prefijo. Primero las que coinciden
+        desde el inicio del nombre y, entre ellas, los nombres más cortos.
+        """
+        prefijo = normalizar(prefijo)
+        if not prefijo:
+            return []
+        self._asegurar_cargado()
+
+        with self._lock:
+            claves, entidades = self._claves, self._entidades
+            candidatos = {}
+            i = bisect_left(claves, (prefijo,))
+            while i < len(claves) and len(candidatos) < limite * 4:
+                clave, tipo, pk = claves[i]
+                if not clave.startswith(prefijo):
+                    break
+                i += 1
+                if tipos and tipo not in tipos:
+                    continue
+                nombre = entidades[(tipo, pk)]
+                inicio = normalizar(nombre).startswith(prefijo)
+                anterior = candidatos.get((tipo, pk))
+                candidatos[(tipo, pk)] = (anterior or inicio, nombre)
+
+        ordenados = sorted(
+            candidatos.items(),
+            key=lambda item: (not item[1][0], len(item[1][1]), item[1][1]),
+        )
+        return [
+            {"tipo": tipo, "id": pk, "nombre": nombre}
+            for (tipo, pk), (_, nombre) in ordenados[:limite]
+        ]
+
+
+indice_autocompletado = IndiceAutocompletado()
+
+
+def cargar_al_iniciar():
+    """
+    Construye el índice al arrancar el servidor, para que la primera consulta
+    de cada proceso no recorra las tablas. Se llama desde teamservice/asgi.py
+    y wsgi.py, que manage.py no importa: ni las migraciones ni los comandos
+    cargan el índice. Si la base aún no está migrada, queda para la primera
+    consulta.
+    """
+    try:
+        indice_autocompletado.cargar()
+    except DatabaseError:
+        pass
+    finally:
+        # La conexión se abrió fuera de una petición: nadie más la cierra.
+        connections.close_all()
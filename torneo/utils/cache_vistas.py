@@ -0,0 +1,312 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def clave_generacion(modelo, pk=None):
+    clave = f"respuestas:generacion:{modelo._meta.label_lower}"
+    return clave if pk is None else f"{clave}:{pk}"
+
+
+def _nueva_generacion():
+    # Nunca repite un valor anterior aunque la caché haya perdido la clave.
+    return time.time_ns()
+
+
+def generaciones(claves):
+    """Generación actual de cada clave, en el mismo orden."""
+    actuales = cache.get_many(claves)
+    for clave in claves:
+        if clave not in actuales:
+            cache.add(clave, _nueva_generacion(), timeout=None)
+            actuales[clave] = cache.get(clave)
+    return [actuales[clave] for clave in claves]
+
+
+def version_datos(modelos, fila=None, pk=None):
+    """
+    Versión de los datos de una respuesta: la generación de cada modelo de
+    ``modelos`` y, en los detalles, la de la fila ``pk`` de ``fila``. Cambia
+    cada vez que se modifica alguno de esos datos, sin consultar la base.
+    """
+    claves = [clave_generacion(modelo) for modelo in modelos]
+    if fila is not None:
+        claves.append(clave_generacion(fila, pk))
+    return "-".join(str(generacion) for generacion in generaciones(claves))
+
+
+def invalidar_respuestas(modelo, pk=None):
+    """
+    Pasa a una generación nueva ``modelo`` y, si se indica, su fila ``pk``:
+    las respuestas en caché y los ETag anteriores dejan de coincidir. Se hace
+    al confirmar la transacción, para que una lectura concurrente no guarde
+    los datos viejos con la generación nueva.
+    """
+    claves = [clave_generacion(modelo)]
+    if pk is not None:
+        claves.append(clave_generacion(modelo, pk))
+
+    def avanzar():
+        for clave in claves:
+            try:
+                cache.incr(clave)
+            except ValueError:
+                cache.set(clave, _nueva_generacion(), timeout=None)
+
+    transaction.on_commit(avanzar)
+
+
+# Formas de resolver una petición que se cuentan por vista.
+TIPOS = ("aciertos", "fallos", "obsoletos", "compartidos")
+
+
+class Contadores:
+    """
+    Cómo se resolvieron las peticiones de las vistas en caché en este proceso,
+    por vista: de la caché (aciertos), calculadas (fallos), con la respuesta
+    anterior mientras otra petición calculaba la nueva (obsoletos) o con el
+    resultado de otra petición idéntica simultánea (compartidos).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cuentas = Counter()
+
+    def contar(self, vista, tipo):
+        with self._lock:
+            self._cuentas[(vista, tipo)] += 1
+
+    def resumen(self):
+        with self._lock:
+            vistas = sorted({vista for vista, _ in self._cuentas})
+            totales = Counter()
+            for (_, tipo), n in self._cuentas.items():
+                totales[tipo] += n
+            return {
+                **{tipo: totales[tipo] for tipo in TIPOS},
+                "vistas": {
+                    vista: {tipo: self._cuentas[(vista, tipo)] for tipo in TIPOS}
+                    for vista in vistas
+                },
+            }
+
+    def reiniciar(self):
+        with self._lock:
+            self._cuentas.clear()
+
+
+contadores = Contadores()
+
+
+class Vuelos:
+    """
+    Une las peticiones idénticas simultáneas de este proceso: la primera
+    ejecuta la vista y las demás esperan su resultado en lugar de repetir la
+    misma consulta.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_curso = {}
+
+    def en_curso(self, clave):
+        with self._lock:
+            return clave in self._en_curso
+
+    def hacer(self, clave, funcion):
+        """
+        Ejecuta ``funcion`` si nadie la está ejecutando con ``clave`` y, si no,
+        espera al que la ejecuta. Devuelve (resultado, compartido).
+        """
+        with self._lock:
+            futuro = self._en_curso.get(clave)
+            lider = futuro is None
+            if lider:
+                futuro = self._en_curso[clave] = Future()
+        if not lider:
+            return futuro.result(), True
+        try:
+            futuro.set_result(funcion())
+        except BaseException as e:
+            futuro.set_exception(e)
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+        return futuro.result(), False
+
+
+vuelos = Vuelos()
+
+
+def clave_respuesta(vista, request):
+    """
+    Clave de la respuesta: URL absoluta (las imágenes de equipos se devuelven
+    con URL absoluta) con los parámetros ordenados.
+    """
+    parametros = urlencode(sorted(request.GET.lists()), doseq=True)
+    url = f"{request.build_absolute_uri(request.path)}?{parametros}"
+    resumen = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return f"respuestas:{vista}:{resumen}"
+
+
+def etag_vista(vista, version):
+    # Débil: el mismo dato puede enviarse como JSON o en la API navegable.
+    return f"W/{quote_etag(f'{vista}-{version}')}"
+
+
+def coincide(request, etag):
+    """Comparación débil con If-None-Match (RFC 9110)."""
+    cabecera = request.headers.get("If-None-Match")
+    if not cabecera:
+        return False
+    etags = parse_etags(cabecera)
+    return "*" in etags or etag.removeprefix("W/") in (
+        e.removeprefix("W/") for e in etags
+    )
+
+
+def _cuerpo(response):
+    """
+    Lo que se guarda o comparte de una respuesta 200: los datos de una
+    Response de DRF, o el contenido ya armado de una HttpResponse (por
+    ejemplo, el JSON que arma PostgreSQL con ?render=db).
+    """
+    if isinstance(response, Response):
+        return {"datos": response.data}
+    return {"contenido": response.content, "tipo": response["Content-Type"]}
+
+
+def _respuesta(cuerpo, etag, origen=None):
+    if "contenido" in cuerpo:
+        response = HttpResponse(cuerpo["contenido"], content_type=cuerpo["tipo"])
+    else:
+        response = Response(data=cuerpo["datos"], status=status.HTTP_200_OK)
+    response["ETag"] = etag
+    if origen is not None:
+        response["X-Cache"] = origen
+    return response
+
+
+def _guardada(clave, version):
+    """
+    (entrada, vigente): la entrada en caché de ``clave`` y si es de
+    ``version``. Una entrada vigente que pasó la mitad de su duración se
+    renueva, para que una respuesta muy pedida no venza nunca.
+    """
+    entrada = cache.get(clave)
+    if entrada is None or entrada["version"] != version:
+        return entrada, False
+    duracion = settings.RESPUESTAS_CACHE_TIMEOUT
+    if time.time() - entrada["guardada"] > duracion / 2:
+        cache.set(clave, {**entrada, "guardada": time.time()}, timeout=duracion)
+    return entrada, True
+
+
+def _versionada(modelos, fila, guardar):
+    def decorador(metodo):
+        @wraps(metodo)
+        def envoltura(self, request, *args, **kwargs):
+            # Las generaciones avanzan al confirmar: dentro de una transacción
+            # no reflejan sus propios cambios aún sin confirmar.
+            if connection.in_atomic_block:
+                return metodo(self, request, *args, **kwargs)
+
+            vista = type(self).__name__
+            version = version_datos(modelos, fila, kwargs.get("pk"))
+            etag = etag_vista(vista, version)
+            if coincide(request, etag):
+                return Response(
+                    status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+
+            clave = clave_respuesta(vista, request)
+            vuelo = f"{clave}:{version}"
+            if guardar:
+                entrada, vigente = _guardada(clave, version)
+                if vigente:
+                    contadores.contar(vista, "aciertos")
+                    return _respuesta(entrada, etag, "HIT")
+                if entrada is not None and vuelos.en_curso(vuelo):
+                    # Cambiaron los datos y otra petición ya está calculando
+                    # la respuesta nueva: se entrega la anterior, con su ETag.
+                    contadores.contar(vista, "obsoletos")
+                    return _respuesta(
+                        entrada, etag_vista(vista, entrada["version"]), "STALE"
+                    )
+
+            def calcular():
+                if guardar:
+                    # Otra petición pudo guardarla mientras se esperaba el turno.
+                    entrada, vigente = _guardada(clave, version)
+                    if vigente:
+                        contadores.contar(vista, "aciertos")
+                        return _respuesta(entrada, etag, "HIT")
+                    contadores.contar(vista, "fallos")
+                response = metodo(self, request, *args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    response["ETag"] = etag
+                    if guardar:
+                        cache.set(
+                            clave,
+                            {
+                                "version": version,
+                                "guardada": time.time(),
+                                **_cuerpo(response),
+                            },
+                            timeout=settings.RESPUESTAS_CACHE_TIMEOUT,
+                        )
+                if guardar:
+                    response["X-Cache"] = "MISS"
+                return response
+
+            response, compartido = vuelos.hacer(vuelo, calcular)
+            if not compartido:
+                return response
+            if response.status_code != status.HTTP_200_OK:
+                # Los errores no se comparten: pueden ser de esa petición.
+                return metodo(self, request, *args, **kwargs)
+            if guardar:
+                contadores.contar(vista, "compartidos")
+            return _respuesta(_cuerpo(response), etag, "SHARED" if guardar else None)
+
+        return envoltura
+
+    return decorador
+
+
+def get_condicional(*modelos, fila=None):
+    """
+    GET condicional para el método get de una APIView. ``modelos`` son todos
+    los modelos cuyos datos aparecen en la respuesta, incluidos los
+    relacionados (por ejemplo, los nombres de los equipos en un partido), y
+    ``fila`` el modelo de la fila ``pk`` en los detalles; un cambio en
+    cualquiera cambia el ETag (ver signals.py).
+
+    El ETag sale de la versión de esos datos, no del contenido: si
+    If-None-Match coincide se responde 304 sin ejecutar la vista, con una sola
+    lectura de la caché y ninguna consulta a la base. Las peticiones idénticas
+    simultáneas del mismo proceso ejecutan la vista una sola vez (ver Vuelos).
+    """
+    return _versionada(modelos, fila, guardar=False)
+
+
+def cache_respuesta(*modelos, fila=None):
+    """
+    Como get_condicional, y además guarda en la caché de Django las
+    respuestas 200 junto con la versión de los datos. Cuando los datos cambian,
+    la primera petición calcula la respuesta nueva y, mientras tanto, las demás
+    reciben la anterior (X-Cache: STALE) en lugar de ir todas a la base.
+    """
+    return _versionada(modelos, fila, guardar=True)
@@ -0,0 +1,91 @@
+from django.db import transaction
+
+from torneo.models import Equipo, Partido, Temporada, Torneo
+from torneo.serializers import PartidoBulkItemSerializer
+from torneo.utils.conflictos import choques_en_lote
+from torneo.utils.format_serializer import format_serializer_errors
+
+NO_EXISTE = 'Clave primaria "{}" inválida - objeto no existe.'
+CHOQUE = "Un equipo no puede tener más de un partido en la misma fecha."
+
+
+def validar_lote(elementos):
+    """
+    Valida un lote de partidos y devuelve (partidos, errores).
+
+    ``partidos`` son instancias sin guardar, en el mismo orden que ``elementos``.
+    ``errores`` es una lista de {"indice", "error"}; si no está vacía, el lote no
+    debe guardarse. Las claves foráneas se resuelven con una consulta por tabla y
+    los choques de horario con una sola consulta para todo el lote.
+    """
+    errores = {}
+    validos = []
+    for indice, elemento in enumerate(elementos):
+        serializer = PartidoBulkItemSerializer(data=elemento)
+        if serializer.is_valid():
+            validos.append((indice, serializer.validated_data))
+        else:
+            errores[indice] = format_serializer_errors(serializer.errors)
+
+    equipos = Equipo.objects.in_bulk(
+        {d["idequipolocal"] for _, d in validos}
+        | {d["idequipovisitante"] for _, d in validos}
+    )
+    torneos = Torneo.objects.in_bulk({d["idtorneo"] for _, d in validos})
+    temporadas = Temporada.objects.in_bulk({d["idtemporada"] for _, d in validos})
+
+    partidos = []
+    indices = []
+    for indice, datos in validos:
+        relacionados = {
+            "idequipolocal": equipos.get(datos["idequipolocal"]),
+            "idequipovisitante": equipos.get(datos["idequipovisitante"]),
+            "idtorneo": torneos.get(datos["idtorneo"]),
+            "idtemporada": temporadas.get(datos["idtemporada"]),
+        }
+        faltantes = [
+            f"{campo}: {NO_EXISTE.format(datos[campo])}"
+            for campo, objeto in relacionados.items()
+            if objeto is None
+        ]
+        if faltantes:
+            errores[indice] = "</br>".join(faltantes)
+            continue
+
+        partido = Partido(**{**datos, **relacionados})
+        torneo = partido.idtorneo
+        if partido.idequipolocal_id == partido.idequipovisitante_id:
+            errores[indice] = "Un equipo no puede enfrentarse a sí mismo."
+        elif not (
+            torneo.fechainiciotorneo <= partido.fechapartido <= torneo.fechafintorneo
+        ):
+            errores[indice] = "La fecha del partido debe estar dentro del rango del torneo."
+        else:
+            partidos.append(partido)
+            indices.append(indice)
+
+    for posicion, otro in choques_en_lote(partidos).items():
+        mensaje = CHOQUE
+        if otro is not None:
+            mensaje += f" Coincide con el elemento {indices[otro]}."
+        errores[indices[posicion]] = mensaje
+
+    return partidos, [
+        {"indice": indice, "error": errores[indice]} for indice in sorted(errores)
+    ]
+
+
+def crear_lote(partidos):
+    """
+    Inserta los partidos validados en una sola transacción. bulk_create no envía
+    señales, así que antes y después se aplica al lote entero lo mismo que las
+    señales aplican a un partido nuevo (ver PARTIDOS NUEVOS en signals.py).
+    """
+    # signals importa llaves, que importa este módulo.
+    from torneo.signals import partidos_creados, preparar_partidos
+
+    preparar_partidos(partidos)
+    with transaction.atomic():
+        partidos = Partido.objects.bulk_create(partidos, batch_size=500)
+        partidos_creados(partidos)
+    return partidos
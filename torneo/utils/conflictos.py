@@ -0,0 +1,54 @@
+from django.db.models import Q
+
+from torneo.models import Partido
+
+
+def partidos_en_conflicto(fecha, equipos, excluir=None):
+    """
+    Partidos en la misma fecha en los que juega alguno de ``equipos``.
+
+    La condición se escribe como dos IN (local y visitante) para que cada rama
+    use su índice compuesto (equipo, fecha) en lugar de recorrer la tabla.
+    """
+    equipos = [equipo for equipo in equipos if equipo is not None]
+    partidos = Partido.objects.filter(
+        Q(idequipolocal__in=equipos) | Q(idequipovisitante__in=equipos),
+        fechapartido=fecha,
+    )
+    if excluir is not None:
+        partidos = partidos.exclude(idpartido=excluir)
+    return partidos
+
+
+def choques_en_lote(partidos):
+    """
+    Detecta choques de horario de un lote de partidos aún no guardados.
+
+    Devuelve {posición: posición del otro partido del lote} para los partidos que
+    comparten (equipo, fecha) con uno anterior del lote, o {posición: None} si el
+    choque es con un partido ya guardado. Lo guardado se consulta una sola vez
+    para todo el lote; el cruce exacto de pares se hace en memoria.
+    """
+    choques = {}
+    ocupados = {}
+    for posicion, partido in enumerate(partidos):
+        for equipo in (partido.idequipolocal_id, partido.idequipovisitante_id):
+            anterior = ocupados.setdefault((equipo, partido.fechapartido), posicion)
+            if anterior != posicion:
+                choques.setdefault(posicion, anterior)
+
+    equipos = {equipo for equipo, _ in ocupados}
+    fechas = {fecha for _, fecha in ocupados}
+    if not equipos:
+        return choques
+
+    guardados = Partido.objects.filter(
+        Q(idequipolocal__in=equipos) | Q(idequipovisitante__in=equipos),
+        fechapartido__in=fechas,
+    ).values_list("idequipolocal", "idequipovisitante", "fechapartido")
+    for local, visitante, fecha in guardados:
+        for equipo in (local, visitante):
+            posicion = ocupados.get((equipo, fecha))
+            if posicion is not None:
+                choques[posicion] = None
+    return choques
@@ -0,0 +1,131 @@
+import numpy as np
+
+from torneo.models import Partido
+from torneo.utils.posiciones import PUNTOS_EMPATE, PUNTOS_VICTORIA
+
+
+class MatrizResultados:
+    """
+    Resultados de un torneo en forma de matriz, indexada por la posición de cada
+    equipo en ``equipos``:
+
+    - goles[i, j]: goles que i le hizo a j, sumando todos sus partidos.
+    - puntos[i, j]: puntos que i sacó contra j.
+
+    Se construye con una sola consulta y sirve para cualquier subgrupo de
+    equipos empatados: la mini tabla de un grupo es la submatriz de sus filas y
+    columnas.
+    """
+
+    def __init__(self, torneo_id, equipos):
+        equipos = np.asarray(equipos, dtype=np.int64)
+        total = len(equipos)
+        self.goles = np.zeros((total, total), dtype=np.int64)
+        self.puntos = np.zeros((total, total), dtype=np.int64)
+
+        filas = Partido.objects.filter(
+            idtorneo=torneo_id,
+            marcadorequipolocal__isnull=False,
+            marcadorequipovisitante__isnull=False,
+        ).values_list(
+            "idequipolocal",
+            "idequipovisitante",
+            "marcadorequipolocal",
+            "marcadorequipovisitante",
+        )
+        datos = np.array(list(filas), dtype=np.int64).reshape(-1, 4)
+        if not len(datos):
+            return
+
+        orden = np.argsort(equipos)
+        ordenados = equipos[orden]
+        posiciones = np.searchsorted(ordenados, datos[:, :2]).clip(max=total - 1)
+        conocidos = (ordenados[posiciones] == datos[:, :2]).all(axis=1)
+        local, visitante = orden[posiciones[conocidos]].T
+        goles_local, goles_visitante = datos[conocidos, 2], datos[conocidos, 3]
+
+        np.add.at(self.goles, (local, visitante), goles_local)
+        np.add.at(self.goles, (visitante, local), goles_visitante)
+        empate = goles_local == goles_visitante
+        np.add.at(
+            self.puntos,
+            (local, visitante),
+            np.where(goles_local > goles_visitante, PUNTOS_VICTORIA, empate * PUNTOS_EMPATE),
+        )
+        np.add.at(
+            self.puntos,
+            (visitante, local),
+            np.where(goles_visitante > goles_local, PUNTOS_VICTORIA, empate * PUNTOS_EMPATE),
+        )
+
+    def puntosdirectos(self, grupo):
+        return self.puntos[np.ix_(grupo, grupo)].sum(axis=1)
+
+    def golesdirectos(self, grupo):
+        return self.goles[np.ix_(grupo, grupo)].sum(axis=1)
+
+    def diferenciadirecta(self, grupo):
+        mini = self.goles[np.ix_(grupo, grupo)]
+        return mini.sum(axis=1) - mini.sum(axis=0)
+
+
+class MotorDesempate:
+    """
+    Ordena una tabla de posiciones aplicando los criterios de desempate del
+    torneo en orden.
+
+    Los criterios generales (diferencia de goles, goles a favor, ...) salen de
+    los totales ya materializados. Los directos necesitan la matriz de
+    resultados, que se arma una sola vez por torneo y solo si algún empate
+    llega a un criterio directo. Cada criterio se aplica al subgrupo que sigue
+    empatado; si se agotan, desempata el identificador del equipo.
+    """
+
+    def __init__(self, torneo_id, equipos, totales):
+        self.torneo_id = torneo_id
+        self.equipos = np.asarray(equipos, dtype=np.int64)
+        self.totales = {
+            campo: np.asarray(valores, dtype=np.int64) for campo, valores in totales.items()
+        }
+        self._matriz = None
+
+    @property
+    def matriz(self):
+        if self._matriz is None:
+            self._matriz = MatrizResultados(self.torneo_id, self.equipos)
+        return self._matriz
+
+    def _clave(self, criterio, grupo):
+        if criterio in self.totales:
+            return self.totales[criterio][grupo]
+        return getattr(self.matriz, criterio)(grupo)
+
+    def ordenar(self, criterios):
+        """Devuelve los índices de ``equipos`` del primero al último."""
+        return self._resolver(np.arange(len(self.equipos)), ["puntos", *criterios])
+
+    def _resolver(self, grupo, criterios):
+        if len(grupo) < 2:
+            return list(grupo)
+        if not criterios:
+            return list(grupo[np.argsort(self.equipos[grupo], kind="stable")])
+        clave = self._clave(criterios[0], grupo)
+        ordenados = []
+        for valor in np.unique(clave)[::-1]:
+            ordenados += self._resolver(grupo[clave == valor], criterios[1:])
+        return ordenados
+
+
+def ordenar_posiciones(torneo, posiciones):
+    """Ordena las filas de Posicion del torneo según sus criterios de desempate."""
+    posiciones = list(posiciones)
+    if len(posiciones) < 2:
+        return posiciones
+    totales = {
+        campo: [getattr(fila, campo) for fila in posiciones]
+        for campo in ("puntos", "diferenciagoles", "golesfavor", "partidosganados")
+    }
+    motor = MotorDesempate(
+        torneo.idtorneo, [fila.idequipo_id for fila in posiciones], totales
+    )
+    return [posiciones[i] for i in motor.ordenar(torneo.criterios_desempate())]
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+
+def canales_partido(partido):
+    """Canales en los que se publica un cambio del partido."""
+    return [
+        ("partido", partido.idpartido),
+        ("torneo", partido.idtorneo_id),
+        ("temporada", partido.idtemporada_id),
+    ]
+
+
+def evento_partido(partido, tipo):
+    """Datos que se envían a los suscriptores cuando cambia un partido."""
+    return {
+        "tipo": tipo,
+        "idpartido": partido.idpartido,
+        "idtorneo": partido.idtorneo_id,
+        "idtemporada": partido.idtemporada_id,
+        "fechapartido": partido.fechapartido,
+        "marcadorequipolocal": partido.marcadorequipolocal,
+        "marcadorequipovisitante": partido.marcadorequipovisitante,
+        "partidosubido": partido.partidosubido,
+        "version": partido.version,
+    }
+
+
+class Suscripcion:
+    """
+    Cola de eventos de un suscriptor, ligada al event loop que la creó. Los
+    eventos pueden llegar desde cualquier hilo (las vistas síncronas y sus
+    señales corren fuera del loop); se entregan con call_soon_threadsafe.
+
+    Si el suscriptor no consume y la cola se llena, se descarta el evento más
+    antiguo: para un marcador en vivo importa el último estado.
+    """
+
+    def __init__(self, difusor, canal, maximo):
+        self.difusor = difusor
+        self.canal = canal
+        self.loop = asyncio.get_running_loop()
+        self.cola = asyncio.Queue(maxsize=maximo)
+
+    def entregar(self, evento):
+        try:
+            self.loop.call_soon_threadsafe(self._encolar, evento)
+        except RuntimeError:
+            # El loop ya se cerró: el suscriptor no va a volver a leer.
+            self.cerrar()
+
+    def _encolar(self, evento):
+        if self.cola.full():
+            self.cola.get_nowait()
+        self.cola.put_nowait(evento)
+
+    async def recibir(self, timeout=None):
+        """Siguiente evento, o None si pasan ``timeout`` segundos sin ninguno."""
+        try:
+            return await asyncio.wait_for(self.cola.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def cerrar(self):
+        self.difusor.desuscribir(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class Difusor:
+    """
+    Reparte eventos entre los suscriptores de este proceso. Cada conexión
+    abierta es solo una cola en memoria, así que un worker ASGI puede mantener
+    miles de suscriptores esperando sin ocupar un hilo por cada uno.
+
+    Solo llegan los eventos publicados en el mismo proceso: con varios workers,
+    cada uno ve los cambios que guarda él.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suscriptores = defaultdict(set)
+
+    def suscribir(self, canal, maximo=None):
+        """Suscribe al ``canal`` desde el event loop en curso."""
+        suscripcion = Suscripcion(self, canal, maximo or settings.EVENTOS_COLA_MAX)
+        with self._lock:
+            self._suscriptores[canal].add(suscripcion)
+        return suscripcion
+
+    def desuscribir(self, suscripcion):
+        with self._lock:
+            suscriptores = self._suscriptores.get(suscripcion.canal)
+            if suscriptores is not None:
+                suscriptores.discard(suscripcion)
+                if not suscriptores:
+                    del self._suscriptores[suscripcion.canal]
+
+    def publicar(self, canales, evento):
+        with self._lock:
+            destinos = [s for canal in canales for s in self._suscriptores.get(canal, ())]
+        for suscripcion in destinos:
+            suscripcion.entregar(evento)
+        return len(destinos)
+
+    def total(self):
+        with self._lock:
+            return sum(len(suscriptores) for suscriptores in self._suscriptores.values())
+
+
+difusor = Difusor()
@@ -0,0 +1,200 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from torneo.models import Partido
+
+CAMPOS = (
+    "partidosjugados",
+    "partidosganados",
+    "partidosempatados",
+    "partidosperdidos",
+    "golesfavor",
+    "golescontra",
+)
+
+
+def clave_cache(equipo_id):
+    return f"estadisticas:equipo:{equipo_id}"
+
+
+def _agregados(lado, equipo_id):
+    """
+    Agregados condicionales de los partidos en los que el equipo juega de
+    ``lado`` ("local" o "visitante"): una columna por estadística.
+    """
+    propio, rival = (
+        ("marcadorequipolocal", "marcadorequipovisitante")
+        if lado == "local"
+        else ("marcadorequipovisitante", "marcadorequipolocal")
+    )
+    juega = Q(**{f"idequipo{lado}": equipo_id})
+    return {
+        f"{lado}_partidosjugados": Count("idpartido", filter=juega),
+        f"{lado}_partidosganados": Count(
+            "idpartido", filter=juega & Q(**{f"{propio}__gt": F(rival)})
+        ),
+        f"{lado}_partidosempatados": Count(
+            "idpartido", filter=juega & Q(**{propio: F(rival)})
+        ),
+        f"{lado}_partidosperdidos": Count(
+            "idpartido", filter=juega & Q(**{f"{propio}__lt": F(rival)})
+        ),
+        f"{lado}_golesfavor": Coalesce(Sum(propio, filter=juega), Value(0)),
+        f"{lado}_golescontra": Coalesce(Sum(rival, filter=juega), Value(0)),
+    }
+
+
+def _vacio():
+    return {campo: 0 for campo in CAMPOS}
+
+
+def _acumular(destino, fila):
+    for lado in ("local", "visitante"):
+        for campo in CAMPOS:
+            valor = fila[f"{lado}_{campo}"]
+            destino[lado][campo] += valor
+            destino[campo] += valor
+
+
+def _bloque():
+    return {**_vacio(), "local": _vacio(), "visitante": _vacio()}
+
+
+def _cerrar(bloque):
+    for datos in (bloque, bloque["local"], bloque["visitante"]):
+        datos["diferenciagoles"] = datos["golesfavor"] - datos["golescontra"]
+    return bloque
+
+
+def calcular_estadisticas(equipo_id):
+    """
+    Estadísticas del equipo (total, por temporada y por torneo, cada una con
+    su división local/visitante) a partir de una sola consulta: los partidos
+    jugados del equipo, de local o de visitante, agrupados por torneo con
+    agregados condicionales. Los totales por temporada se suman en memoria.
+    """
+    filas = (
+        Partido.objects.filter(
+            Q(idequipolocal=equipo_id) | Q(idequipovisitante=equipo_id),
+            marcadorequipolocal__isnull=False,
+            marcadorequipovisitante__isnull=False,
+        )
+        .values("idtemporada", "idtorneo")
+        .annotate(
+            **_agregados("local", equipo_id), **_agregados("visitante", equipo_id)
+        )
+        .order_by("idtemporada", "idtorneo")
+    )
+
+    total = _bloque()
+    temporadas = {}
+    for fila in filas:
+        temporada = temporadas.setdefault(
+            fila["idtemporada"],
+            {"idtemporada": fila["idtemporada"], **_bloque(), "torneos": []},
+        )
+        torneo = {"idtorneo": fila["idtorneo"], **_bloque()}
+        for destino in (total, temporada, torneo):
+            _acumular(destino, fila)
+        temporada["torneos"].append(_cerrar(torneo))
+
+    return {
+        "idequipo": equipo_id,
+        "total": _cerrar(total),
+        "temporadas": [_cerrar(temporada) for temporada in temporadas.values()],
+    }
+
+
+def enfrentamientos(equipo_id, rival_id):
+    """
+    Partidos entre los dos equipos, sin importar quién fue local. Filtra por el
+    par (menor, mayor) con las mismas expresiones que partido_enfrentamiento_idx,
+    así que se resuelve con un rango de ese índice.
+    """
+    return Partido.objects.alias(
+        equipomenor=Least("idequipolocal", "idequipovisitante"),
+        equipomayor=Greatest("idequipolocal", "idequipovisitante"),
+    ).filter(
+        equipomenor=min(equipo_id, rival_id), equipomayor=max(equipo_id, rival_id)
+    )
+
+
+def estadisticas_enfrentamiento(equipo_id, rival_id):
+    """
+    Resultados de ``equipo_id`` contra ``rival_id`` en todos sus partidos
+    jugados, con el mismo formato que el total de ``calcular_estadisticas``.
+
+    Entre dos equipos solo hay dos grupos posibles según quién fue local, así
+    que se agrupa por el local con agregados simples y cada grupo se lee desde
+    el lado de ``equipo_id``.
+    """
+    grupos = (
+        enfrentamientos(equipo_id, rival_id)
+        .filter(marcadorequipolocal__isnull=False, marcadorequipovisitante__isnull=False)
+        .values("idequipolocal")
+        .annotate(
+            jugados=Count("idpartido"),
+            ganadoslocal=Count(
+                "idpartido",
+                filter=Q(marcadorequipolocal__gt=F("marcadorequipovisitante")),
+            ),
+            empatados=Count(
+                "idpartido", filter=Q(marcadorequipolocal=F("marcadorequipovisitante"))
+            ),
+            goleslocal=Sum("marcadorequipolocal"),
+            golesvisitante=Sum("marcadorequipovisitante"),
+        )
+        .order_by()
+    )
+    resumen = _bloque()
+    for grupo in grupos:
+        ganadosvisitante = grupo["jugados"] - grupo["ganadoslocal"] - grupo["empatados"]
+        if grupo["idequipolocal"] == equipo_id:
+            lado, ganados, perdidos = "local", grupo["ganadoslocal"], ganadosvisitante
+            favor, contra = grupo["goleslocal"], grupo["golesvisitante"]
+        else:
+            lado, ganados, perdidos = "visitante", ganadosvisitante, grupo["ganadoslocal"]
+            favor, contra = grupo["golesvisitante"], grupo["goleslocal"]
+        valores = dict(
+            zip(CAMPOS, (grupo["jugados"], ganados, grupo["empatados"], perdidos, favor, contra))
+        )
+        for campo, valor in valores.items():
+            resumen[lado][campo] += valor
+            resumen[campo] += valor
+    return _cerrar(resumen)
+
+
+def estadisticas_equipo(equipo_id):
+    """
+    Estadísticas del equipo, desde la caché si no cambió ningún marcador suyo.
+    Un equipo sin partidos jugados no se guarda en la caché (puede no existir).
+    """
+    datos = cache.get(clave_cache(equipo_id))
+    if datos is None:
+        datos = calcular_estadisticas(equipo_id)
+        if datos["temporadas"]:
+            cache.set(clave_cache(equipo_id), datos, timeout=None)
+    return datos
+
+
+def invalidar_estadisticas(cambios):
+    """
+    Descarta de la caché las estadísticas de los equipos cuyos partidos
+    cambiaron. ``cambios`` son pares (anterior, nuevo) de
+    ``Partido.resultado(Partido.CAMPOS_ESTADISTICAS)``: también cuenta la
+    temporada, porque las estadísticas se desglosan por temporada. Se hace al
+    confirmar la transacción, para que una lectura concurrente no vuelva a
+    guardar los datos viejos.
+    """
+    equipos = set()
+    for anterior, nuevo in cambios:
+        if anterior == nuevo:
+            continue
+        for resultado in (anterior, nuevo):
+            if resultado is not None:
+                equipos.update(resultado[1:3])
+    if equipos:
+        claves = [clave_cache(equipo) for equipo in equipos]
+        transaction.on_commit(lambda: cache.delete_many(claves))
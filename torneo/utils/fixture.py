@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.db.models import Q
+
+from torneo.models import Equipo, Partido
+
+# Separación mínima al mover un partido que choca con otro del mismo equipo.
+DESPLAZAMIENTO = timedelta(hours=1)
+
+
+def resolver_equipos(ids):
+    """
+    Busca los equipos en una sola consulta y los devuelve en el orden de ``ids``.
+    Lanza ValueError con los identificadores que no existen.
+    """
+    encontrados = Equipo.objects.in_bulk(ids)
+    faltantes = [str(i) for i in ids if i not in encontrados]
+    if faltantes:
+        raise ValueError(f"Equipos inexistentes: {', '.join(faltantes)}")
+    return [encontrados[i] for i in ids]
+
+
+def rondas_todos_contra_todos(equipos, ida_y_vuelta=False):
+    """
+    Empareja los equipos con el método del círculo.
+
+    Devuelve una lista de rondas; cada ronda es una lista de pares
+    (local, visitante) en la que cada equipo aparece como mucho una vez. Con un
+    número impar de equipos, en cada ronda descansa uno. Con ``ida_y_vuelta`` se
+    agrega la segunda vuelta con la localía invertida.
+    """
+    participantes = list(equipos)
+    if len(participantes) % 2:
+        participantes.append(None)
+    total = len(participantes)
+
+    rondas = []
+    for numero in range(total - 1):
+        ronda = []
+        for i in range(total // 2):
+            local, visitante = participantes[i], participantes[total - 1 - i]
+            if local is None or visitante is None:
+                continue
+            # El equipo fijo alterna localía cada ronda; el resto, según su mesa.
+            if (i == 0 and numero % 2) or (i > 0 and i % 2):
+                local, visitante = visitante, local
+            ronda.append((local, visitante))
+        rondas.append(ronda)
+        participantes = [participantes[0], participantes[-1], *participantes[1:-1]]
+
+    if ida_y_vuelta:
+        rondas += [[(visitante, local) for local, visitante in r] for r in rondas]
+    return rondas
+
+
+def a_minuto(fecha):
+    """Redondea hacia arriba al minuto."""
+    if fecha.second or fecha.microsecond:
+        fecha = fecha.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    return fecha
+
+
+def horarios_ocupados(ids, inicio, fin):
+    """Pares (equipo, fecha) ya ocupados por esos equipos entre ``inicio`` y ``fin``."""
+    ocupados = set()
+    guardados = Partido.objects.filter(
+        Q(idequipolocal__in=ids) | Q(idequipovisitante__in=ids),
+        fechapartido__range=(inicio, fin),
+    ).values_list("idequipolocal", "idequipovisitante", "fechapartido")
+    for local, visitante, fecha in guardados:
+        ocupados.add((local, fecha))
+        ocupados.add((visitante, fecha))
+    return ocupados
+
+
+def reservar_horario(ocupados, local, visitante, fecha, fin):
+    """
+    Primera fecha desde ``fecha`` en la que ningún equipo juega, corriendo el
+    partido ``DESPLAZAMIENTO`` cada vez. La marca como ocupada y la devuelve.
+    Lanza ValueError si pasa de ``fin``.
+    """
+    while {(local, fecha), (visitante, fecha)} & ocupados:
+        fecha += DESPLAZAMIENTO
+    if fecha > fin:
+        raise ValueError("No hay fechas libres dentro del rango del torneo.")
+    ocupados.add((local, fecha))
+    ocupados.add((visitante, fecha))
+    return fecha
+
+
+def generar_fixture(torneo, equipos, ida_y_vuelta=False):
+    """
+    Genera, sin guardarlos, los partidos de un todos contra todos del torneo.
+
+    Las rondas se reparten de forma uniforme entre ``fechainiciotorneo`` y
+    ``fechafintorneo``. Los partidos ya guardados de esos equipos en ese rango se
+    leen en una sola consulta; a partir de ahí los choques de horario se
+    comprueban en memoria (ver ``reservar_horario``). Lanza ValueError si el
+    fixture no cabe dentro del torneo.
+    """
+    inicio, fin = torneo.fechainiciotorneo, torneo.fechafintorneo
+    ocupados = horarios_ocupados([equipo.idequipo for equipo in equipos], inicio, fin)
+
+    rondas = rondas_todos_contra_todos(equipos, ida_y_vuelta)
+    paso = (fin - inicio) / len(rondas)
+    partidos = []
+    for numero, ronda in enumerate(rondas):
+        base = a_minuto(inicio + paso * numero)
+        for local, visitante in ronda:
+            partidos.append(
+                Partido(
+                    fechapartido=reservar_horario(
+                        ocupados, local.idequipo, visitante.idequipo, base, fin
+                    ),
+                    idequipolocal=local,
+                    idequipovisitante=visitante,
+                    idtorneo=torneo,
+                    idtemporada=torneo.idtemporada,
+                )
+            )
+    return partidos
@@ -0,0 +1,214 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import ProtectedError
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+TAMANOS_VARIANTES = (64, 256)
+FORMATOS_VARIANTES = ("png", "webp")
+TIPOS_FORMATO = {"png": "image/png", "webp": "image/webp"}
+
+_FIRMAS = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+_pool = None
+_pool_lock = threading.Lock()
+_pendientes = None
+
+
+def hash_imagen(datos: bytes) -> str:
+    """Devuelve el SHA-256 en hexadecimal del contenido de la imagen."""
+    return hashlib.sha256(datos).hexdigest()
+
+
+def detectar_tipo_contenido(datos: Optional[bytes]) -> str:
+    """
+    Detecta el tipo MIME de la imagen a partir de sus primeros bytes.
+    Si no se reconoce la firma se asume PNG, que es lo que enviaba el frontend.
+    """
+    cabecera = bytes(datos[:12]) if datos else b""
+    for firma, tipo in _FIRMAS:
+        if cabecera.startswith(firma):
+            return tipo
+    if cabecera[:4] == b"RIFF" and cabecera[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png"
+
+
+def guardar_imagen(datos: bytes):
+    """
+    Guarda la imagen en el almacenamiento direccionado por contenido.
+
+    Si ya existe una imagen con el mismo SHA-256 se reutiliza en vez de guardar
+    otra copia. Devuelve (imagen, creada).
+    """
+    from torneo.models import Imagen
+
+    return Imagen.objects.get_or_create(
+        hashimagen=hash_imagen(datos),
+        defaults={
+            "datosimagen": datos,
+            "tipoimagen": detectar_tipo_contenido(datos),
+            "tamanoimagen": len(datos),
+        },
+    )
+
+
+def guardar_imagen_subida(archivo):
+    """
+    Igual que guardar_imagen, para una imagen recibida como archivo.
+
+    Si el archivo ya trae su hash (ImagenUploadHandler) y la imagen existe, no se
+    llega a leer. Devuelve (imagen, creada, datos); datos es None si no se leyó.
+    """
+    from torneo.models import Imagen
+
+    hashimagen = getattr(archivo, "hashimagen", None)
+    if hashimagen:
+        existente = Imagen.objects.filter(hashimagen=hashimagen).first()
+        if existente:
+            return existente, False, None
+
+    archivo.seek(0)
+    datos = archivo.read()
+    imagen, creada = guardar_imagen(datos)
+    return imagen, creada, datos
+
+
+def liberar_imagen(hashimagen: Optional[str]):
+    """Elimina la imagen (y sus variantes) si ningún equipo la referencia ya."""
+    from torneo.models import Imagen
+
+    if not hashimagen:
+        return
+    try:
+        Imagen.objects.filter(hashimagen=hashimagen, equipos__isnull=True).delete()
+    except ProtectedError:
+        # Otro equipo empezó a usarla entre la consulta y el borrado.
+        pass
+
+
+def elegir_tamano(solicitado: int) -> Optional[int]:
+    """
+    Devuelve el tamaño de variante más pequeño que cubre el solicitado, o None
+    si se pide algo mayor que todas las variantes (se sirve el original).
+    """
+    for tamano in TAMANOS_VARIANTES:
+        if solicitado <= tamano:
+            return tamano
+    return None
+
+
+def generar_variantes(datos: bytes) -> List[Tuple[int, str, bytes]]:
+    """
+    Genera las miniaturas de la imagen en cada tamaño y formato configurado.
+
+    Es una función pura (sin acceso a la base de datos) para poder ejecutarse en
+    un proceso del pool. Devuelve una lista de (tamaño, formato, bytes).
+    """
+    variantes = []
+    with Image.open(io.BytesIO(datos)) as original:
+        original.load()
+        modo = "RGBA" if original.mode in ("RGBA", "LA", "P") else "RGB"
+        base = original.convert(modo)
+
+    for tamano in TAMANOS_VARIANTES:
+        miniatura = base.copy()
+        miniatura.thumbnail((tamano, tamano), Image.Resampling.LANCZOS)
+        for formato in FORMATOS_VARIANTES:
+            buffer = io.BytesIO()
+            if formato == "webp":
+                miniatura.save(buffer, format="WEBP", quality=80, method=4)
+            else:
+                miniatura.save(buffer, format="PNG", optimize=True)
+            variantes.append((tamano, formato, buffer.getvalue()))
+    return variantes
+
+
+def guardar_variantes(hashorigen: str, variantes: List[Tuple[int, str, bytes]]):
+    from torneo.models import ImagenVariante
+
+    ImagenVariante.objects.bulk_create(
+        [
+            ImagenVariante(
+                hashorigen_id=hashorigen,
+                tamanovariante=tamano,
+                formatovariante=formato,
+                datosvariante=datos,
+            )
+            for tamano, formato, datos in variantes
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _obtener_pool():
+    global _pool, _pendientes
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGENES_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pendientes = threading.BoundedSemaphore(settings.IMAGENES_PENDIENTES_MAX)
+        return _pool
+
+
+def _al_terminar(hashorigen, futuro):
+    try:
+        guardar_variantes(hashorigen, futuro.result())
+    except Exception:
+        logger.exception("No se pudieron generar las variantes de %s", hashorigen)
+    finally:
+        _pendientes.release()
+        # El callback corre en un hilo del pool, fuera del ciclo de una petición.
+        connection.close()
+
+
+def programar_variantes(hashorigen: str, datos: bytes) -> bool:
+    """
+    Encola la generación de variantes de una imagen recién subida.
+
+    Como las variantes se asocian al hash, una imagen repetida no se vuelve a
+    procesar. Con IMAGENES_WORKERS=0 se generan en el proceso actual. Si hay más de
+    IMAGENES_PENDIENTES_MAX trabajos en cola no se encola y se devuelve False; el
+    endpoint de la imagen sirve el original hasta que se ejecute
+    `manage.py generar_variantes_imagenes`.
+    """
+    from torneo.models import ImagenVariante
+
+    if ImagenVariante.objects.filter(hashorigen=hashorigen).exists():
+        return True
+
+    if settings.IMAGENES_WORKERS <= 0:
+        try:
+            guardar_variantes(hashorigen, generar_variantes(datos))
+        except Exception:
+            logger.exception("No se pudieron generar las variantes de %s", hashorigen)
+            return False
+        return True
+
+    pool = _obtener_pool()
+    if not _pendientes.acquire(blocking=False):
+        logger.warning("Cola de imágenes llena; variantes de %s omitidas", hashorigen)
+        return False
+    try:
+        futuro = pool.submit(generar_variantes, datos)
+    except Exception:
+        _pendientes.release()
+        raise
+    futuro.add_done_callback(lambda f: _al_terminar(hashorigen, f))
+    return True
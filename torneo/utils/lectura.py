@@ -0,0 +1,151 @@
+import copy
+import json
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Campos cuya representación es el mismo valor que devuelve la base: no hace
+# falta llamar a to_representation.
+SIN_CONVERSION = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.RelatedField,
+    serializers.ReadOnlyField,
+)
+
+
+class PlanLectura:
+    """
+    Lectura de solo lectura equivalente a un ModelSerializer: en lugar de crear
+    un objeto del modelo y recorrer los campos del serializador por cada fila,
+    pide tuplas con values_list() (los nombres relacionados salen del mismo
+    JOIN) y arma cada dict con el orden y la representación del serializador.
+
+    El serializador lo habilita declarando en su Meta ``valores``: la columna
+    (con lookups a través de las relaciones) de cada campo que no es una
+    columna propia del modelo, como los StringRelatedField.
+    """
+
+    def __init__(self, serializer_class):
+        rutas = serializer_class.Meta.valores
+        self.nombres = []
+        self.columnas = []
+        self.conversiones = []
+        for nombre, campo in serializer_class().fields.items():
+            if campo.write_only:
+                continue
+            columna = rutas.get(nombre, campo.source)
+            if "." in columna or columna == "*":
+                raise ValueError(f"Falta la columna del campo '{nombre}' en Meta.valores")
+            if not isinstance(campo, SIN_CONVERSION):
+                self.conversiones.append((len(self.nombres), campo))
+            self.nombres.append(nombre)
+            self.columnas.append(columna)
+
+    def leer(self, queryset):
+        """Filas de ``queryset`` como los dicts que daría el serializador."""
+        nombres = self.nombres
+        conversiones = [(i, _representacion(campo)) for i, campo in self.conversiones]
+        filas = []
+        for tupla in queryset.values_list(*self.columnas):
+            if conversiones:
+                tupla = list(tupla)
+                for indice, convertir in conversiones:
+                    if tupla[indice] is not None:
+                        tupla[indice] = convertir(tupla[indice])
+            filas.append(dict(zip(nombres, tupla)))
+        return filas
+
+    def json_postgres(self, queryset, **envoltura):
+        """
+        JSON de ``envoltura`` con las filas de ``queryset`` en "results",
+        armado por PostgreSQL con json_build_object/json_agg y devuelto como
+        bytes, sin crear objetos ni dicts en Python. Los valores de
+        ``envoltura`` van antes de "results", en ese orden.
+
+        Devuelve None si la base no es PostgreSQL o si algún campo no se
+        representa igual en SQL; en ese caso se usa leer().
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        conversiones = dict(self.conversiones)
+        expresiones = []
+        for indice in range(len(self.nombres)):
+            expresion = _expresion_sql(f"t.c{indice}", conversiones.get(indice))
+            if expresion is None:
+                return None
+            expresiones.append(expresion)
+
+        # json_agg no garantiza el orden de la subconsulta: cada fila lleva su
+        # número según el mismo orden del queryset y se agrega por ese número.
+        orden = queryset.query.order_by or (
+            queryset.model._meta.ordering if queryset.query.default_ordering else ()
+        )
+        numero = Window(RowNumber(), order_by=list(orden) or None)
+        sql, params = queryset.values_list(*self.columnas, numero).query.sql_with_params()
+        alias = ", ".join(f"c{indice}" for indice in range(len(self.nombres)))
+        filas = ", ".join(f"%s, {expresion}" for expresion in expresiones)
+        claves = ", ".join("%s, %s::json" for _ in envoltura)
+        consulta = (
+            f"SELECT json_build_object({claves}{', ' if claves else ''}'results', "
+            f"(SELECT COALESCE(json_agg(json_build_object({filas}) ORDER BY t.n), "
+            f"'[]'::json) FROM ({sql}) AS t({alias}, n)))::text"
+        )
+        parametros = [
+            v for clave, valor in envoltura.items() for v in (clave, json.dumps(valor))
+        ]
+        parametros += self.nombres
+        parametros += params
+        with connection.cursor() as cursor:
+            cursor.execute(consulta, parametros)
+            return cursor.fetchone()[0].encode("utf-8")
+
+
+def _expresion_sql(columna, campo):
+    """
+    Expresión SQL que da el mismo valor JSON que el campo del serializador, o
+    None si no se sabe representar. Las fechas salen como las de DRF en ISO
+    8601: microsegundos solo si no son cero y "Z" en lugar de +00:00.
+    """
+    if campo is None:
+        return columna
+    if (
+        isinstance(campo, serializers.DateTimeField)
+        and getattr(campo, "format", api_settings.DATETIME_FORMAT).lower() == ISO_8601
+        and getattr(campo, "timezone", None) is None
+        and timezone.get_current_timezone_name() == "UTC"
+    ):
+        utc = f"({columna} AT TIME ZONE 'UTC')"
+        return (
+            f"to_char({utc}, 'YYYY-MM-DD\"T\"HH24:MI:SS') || "
+            f"CASE WHEN mod(extract(microseconds FROM {utc})::integer, 1000000) = 0 "
+            f"THEN '' ELSE to_char({utc}, '.US') END || 'Z'"
+        )
+    return None
+
+
+def _representacion(campo):
+    """
+    to_representation del campo. Los DateTimeField buscan la zona horaria
+    activa en cada valor; aquí se fija una vez por lectura, en una copia para
+    no tocar el campo compartido entre hilos.
+    """
+    if isinstance(campo, serializers.DateTimeField) and not hasattr(campo, "timezone"):
+        campo = copy.copy(campo)
+        campo.timezone = campo.default_timezone()
+    return campo.to_representation
+
+
+@lru_cache(maxsize=None)
+def plan_lectura(serializer_class):
+    """PlanLectura del serializador, o None si no declara Meta.valores."""
+    if not hasattr(getattr(serializer_class, "Meta", None), "valores"):
+        return None
+    return PlanLectura(serializer_class)
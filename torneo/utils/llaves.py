@@ -0,0 +1,227 @@
+from django.db import transaction
+
+from torneo.models import Llave, Partido
+from torneo.utils.cache_vistas import invalidar_respuestas
+from torneo.utils.carga_masiva import crear_lote
+from torneo.utils.fixture import (
+    DESPLAZAMIENTO,
+    a_minuto,
+    horarios_ocupados,
+    reservar_horario,
+)
+
+
+class SinHorario(ValueError):
+    """No hay una fecha libre dentro del torneo para el partido siguiente del cuadro."""
+
+    def __init__(self, llave):
+        super().__init__(
+            f"No hay fechas libres dentro del torneo para el partido de la ronda "
+            f"{llave.ronda} del cuadro."
+        )
+        self.llave = llave
+
+
+def orden_siembra(tamano):
+    """
+    Siembra estándar de un cuadro de ``tamano`` (potencia de 2) casillas.
+
+    Devuelve los números de siembra (1 = mejor) en el orden en que ocupan la
+    primera ronda, de modo que 1 y 2 solo pueden cruzarse en la final:
+    8 -> [1, 8, 4, 5, 2, 7, 3, 6].
+    """
+    orden = [1]
+    while len(orden) < tamano:
+        total = len(orden) * 2 + 1
+        orden = [siembra for s in orden for siembra in (s, total - s)]
+    return orden
+
+
+def total_rondas(cantidad):
+    return max(1, (cantidad - 1).bit_length())
+
+
+def fecha_ronda(torneo, ronda, rondas):
+    """Las rondas se reparten de forma uniforme en el rango del torneo."""
+    inicio, fin = torneo.fechainiciotorneo, torneo.fechafintorneo
+    return a_minuto(inicio + (fin - inicio) / rondas * (ronda - 1))
+
+
+def ganador(partido):
+    """Equipo ganador del partido, o None si falta algún marcador o hay empate."""
+    local, visitante = partido.marcadorequipolocal, partido.marcadorequipovisitante
+    if local is None or visitante is None or local == visitante:
+        return None
+    return partido.idequipolocal_id if local > visitante else partido.idequipovisitante_id
+
+
+class CuadroJugado(ValueError):
+    """El ganador cambiaría en una casilla cuyo partido siguiente ya se jugó."""
+
+    def __init__(self, llave):
+        super().__init__(
+            f"El partido de la ronda {llave.ronda} del cuadro ya se jugó: no se "
+            f"puede cambiar el ganador que avanzó a él."
+        )
+
+
+def _lado(posicion_origen):
+    """Lado de la casilla siguiente que ocupa el ganador de la casilla de origen."""
+    return "idequipolocal" if posicion_origen % 2 == 0 else "idequipovisitante"
+
+
+def generar_llaves(torneo, equipos):
+    """
+    Crea el cuadro de eliminación directa del torneo con los equipos en orden de
+    siembra.
+
+    Se guardan todas las casillas de una vez y los partidos de la primera ronda
+    en un solo lote. Si el número de equipos no es potencia de 2, los mejores
+    sembrados pasan directamente a la segunda ronda. Lanza ValueError si no hay
+    fechas libres dentro del torneo.
+    """
+    rondas = total_rondas(len(equipos))
+    tamano = 2**rondas
+    llaves = {
+        (ronda, posicion): Llave(idtorneo=torneo, ronda=ronda, posicion=posicion)
+        for ronda in range(1, rondas + 1)
+        for posicion in range(tamano >> ronda)
+    }
+
+    orden = orden_siembra(tamano)
+    for posicion in range(tamano // 2):
+        llave = llaves[(1, posicion)]
+        local, visitante = (
+            equipos[siembra - 1] if siembra <= len(equipos) else None
+            for siembra in (orden[2 * posicion], orden[2 * posicion + 1])
+        )
+        llave.idequipolocal, llave.idequipovisitante = local, visitante
+        if visitante is None and rondas > 1:
+            setattr(llaves[(2, posicion // 2)], _lado(posicion), local)
+
+    por_id = {equipo.idequipo: equipo for equipo in equipos}
+    ocupados = horarios_ocupados(
+        list(por_id), torneo.fechainiciotorneo, torneo.fechafintorneo
+    )
+    partidos = []
+    for llave in llaves.values():
+        local, visitante = llave.idequipolocal_id, llave.idequipovisitante_id
+        if local and visitante:
+            fecha = reservar_horario(
+                ocupados,
+                local,
+                visitante,
+                fecha_ronda(torneo, llave.ronda, rondas),
+                torneo.fechafintorneo,
+            )
+            llave.idpartido = Partido(
+                fechapartido=fecha,
+                idequipolocal=por_id[local],
+                idequipovisitante=por_id[visitante],
+                idtorneo=torneo,
+                idtemporada=torneo.idtemporada,
+            )
+            partidos.append(llave.idpartido)
+
+    with transaction.atomic():
+        crear_lote(partidos)
+        invalidar_respuestas(Llave)
+        return Llave.objects.bulk_create(llaves.values())
+
+
+def avanzar_llave(partido):
+    """
+    Lleva al ganador de ``partido`` a la casilla siguiente de su cuadro.
+
+    Cuando la casilla siguiente queda con ambos equipos se crea su partido. Si
+    el resultado cambia y el partido siguiente aún no tiene marcador, se
+    corrige el equipo. Se llama desde post_save de Partido (ver signals.py).
+
+    Lanza SinHorario si el partido siguiente no cabe en el torneo y
+    CuadroJugado si cambia el ganador cuando el partido siguiente ya tiene
+    marcador: en ambos casos el guardado que lo disparó se revierte con su
+    transacción en lugar de dejar el cuadro a medias o contradictorio.
+    """
+    equipo = ganador(partido)
+    if equipo is None:
+        return
+    llave = Llave.objects.filter(idpartido=partido).first()
+    if llave is None:
+        return
+    rondas = total_rondas(
+        2 * Llave.objects.filter(idtorneo=llave.idtorneo_id, ronda=1).count()
+    )
+    if llave.ronda >= rondas:
+        return
+
+    with transaction.atomic():
+        siguiente = (
+            Llave.objects.select_for_update(of=("self",))
+            .select_related("idpartido", "idtorneo__idtemporada")
+            .get(
+                idtorneo=llave.idtorneo_id,
+                ronda=llave.ronda + 1,
+                posicion=llave.posicion // 2,
+            )
+        )
+        lado = f"{_lado(llave.posicion)}_id"
+        proximo = siguiente.idpartido
+        if (
+            proximo is not None
+            and proximo.marcadorequipolocal is not None
+            and getattr(siguiente, lado) != equipo
+        ):
+            raise CuadroJugado(siguiente)
+        setattr(siguiente, lado, equipo)
+        if proximo is not None:
+            if proximo.marcadorequipolocal is None and (
+                proximo.idequipolocal_id,
+                proximo.idequipovisitante_id,
+            ) != (siguiente.idequipolocal_id, siguiente.idequipovisitante_id):
+                proximo.idequipolocal_id = siguiente.idequipolocal_id
+                proximo.idequipovisitante_id = siguiente.idequipovisitante_id
+                proximo.save()
+        elif siguiente.idequipolocal_id and siguiente.idequipovisitante_id:
+            siguiente.idpartido = _crear_partido_siguiente(siguiente, partido, rondas)
+        siguiente.save()
+
+
+def avanzar_llaves(partidos):
+    """
+    avanzar_llave para varios partidos: las casillas de los que tienen ganador
+    se buscan con una sola consulta y solo esos avanzan.
+    """
+    jugados = [partido for partido in partidos if ganador(partido) is not None]
+    if not jugados:
+        return
+    en_cuadro = set(
+        Llave.objects.filter(idpartido__in=jugados).values_list("idpartido", flat=True)
+    )
+    for partido in jugados:
+        if partido.pk in en_cuadro:
+            avanzar_llave(partido)
+
+
+def _crear_partido_siguiente(llave, anterior, rondas):
+    """
+    Crea el partido de ``llave`` en la fecha de su ronda, o después del partido
+    anterior si este terminó más tarde. Lanza SinHorario si no cabe en el torneo.
+    """
+    torneo = llave.idtorneo
+    local, visitante = llave.idequipolocal_id, llave.idequipovisitante_id
+    fecha = max(
+        fecha_ronda(torneo, llave.ronda, rondas),
+        anterior.fechapartido + DESPLAZAMIENTO,
+    )
+    ocupados = horarios_ocupados([local, visitante], fecha, torneo.fechafintorneo)
+    try:
+        fecha = reservar_horario(ocupados, local, visitante, fecha, torneo.fechafintorneo)
+    except ValueError as e:
+        raise SinHorario(llave) from e
+    return Partido.objects.create(
+        fechapartido=fecha,
+        idequipolocal_id=local,
+        idequipovisitante_id=visitante,
+        idtorneo=torneo,
+        idtemporada=torneo.idtemporada,
+    )
@@ -0,0 +1,68 @@
+from django.db import router, transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+from django.shortcuts import get_object_or_404
+
+from torneo.models import Partido
+
+LADOS = (
+    ("marcadorequipolocal", "sumarlocal"),
+    ("marcadorequipovisitante", "sumarvisitante"),
+)
+
+
+class VersionDesactualizada(Exception):
+    """La versión enviada ya no es la del partido: otro la modificó antes."""
+
+    def __init__(self, partido):
+        super().__init__("El partido fue modificado por otra petición")
+        self.partido = partido
+
+
+def actualizar_marcador(pk, datos):
+    """
+    Aplica un cambio de marcador ya validado (ver MarcadorSerializer) con un
+    solo UPDATE condicional, sin pasar por la validación completa del partido.
+
+    Cada lado se fija a un valor (``marcadorequipo...``) o se incrementa en la
+    base (``sumar...``: SET marcador = COALESCE(marcador, 0) + n). Si se envía
+    ``version``, el UPDATE solo aplica si el partido sigue en esa versión; si
+    no, lanza VersionDesactualizada y no se guarda nada.
+
+    Devuelve el partido con los valores nuevos. Lanza Http404 si no existe.
+    Como queryset.update() no envía señales, post_save se envía a mano para
+    actualizar posiciones, ratings, llaves y estadísticas igual que al guardar
+    el partido.
+    """
+    with transaction.atomic():
+        partido = get_object_or_404(Partido.objects.select_for_update(), pk=pk)
+        version = datos.get("version")
+        if version is not None and version != partido.version:
+            raise VersionDesactualizada(partido)
+
+        cambios = {}
+        for campo, sumar in LADOS:
+            if campo in datos:
+                cambios[campo] = datos[campo]
+                setattr(partido, campo, datos[campo])
+            elif sumar in datos:
+                cambios[campo] = Coalesce(F(campo), 0) + datos[sumar]
+                setattr(partido, campo, (getattr(partido, campo) or 0) + datos[sumar])
+
+        filas = Partido.objects.filter(pk=pk)
+        if version is not None:
+            filas = filas.filter(version=version)
+        if not filas.update(version=F("version") + 1, **cambios):
+            raise VersionDesactualizada(Partido.objects.get(pk=pk))
+        partido.version += 1
+
+        post_save.send(
+            sender=Partido,
+            instance=partido,
+            created=False,
+            update_fields=frozenset([*cambios, "version"]),
+            raw=False,
+            using=router.db_for_write(Partido),
+        )
+    return partido
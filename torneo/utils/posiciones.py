@@ -0,0 +1,144 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from torneo.models import Partido, Posicion
+from torneo.utils.cache_vistas import invalidar_respuestas
+
+PUNTOS_VICTORIA = 3
+PUNTOS_EMPATE = 1
+LARGO_FORMA = 5
+
+
+def _aporte(favor, contra):
+    """Lo que suma a la fila de un equipo un partido con ese marcador."""
+    return {
+        "puntos": (
+            PUNTOS_VICTORIA if favor > contra else PUNTOS_EMPATE if favor == contra else 0
+        ),
+        "partidosjugados": 1,
+        "partidosganados": int(favor > contra),
+        "partidosempatados": int(favor == contra),
+        "partidosperdidos": int(favor < contra),
+        "golesfavor": favor,
+        "golescontra": contra,
+        "diferenciagoles": favor - contra,
+    }
+
+
+def _letra(favor, contra):
+    return "G" if favor > contra else "E" if favor == contra else "P"
+
+
+def aportes(resultado):
+    """
+    Aportes de un resultado (ver Partido.resultado) a la tabla: una lista de
+    (torneo, equipo, aporte). Vacía si el partido no tiene ambos marcadores.
+    """
+    if resultado is None:
+        return []
+    torneo, local, visitante, goles_local, goles_visitante = resultado
+    if goles_local is None or goles_visitante is None:
+        return []
+    return [
+        (torneo, local, _aporte(goles_local, goles_visitante)),
+        (torneo, visitante, _aporte(goles_visitante, goles_local)),
+    ]
+
+
+def forma(torneo, equipo):
+    """Últimos resultados del equipo en el torneo, del más antiguo al más reciente."""
+    ultimos = (
+        Partido.objects.filter(
+            Q(idequipolocal=equipo) | Q(idequipovisitante=equipo),
+            idtorneo=torneo,
+            marcadorequipolocal__isnull=False,
+            marcadorequipovisitante__isnull=False,
+        )
+        .order_by("-fechapartido", "-idpartido")
+        .values_list("idequipolocal", "marcadorequipolocal", "marcadorequipovisitante")[
+            :LARGO_FORMA
+        ]
+    )
+    letras = [
+        _letra(gl, gv) if local == equipo else _letra(gv, gl)
+        for local, gl, gv in ultimos
+    ]
+    return "".join(reversed(letras))
+
+
+def registrar_resultados(cambios):
+    """
+    Aplica a la tabla de posiciones una serie de cambios (anterior, nuevo) de
+    resultados de partidos (None si el partido no existía o ya no existe).
+
+    Solo se tocan las filas de los equipos afectados: a cada una se le suma la
+    diferencia neta con un UPDATE ... SET campo = campo + n y se recalcula su
+    forma a partir de sus últimos partidos.
+    """
+    deltas = defaultdict(Counter)
+    for anterior, nuevo in cambios:
+        if anterior == nuevo:
+            continue
+        for torneo, equipo, aporte in aportes(anterior):
+            deltas[(torneo, equipo)].subtract(aporte)
+        for torneo, equipo, aporte in aportes(nuevo):
+            deltas[(torneo, equipo)].update(aporte)
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        Posicion.objects.bulk_create(
+            [Posicion(idtorneo_id=torneo, idequipo_id=equipo) for torneo, equipo in deltas],
+            ignore_conflicts=True,
+        )
+        for (torneo, equipo), delta in deltas.items():
+            valores = {campo: F(campo) + n for campo, n in delta.items() if n}
+            Posicion.objects.filter(idtorneo_id=torneo, idequipo_id=equipo).update(
+                forma=forma(torneo, equipo), **valores
+            )
+
+
+def recalcular_posiciones(torneos=None):
+    """
+    Reconstruye desde cero la tabla de posiciones de los torneos dados (o de
+    todos). Sirve para la carga inicial y para corregir desvíos. Invalida las
+    respuestas que dependen de Posicion.
+    """
+    partidos = Partido.objects.filter(
+        marcadorequipolocal__isnull=False, marcadorequipovisitante__isnull=False
+    )
+    filas = Posicion.objects.all()
+    if torneos is not None:
+        partidos = partidos.filter(idtorneo__in=torneos)
+        filas = filas.filter(idtorneo__in=torneos)
+
+    totales = defaultdict(Counter)
+    formas = defaultdict(str)
+    resultados = partidos.order_by("fechapartido", "idpartido").values_list(
+        *(campo.removesuffix("_id") for campo in Partido.CAMPOS_RESULTADO)
+    )
+    for resultado in resultados.iterator(chunk_size=2000):
+        for torneo, equipo, aporte in aportes(resultado):
+            totales[(torneo, equipo)].update(aporte)
+            favor, contra = aporte["golesfavor"], aporte["golescontra"]
+            letras = formas[(torneo, equipo)] + _letra(favor, contra)
+            formas[(torneo, equipo)] = letras[-LARGO_FORMA:]
+
+    with transaction.atomic():
+        filas.delete()
+        Posicion.objects.bulk_create(
+            [
+                Posicion(
+                    idtorneo_id=torneo,
+                    idequipo_id=equipo,
+                    forma=formas[(torneo, equipo)],
+                    **total,
+                )
+                for (torneo, equipo), total in totales.items()
+            ],
+            batch_size=500,
+        )
+        invalidar_respuestas(Posicion)
+    return len(totales)
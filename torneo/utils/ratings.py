@@ -0,0 +1,209 @@
+import heapq
+
+from django.db import transaction
+from django.db.models import Q
+
+from torneo.models import Partido, Rating
+from torneo.utils.cache_vistas import invalidar_respuestas
+
+RATING_INICIAL = 1500.0
+FACTOR_K = 20
+# Puntos que se suman al local al calcular el resultado esperado.
+VENTAJA_LOCAL = 100
+DECIMALES = 2
+LOTE = 2000
+
+# Columnas de un partido que usa el motor, en este orden.
+CAMPOS = (
+    "idpartido",
+    "fechapartido",
+    "idequipolocal",
+    "idequipovisitante",
+    "marcadorequipolocal",
+    "marcadorequipovisitante",
+)
+
+
+def esperado(rating, rival):
+    """Puntos esperados (0 a 1) de un equipo con ``rating`` contra ``rival``."""
+    return 1 / (1 + 10 ** ((rival - rating) / 400))
+
+
+def variacion(rating_local, rating_visitante, goles_local, goles_visitante):
+    """Lo que gana el local (y pierde el visitante) con ese marcador."""
+    resultado = (
+        1.0 if goles_local > goles_visitante else 0.5 if goles_local == goles_visitante else 0.0
+    )
+    previsto = esperado(rating_local + VENTAJA_LOCAL, rating_visitante)
+    return round(FACTOR_K * (resultado - previsto), DECIMALES)
+
+
+def jugar(ratings, partido):
+    """
+    Aplica un partido (tupla con ``CAMPOS``) a ``ratings`` ({equipo: rating})
+    y devuelve las dos filas de Rating que resultan, sin guardar.
+
+    Los ratings se redondean en cada paso, así que repetir la historia desde
+    cualquier punto guardado da exactamente los mismos valores.
+    """
+    idpartido, fecha, local, visitante, goles_local, goles_visitante = partido
+    rating_local = ratings.get(local, RATING_INICIAL)
+    rating_visitante = ratings.get(visitante, RATING_INICIAL)
+    cambio = variacion(rating_local, rating_visitante, goles_local, goles_visitante)
+    ratings[local] = round(rating_local + cambio, DECIMALES)
+    ratings[visitante] = round(rating_visitante - cambio, DECIMALES)
+    return [
+        Rating(
+            idequipo_id=equipo,
+            idpartido_id=idpartido,
+            fechapartido=fecha,
+            rating=ratings[equipo],
+            variacion=delta,
+        )
+        for equipo, delta in ((local, cambio), (visitante, -cambio))
+    ]
+
+
+def _jugados():
+    return Partido.objects.filter(
+        marcadorequipolocal__isnull=False, marcadorequipovisitante__isnull=False
+    )
+
+
+def _desde(clave, inclusive):
+    """Filtro de lo posterior a ``clave`` = (fecha, idpartido) en ese orden."""
+    fecha, idpartido = clave
+    lookup = "idpartido__gte" if inclusive else "idpartido__gt"
+    return Q(fechapartido__gt=fecha) | Q(fechapartido=fecha, **{lookup: idpartido})
+
+
+def rating_antes(equipo, clave):
+    """Rating del equipo justo antes de ``clave``, o el inicial si no jugó antes."""
+    rating = (
+        Rating.objects.filter(idequipo=equipo)
+        .exclude(_desde(clave, inclusive=True))
+        .order_by("-fechapartido", "-idpartido")
+        .values_list("rating", flat=True)
+        .first()
+    )
+    return RATING_INICIAL if rating is None else rating
+
+
+def reconstruir_ratings():
+    """
+    Borra todos los ratings y repite la historia completa: recorre los partidos
+    jugados en orden (fechapartido, idpartido) en un solo pase y guarda las
+    filas por lotes. Devuelve la cantidad de partidos procesados.
+
+    Como no pasa por las señales, invalida aquí las respuestas que dependen
+    de Rating.
+    """
+    ratings = {}
+    filas = []
+    total = 0
+    partidos = _jugados().order_by("fechapartido", "idpartido").values_list(*CAMPOS)
+    with transaction.atomic():
+        Rating.objects.all().delete()
+        for partido in partidos.iterator(chunk_size=LOTE):
+            filas += jugar(ratings, partido)
+            total += 1
+            if len(filas) >= LOTE:
+                Rating.objects.bulk_create(filas)
+                filas = []
+        Rating.objects.bulk_create(filas)
+        invalidar_respuestas(Rating)
+    return total
+
+
+def actualizar_ratings(desde, equipos):
+    """
+    Recalcula los ratings que cambian cuando se modifica la historia de
+    ``equipos`` a partir de ``desde`` = (fecha, idpartido), inclusive.
+
+    No se repite toda la historia: se recorren en orden solo los partidos
+    jugados de los equipos afectados, y un rival pasa a estar afectado desde
+    el primer partido contra uno de ellos. Cada equipo parte de su último
+    rating guardado antes de ese punto. Si el partido modificado es el último
+    de sus equipos, son dos consultas por equipo y dos filas nuevas.
+    """
+    ratings = {}
+    pendientes = []
+    vistos = set()
+
+    def afectar(equipo, clave, inclusive):
+        ratings[equipo] = rating_antes(equipo, clave)
+        partidos = (
+            _jugados()
+            .filter(Q(idequipolocal=equipo) | Q(idequipovisitante=equipo))
+            .filter(_desde(clave, inclusive))
+            .values_list(*CAMPOS)
+        )
+        for partido in partidos:
+            if partido[0] not in vistos:
+                vistos.add(partido[0])
+                heapq.heappush(pendientes, (partido[1], partido[0], partido))
+
+    for equipo in equipos:
+        afectar(equipo, desde, inclusive=True)
+
+    filas = []
+    recalculados = []
+    while pendientes:
+        fecha, idpartido, partido = heapq.heappop(pendientes)
+        for equipo in partido[2:4]:
+            if equipo not in ratings:
+                afectar(equipo, (fecha, idpartido), inclusive=False)
+        filas += jugar(ratings, partido)
+        recalculados.append(idpartido)
+
+    with transaction.atomic():
+        Rating.objects.filter(idpartido__in=recalculados).delete()
+        Rating.objects.bulk_create(filas, batch_size=500)
+
+
+def registrar_partido(partido, resultado_cambiado=True):
+    """
+    Actualiza los ratings después de guardar ``partido``. No hace nada si no
+    cambió el resultado ni la fecha. Si cambiaron, se recalcula desde la
+    posición más temprana del partido (la anterior o la nueva) para sus
+    equipos de antes y de ahora.
+    """
+    anteriores = list(
+        Rating.objects.filter(idpartido=partido.pk).values_list("idequipo", "fechapartido")
+    )
+    jugado = (
+        partido.marcadorequipolocal is not None
+        and partido.marcadorequipovisitante is not None
+    )
+    if not anteriores and not jugado:
+        return
+    if (
+        anteriores
+        and not resultado_cambiado
+        and anteriores[0][1] == partido.fechapartido
+    ):
+        return
+
+    claves = [(partido.fechapartido, partido.pk)]
+    claves += [(fecha, partido.pk) for _, fecha in anteriores]
+    equipos = {partido.idequipolocal_id, partido.idequipovisitante_id}
+    equipos |= {equipo for equipo, _ in anteriores}
+    with transaction.atomic():
+        Rating.objects.filter(idpartido=partido.pk).delete()
+        actualizar_ratings(min(claves), equipos)
+
+
+def registrar_lote(partidos):
+    """Actualiza los ratings después de insertar ``partidos`` de una vez."""
+    jugados = [
+        partido
+        for partido in partidos
+        if partido.marcadorequipolocal is not None
+        and partido.marcadorequipovisitante is not None
+    ]
+    if not jugados:
+        return
+    desde = min((partido.fechapartido, partido.pk) for partido in jugados)
+    equipos = {partido.idequipolocal_id for partido in jugados}
+    equipos |= {partido.idequipovisitante_id for partido in jugados}
+    actualizar_ratings(desde, equipos)
@@ -1,4 +1,5 @@
-from typing import Any
+from typing import Any, Optional
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
 
@@ -14,6 +15,14 @@ def error_response(message: str, data: Any, status) -> Response:
     )
 
 
+def render_as_json(response: Response) -> Response:
+    # Para vistas de Django que no son de DRF: nadie elige el renderer.
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = "application/json"
+    response.renderer_context = {}
+    return response
+
+
 def pagination_response(
     data: Any, page: int, offset: int, pages: int, total_items: int, status
 ) -> Response:
@@ -27,3 +36,23 @@ def pagination_response(
         },
         status=status,
     )
+
+
+def cursor_pagination_response(
+    data: Any,
+    offset: int,
+    next_cursor: Optional[str],
+    previous_cursor: Optional[str],
+    total_items: Optional[int],
+    status,
+) -> Response:
+    return Response(
+        data={
+            "count": total_items,
+            "offset": offset,
+            "next": next_cursor,
+            "previous": previous_cursor,
+            "results": data,
+        },
+        status=status,
+    )
@@ -0,0 +1,65 @@
+import unicodedata
+
+from django.db import connection
+
+
+def normalizar(texto):
+    """Pasa el texto a minúsculas y sin tildes ni diacríticos: "Águilas" -> "aguilas"."""
+    descompuesto = unicodedata.normalize("NFKD", texto or "")
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(sin_tildes.casefold().split())
+
+
+def documento_partido(partido):
+    """
+    Documento de búsqueda desnormalizado de un partido: los nombres de ambos
+    equipos, el torneo y la temporada, normalizados y en una sola columna.
+    """
+    return normalizar(
+        " ".join(
+            (
+                partido.idequipolocal.nombreequipo,
+                partido.idequipovisitante.nombreequipo,
+                partido.idtorneo.nombretorneo,
+                partido.idtemporada.nombretemporada,
+            )
+        )
+    )
+
+
+def actualizar_documentos(partidos):
+    """Recalcula el documento de búsqueda de los partidos dados."""
+    from torneo.models import Partido
+
+    partidos = partidos.select_related(
+        "idequipolocal", "idequipovisitante", "idtorneo", "idtemporada"
+    )
+    cambiados = []
+    for partido in partidos.iterator(chunk_size=500):
+        documento = documento_partido(partido)
+        if documento != partido.documentobusqueda:
+            partido.documentobusqueda = documento
+            cambiados.append(partido)
+    Partido.objects.bulk_update(cambiados, ["documentobusqueda"], batch_size=500)
+
+
+def buscar_partidos(partidos, termino):
+    """
+    Filtra los partidos cuyo documento contiene todas las palabras del término.
+
+    La búsqueda es sobre una sola columna, sin JOINs. En PostgreSQL esa columna
+    tiene un índice GIN de trigramas (pg_trgm), que sirve para LIKE '%x%', y los
+    resultados se ordenan por similitud de palabras con el término. En otros
+    motores se filtra igual y se ordena por idpartido.
+    """
+    termino = normalizar(termino)
+    for palabra in termino.split():
+        partidos = partidos.filter(documentobusqueda__contains=palabra)
+
+    if termino and connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        return partidos.annotate(
+            rango=TrigramWordSimilarity(termino, "documentobusqueda")
+        ).order_by("-rango", "idpartido")
+    return partidos.order_by("idpartido")
@@ -0,0 +1,128 @@
+from django.db import connections, router, transaction
+from django.db.models import Max
+
+from torneo.models import Cambio, Equipo, Institucion, Partido, Temporada, Torneo
+
+# Entidades que sincronizan los clientes, en el orden en que se cargan por
+# primera vez (las referenciadas antes que las que las referencian).
+ENTIDADES = {
+    "institucion": Institucion,
+    "temporada": Temporada,
+    "torneo": Torneo,
+    "equipo": Equipo,
+    "partido": Partido,
+}
+ENTIDAD_DE = {modelo: entidad for entidad, modelo in ENTIDADES.items()}
+# Columnas internas que no se envían.
+OMITIDOS = {"documentobusqueda"}
+# Clave del advisory lock de PostgreSQL entre las escrituras del registro
+# (compartido) y la lectura de la última versión confirmada (exclusivo).
+BLOQUEO = 2020
+
+
+def campos(modelo):
+    """Columnas de ``modelo`` que se envían; las claves foráneas van como id."""
+    return [
+        campo.name for campo in modelo._meta.concrete_fields if campo.name not in OMITIDOS
+    ]
+
+
+def _bloquear(using, exclusivo=False):
+    """
+    En PostgreSQL los valores de una secuencia se reparten al insertar pero se
+    hacen visibles al confirmar, en cualquier orden: un cliente podría leer la
+    versión 11 antes de que se confirme la 10 y no verla nunca.
+
+    Cada escritura toma el lock compartido hasta el final de su transacción,
+    así que las escrituras no se esperan entre sí. La lectura lo toma
+    exclusivo solo para fijar hasta qué versión leer (ver
+    _ultima_confirmada): espera a que terminen las escrituras en curso, no a
+    las que empiezan después. SQLite ya serializa las escrituras.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        funcion = "pg_advisory_xact_lock" if exclusivo else "pg_advisory_xact_lock_shared"
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT {funcion}(%s)", [BLOQUEO])
+
+
+def _ultima_confirmada():
+    """
+    Versión más alta por debajo de la cual no queda ninguna escritura sin
+    confirmar: las versiones que se repartan después son mayores.
+    """
+    using = router.db_for_read(Cambio)
+    with transaction.atomic(using=using):
+        _bloquear(using, exclusivo=True)
+        return Cambio.objects.using(using).aggregate(ultima=Max("idcambio"))["ultima"]
+
+
+def registrar_cambios(entidad, ids, eliminado=False, nuevos=False):
+    """
+    Asigna una versión nueva a los objetos ``ids`` de ``entidad``. Con
+    ``nuevos`` (objetos recién creados) no se busca la versión anterior.
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    using = router.db_for_write(Cambio)
+    with transaction.atomic(using=using, savepoint=False):
+        _bloquear(using)
+        if not nuevos:
+            Cambio.objects.filter(entidad=entidad, idobjeto__in=ids).delete()
+        Cambio.objects.bulk_create(
+            [Cambio(entidad=entidad, idobjeto=i, eliminado=eliminado) for i in ids],
+            batch_size=500,
+        )
+
+
+def cambios_desde(version, limite):
+    """
+    Cambios posteriores a ``version``, del más antiguo al más reciente, como
+    (cambios, version, mas). Cada cambio es {"entidad", "id", "version",
+    "eliminado", "datos"}; ``datos`` tiene las columnas de la fila o None si
+    se borró. ``version`` es la que el cliente envía en la siguiente petición
+    y ``mas`` indica si quedaron cambios fuera por ``limite``.
+
+    Es una consulta para fijar la última versión confirmada, otra sobre el
+    registro y una por entidad con cambios.
+    """
+    ultima = _ultima_confirmada()
+    if ultima is None or ultima <= version:
+        return [], version, False
+    filas = list(
+        Cambio.objects.filter(idcambio__gt=version, idcambio__lte=ultima)
+        .order_by("idcambio")
+        .values_list("idcambio", "entidad", "idobjeto", "eliminado")[: limite + 1]
+    )
+    mas = len(filas) > limite
+    filas = filas[:limite]
+
+    pendientes = {}
+    for _, entidad, idobjeto, eliminado in filas:
+        if not eliminado:
+            pendientes.setdefault(entidad, []).append(idobjeto)
+    datos = {}
+    for entidad, ids in pendientes.items():
+        modelo = ENTIDADES[entidad]
+        pk = modelo._meta.pk.name
+        for fila in modelo.objects.filter(pk__in=ids).values(*campos(modelo)):
+            datos[(entidad, fila[pk])] = fila
+
+    cambios = []
+    for idcambio, entidad, idobjeto, eliminado in filas:
+        fila = None if eliminado else datos.get((entidad, idobjeto))
+        if not eliminado and fila is None:
+            # Se borró después de leer el registro: su baja tiene una versión
+            # mayor y llega en la próxima sincronización.
+            continue
+        cambios.append(
+            {
+                "entidad": entidad,
+                "id": idobjeto,
+                "version": idcambio,
+                "eliminado": eliminado,
+                "datos": fila,
+            }
+        )
+    return cambios, filas[-1][0] if filas else version, mas
@@ -0,0 +1,129 @@
+import hashlib
+import io
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers
+from PIL import Image, ImageFile
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import FileUploadParser
+
+# Bytes que se analizan como máximo para encontrar la cabecera de la imagen.
+_CABECERA_MAX = 64 * 1024
+# Margen para los demás campos de un formulario multipart.
+_MARGEN_FORMULARIO = 64 * 1024
+
+
+class ImagenSubida(TemporaryUploadedFile):
+    """Archivo temporal de una imagen con su hash y dimensiones ya calculados."""
+
+    hashimagen = None
+    ancho = None
+    alto = None
+
+
+class ImagenUploadHandler(FileUploadHandler):
+    """
+    Recibe imágenes por bloques directamente a un archivo temporal.
+
+    Mientras llegan los bloques se calcula el SHA-256, se controla el tamaño
+    máximo (IMAGENES_TAMANO_MAX) y, en cuanto se ha recibido la cabecera, se
+    validan el formato y las dimensiones (IMAGENES_DIMENSION_MAX). Una subida
+    inválida se corta sin esperar al resto del cuerpo.
+    """
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        limite = settings.IMAGENES_TAMANO_MAX
+        if boundary:
+            limite += _MARGEN_FORMULARIO
+        if content_length and content_length > limite:
+            raise ParseError(_mensaje_tamano())
+        return None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.file = ImagenSubida(self.file_name, self.content_type, 0, self.charset)
+        self.hash = hashlib.sha256()
+        self.parser = ImageFile.Parser()
+        self.cabecera_leida = 0
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.IMAGENES_TAMANO_MAX:
+            raise ParseError(_mensaje_tamano())
+        if self.parser is not None:
+            self._validar_cabecera(raw_data)
+        self.hash.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if self.parser is not None:
+            raise ParseError("El archivo no es una imagen válida.")
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.hashimagen = self.hash.hexdigest()
+        return self.file
+
+    def _validar_cabecera(self, raw_data):
+        self.cabecera_leida += len(raw_data)
+        try:
+            self.parser.feed(raw_data)
+        except Exception:
+            raise ParseError("El archivo no es una imagen válida.")
+        imagen = self.parser.image
+        if imagen is None:
+            if self.cabecera_leida > _CABECERA_MAX:
+                raise ParseError("El archivo no es una imagen válida.")
+            return
+        try:
+            validar_dimensiones(*imagen.size)
+        except ValueError as e:
+            raise ParseError(str(e))
+        self.file.ancho, self.file.alto = imagen.size
+        self.file.content_type = Image.MIME.get(imagen.format, self.content_type)
+        # Con la cabecera basta: no se decodifica el resto de la imagen.
+        self.parser = None
+
+
+class ImagenOctetStreamParser(FileUploadParser):
+    """
+    Acepta el cuerpo de la petición como los bytes de la imagen
+    (Content-Type: application/octet-stream). No exige Content-Disposition.
+    """
+
+    media_type = "application/octet-stream"
+
+    def get_filename(self, stream, media_type, parser_context):
+        return super().get_filename(stream, media_type, parser_context) or "imagen"
+
+
+def validar_dimensiones(ancho, alto):
+    """Lanza ValueError si la imagen supera IMAGENES_DIMENSION_MAX."""
+    maximo = settings.IMAGENES_DIMENSION_MAX
+    if ancho > maximo or alto > maximo:
+        raise ValueError(
+            f"La imagen no puede superar {maximo}x{maximo} píxeles ({ancho}x{alto})."
+        )
+
+
+def validar_imagen(datos):
+    """
+    Valida tamaño, formato y dimensiones de una imagen ya recibida en memoria
+    (subidas en base64). Solo se lee la cabecera. Lanza ValueError.
+    """
+    if len(datos) > settings.IMAGENES_TAMANO_MAX:
+        raise ValueError(_mensaje_tamano())
+    try:
+        with Image.open(io.BytesIO(datos)) as imagen:
+            ancho, alto = imagen.size
+    except Exception:
+        raise ValueError("El archivo no es una imagen válida.")
+    validar_dimensiones(ancho, alto)
+
+
+def _mensaje_tamano():
+    maximo = settings.IMAGENES_TAMANO_MAX / (1024 * 1024)
+    return f"La imagen no puede superar {maximo:g} MB."
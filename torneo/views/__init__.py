@@ -1,4 +1,7 @@
-from .pagination import paginate_queryset as paginate_queryset
+from .pagination import (
+    paginate_queryset as paginate_queryset,
+    apply_select_related as apply_select_related,
+)
 from .equipo_view import (
     EquipoListCreateView as EquipoListCreateView,
     EquipoDetailView as EquipoDetailView,
@@ -6,6 +9,7 @@ from .equipo_view import (
     EquipoAllView as EquipoAllView,
     EquipoUpdateView as EquipoUpdateView,
     EquipoDeleteView as EquipoDeleteView,
+    EquipoImagenView as EquipoImagenView,
 )
 from .institucion_view import (
     InstitucionListCreateView as InstitucionListCreateView,
@@ -22,6 +26,8 @@ from .partido_view import (
     PartidoDeleteView as PartidoDeleteView,
     PartidoSearchView as PartidoSearchView,
     PartidoByTemporadas as PartidoByTemporadas,
+    PartidoBulkCreateView as PartidoBulkCreateView,
+    PartidoMarcadorView as PartidoMarcadorView,
 )
 from .torneo_view import (
     TorneoListCreateView as TorneoListCreateView,
@@ -37,3 +43,18 @@ from .temporada_view import (
     TemporadaUpdateView as TemporadaUpdateView,
     TemporadaDeleteView as TemporadaDeleteView,
 )
+from .autocompletar_view import AutocompletarView as AutocompletarView
+from .fixture_view import TorneoFixtureView as TorneoFixtureView
+from .llave_view import TorneoLlavesView as TorneoLlavesView
+from .posicion_view import TorneoPosicionesView as TorneoPosicionesView
+from .estadisticas_view import (
+    EquipoEstadisticasView as EquipoEstadisticasView,
+    EquipoEnfrentamientoView as EquipoEnfrentamientoView,
+)
+from .rating_view import (
+    RatingListView as RatingListView,
+    EquipoRatingsView as EquipoRatingsView,
+)
+from .eventos_view import EventosView as EventosView
+from .sincronizacion_view import SincronizacionView as SincronizacionView
+from .cache_view import CacheRespuestasView as CacheRespuestasView
@@ -0,0 +1,50 @@
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Equipo, Institucion, Torneo
+from torneo.utils.autocomplete import ENTIDADES, indice_autocompletado
+from torneo.utils.cache_vistas import get_condicional
+from torneo.utils.responses import error_response, success_response
+
+LIMITE_MAXIMO = 50
+
+
+class AutocompletarView(APIView):
+    @get_condicional(Equipo, Torneo, Institucion)
+    def get(self, request):
+        """
+        Sugiere nombres de equipos, torneos e instituciones que empiezan por el
+        texto escrito, sin distinguir mayúsculas ni tildes.
+
+        Parameters:
+        - q (str): Texto escrito por el usuario.
+        - tipo (str, opcional): equipo, torneo o institucion; se puede repetir.
+        - limite (int, opcional): Máximo de sugerencias (10 por defecto, hasta 50).
+
+        Returns:
+        - response (dict): Lista de sugerencias {tipo, id, nombre}.
+        """
+        try:
+            texto = request.query_params.get("q", "")
+            tipos = set(request.query_params.getlist("tipo"))
+            try:
+                limite = int(request.query_params.get("limite", 10))
+            except ValueError:
+                limite = 0
+            if tipos - set(ENTIDADES) or not 1 <= limite <= LIMITE_MAXIMO:
+                return error_response(
+                    message="Parámetros inválidos",
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            sugerencias = indice_autocompletado.buscar(texto, tipos, limite)
+            return success_response(
+                message="Sugerencias encontradas",
+                data=sugerencias,
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
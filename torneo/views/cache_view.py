@@ -0,0 +1,24 @@
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.utils.cache_vistas import contadores
+from torneo.utils.responses import error_response, success_response
+
+
+class CacheRespuestasView(APIView):
+    def get(self, request):
+        """
+        Devuelve los aciertos, fallos, respuestas obsoletas y compartidas de
+        la caché de respuestas de este proceso, en total y por vista, desde
+        que arrancó.
+        """
+        try:
+            return success_response(
+                message="Uso de la caché de respuestas",
+                data=contadores.resumen(),
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -1,19 +1,49 @@
-from django.http import Http404
+from django.db.models import Exists, OuterRef
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.http import condition
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.views import APIView
 from rest_framework import status
 
-from torneo.models import Equipo
+from torneo.models import Equipo, Imagen, ImagenVariante, Institucion
 from torneo.serializers import EquipoSerializer
 from torneo.utils.format_serializer import format_serializer_errors
-from torneo.views import paginate_queryset
-from torneo.utils.responses import error_response, success_response
+from torneo.views import apply_select_related, paginate_queryset
+from torneo.utils.imagenes import TIPOS_FORMATO, elegir_tamano
+from torneo.utils.cache_vistas import cache_respuesta, get_condicional
+from torneo.utils.responses import error_response, render_as_json, success_response
+from torneo.utils.subidas import ImagenOctetStreamParser, ImagenUploadHandler
 
 
-class EquipoListCreateView(APIView):
+class ImagenUploadMixin:
+    """
+    Permite recibir la imagen del equipo como multipart/form-data (campo
+    'imagenequipo') o, al actualizar, como application/octet-stream, además del
+    JSON con base64. Los archivos se reciben por bloques con ImagenUploadHandler.
+    """
+
+    parser_classes = [JSONParser, MultiPartParser, FormParser]
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers = [ImagenUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def get_equipo_data(self, request):
+        if "file" in request.FILES and "imagenequipo" not in request.data:
+            return {"imagenequipo": request.FILES["file"]}
+        return request.data
+
+
+class EquipoListCreateView(ImagenUploadMixin, APIView):
     def post(self, request):
         """
-        Crea un nuevo equipo.
+        Crea un nuevo equipo. Acepta JSON (imagen en base64) o multipart/form-data
+        (imagen como archivo en el campo 'imagenequipo').
 
         Parameters:
         - request (dict): Contiene la informacion del equipo a crear.
@@ -23,7 +53,7 @@ class EquipoListCreateView(APIView):
         """
         try:
             serializer = EquipoSerializer(
-                data=request.data, context={"request": request}
+                data=self.get_equipo_data(request), context={"request": request}
             )
             if not serializer.is_valid():
                 return error_response(
@@ -38,6 +68,10 @@ class EquipoListCreateView(APIView):
                 status=status.HTTP_201_CREATED,
                 data=EquipoSerializer(equipo, context={"request": request}).data,
             )
+        except ParseError as e:
+            return error_response(
+                message=str(e.detail), data=None, status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return error_response(
                 message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -55,8 +89,11 @@ class EquipoDetailView(APIView):
         Returns:
         - equipo (Equipo): Equipo asociado con el pk.
         """
-        return Equipo.objects.filter(pk=pk).first()
+        return apply_select_related(
+            Equipo.objects.filter(pk=pk), EquipoSerializer
+        ).first()
 
+    @cache_respuesta(Institucion, fila=Equipo)
     def get(self, request, pk):
         try:
             equipo = self.get_object(pk)
@@ -68,7 +105,7 @@ class EquipoDetailView(APIView):
                 )
             return success_response(
                 message="Equipo encontrado",
-                data=EquipoSerializer(equipo).data,
+                data=EquipoSerializer(equipo, context={"request": request}).data,
                 status=status.HTTP_200_OK,
             )
         except Exception as e:
@@ -78,6 +115,7 @@ class EquipoDetailView(APIView):
 
 
 class EquipoSearchByNameView(APIView):
+    @get_condicional(Equipo, Institucion)
     def get(self, request, name):
         """
         Busca un equipo por su nombre.
@@ -90,7 +128,9 @@ class EquipoSearchByNameView(APIView):
         - response (dict): Contiene el mensaje de exito y el equipo encontrado.
         """
         try:
-            equipo = Equipo.objects.filter(nombreequipo=name).first()
+            equipo = apply_select_related(
+                Equipo.objects.filter(nombreequipo=name), EquipoSerializer
+            ).first()
             if not equipo:
                 return error_response(
                     message="Equipo no encontrado",
@@ -99,7 +139,7 @@ class EquipoSearchByNameView(APIView):
                 )
             return success_response(
                 message="Equipo encontrado",
-                data=EquipoSerializer(equipo).data,
+                data=EquipoSerializer(equipo, context={"request": request}).data,
                 status=status.HTTP_200_OK,
             )
         except Exception as e:
@@ -109,6 +149,7 @@ class EquipoSearchByNameView(APIView):
 
 
 class EquipoAllView(APIView):
+    @cache_respuesta(Equipo, Institucion)
     def get(self, request):
         """
         Obtiene todos los equipos.
@@ -127,10 +168,13 @@ class EquipoAllView(APIView):
             )
 
 
-class EquipoUpdateView(APIView):
+class EquipoUpdateView(ImagenUploadMixin, APIView):
+    parser_classes = ImagenUploadMixin.parser_classes + [ImagenOctetStreamParser]
+
     def patch(self, request, pk):
         """
-        Actualiza un equipo existente.
+        Actualiza un equipo existente. Además de JSON y multipart/form-data acepta
+        application/octet-stream, cuyo cuerpo son los bytes de la nueva imagen.
 
         Parameters:
         - request (dict): Contiene la informacion del equipo a actualizar.
@@ -140,7 +184,9 @@ class EquipoUpdateView(APIView):
         - response (dict): Contiene el mensaje de exito y el equipo actualizado.
         """
         try:
-            equipo = Equipo.objects.filter(pk=pk).first()
+            equipo = apply_select_related(
+                Equipo.objects.filter(pk=pk), EquipoSerializer
+            ).first()
             if not equipo:
                 return error_response(
                     message="Equipo no encontrado",
@@ -149,7 +195,10 @@ class EquipoUpdateView(APIView):
                 )
 
             serializer = EquipoSerializer(
-                equipo, data=request.data, partial=True, context={"request": request}
+                equipo,
+                data=self.get_equipo_data(request),
+                partial=True,
+                context={"request": request},
             )
 
             if not serializer.is_valid():
@@ -165,6 +214,10 @@ class EquipoUpdateView(APIView):
                 data=serializer.data,
                 status=status.HTTP_200_OK,
             )
+        except ParseError as e:
+            return error_response(
+                message=str(e.detail), data=None, status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             return error_response(
                 message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -210,3 +263,138 @@ class EquipoDeleteView(APIView):
             return error_response(
                 message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+def _variante_solicitada(request):
+    """
+    Devuelve (tamaño, formato) de la variante pedida. El tamaño sale de ?size= y
+    el formato de la cabecera Accept (WebP si el cliente lo acepta). Un tamaño
+    None significa el original. Lanza ValueError si ?size= no es válido.
+    """
+    size = request.GET.get("size", "original")
+    tamano = None
+    if size != "original":
+        solicitado = int(size)
+        if solicitado < 1:
+            raise ValueError("Tamaño inválido")
+        tamano = elegir_tamano(solicitado)
+    formato = "webp" if "image/webp" in request.headers.get("Accept", "") else "png"
+    return tamano, formato
+
+
+def _resolver_imagen(request, pk):
+    """
+    Resuelve en una sola consulta el hash de la imagen y si ya existe la variante
+    pedida. El resultado se guarda en la petición para no repetir la consulta.
+    """
+    if not hasattr(request, "_imagen_resuelta"):
+        resuelta = None
+        try:
+            tamano, formato = _variante_solicitada(request)
+        except ValueError:
+            tamano = formato = None
+        else:
+            variante = ImagenVariante.objects.filter(
+                hashorigen=OuterRef("imagenhash"),
+                tamanovariante=tamano or 0,
+                formatovariante=formato,
+            )
+            fila = (
+                Equipo.objects.filter(pk=pk, imagenhash__isnull=False)
+                .annotate(tiene_variante=Exists(variante))
+                .values_list("imagenhash", "tiene_variante")
+                .first()
+            )
+            if fila:
+                imagenhash, tiene_variante = fila
+                if not (tamano and tiene_variante):
+                    tamano = None
+                resuelta = (imagenhash, tamano, formato)
+        request._imagen_resuelta = resuelta
+    return request._imagen_resuelta
+
+
+def _etag_imagen(request, pk):
+    """ETag de la imagen: su hash de contenido (y variante), sin leer el binario."""
+    resuelta = _resolver_imagen(request, pk)
+    if resuelta is None:
+        return None
+    imagenhash, tamano, formato = resuelta
+    return f"{imagenhash}-{tamano}-{formato}" if tamano else imagenhash
+
+
+@method_decorator(condition(etag_func=_etag_imagen), name="get")
+class EquipoImagenView(View):
+    def get(self, request, pk):
+        """
+        Devuelve los bytes de la imagen del equipo.
+
+        Con ?size=64|256 se sirve la miniatura correspondiente (en WebP si el
+        cliente lo acepta); sin ?size= el original. Si la miniatura aún no se ha
+        generado se sirve el original con una caché corta.
+
+        Las imágenes se guardan una sola vez por SHA-256, así que el ETag es
+        directamente ese hash y con If-None-Match se responde 304 sin tocar el
+        binario. Las URLs versionadas (?v=<hash>) que
+        genera el serializador se pueden cachear indefinidamente.
+
+        Los errores se responden en JSON, como en el resto de la API.
+        """
+        try:
+            solicitado, _ = _variante_solicitada(request)
+        except ValueError:
+            return render_as_json(
+                error_response(
+                    message="Tamaño de imagen inválido",
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            )
+
+        resuelta = _resolver_imagen(request, pk)
+        if resuelta is None:
+            return _imagen_no_encontrada()
+        imagenhash, tamano, formato = resuelta
+
+        if tamano:
+            datos = bytes(
+                ImagenVariante.objects.filter(
+                    hashorigen=imagenhash,
+                    tamanovariante=tamano,
+                    formatovariante=formato,
+                )
+                .values_list("datosvariante", flat=True)
+                .first()
+            )
+            content_type = TIPOS_FORMATO[formato]
+        else:
+            original = (
+                Imagen.objects.filter(pk=imagenhash)
+                .values_list("datosimagen", "tipoimagen")
+                .first()
+            )
+            if not original:
+                return _imagen_no_encontrada()
+            datos, content_type = bytes(original[0]), original[1]
+
+        response = HttpResponse(datos, content_type=content_type)
+        completa = tamano is not None or solicitado is None
+        _patch_cache_imagen(response, request, imagenhash, completa)
+        return response
+
+
+def _imagen_no_encontrada():
+    return render_as_json(
+        error_response(
+            message="Imagen no encontrada", data=None, status=status.HTTP_404_NOT_FOUND
+        )
+    )
+
+
+def _patch_cache_imagen(response, request, imagenhash, completa):
+    version = request.GET.get("v")
+    if completa and version and imagenhash.startswith(version):
+        patch_cache_control(response, public=True, max_age=31536000, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=300)
+    patch_vary_headers(response, ["Accept"])
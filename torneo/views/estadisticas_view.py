@@ -0,0 +1,114 @@
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Equipo, Partido, Temporada, Torneo
+from torneo.serializers import PartidoSerializer
+from torneo.views import apply_select_related
+from torneo.utils.estadisticas import (
+    enfrentamientos,
+    estadisticas_enfrentamiento,
+    estadisticas_equipo,
+)
+from torneo.utils.cache_vistas import get_condicional
+from torneo.utils.responses import error_response, success_response
+
+ULTIMOS_POR_DEFECTO = 10
+ULTIMOS_MAX = 50
+
+
+class EquipoEstadisticasView(APIView):
+    @get_condicional(Partido, Equipo)
+    def get(self, request, pk):
+        """
+        Devuelve las estadísticas del equipo (partidos jugados, ganados,
+        empatados y perdidos, goles a favor y en contra) en total, por
+        temporada y por torneo, cada una separada en local y visitante.
+
+        Se calculan con una sola consulta de agregación y quedan en la caché
+        hasta que cambia el marcador de algún partido del equipo (ver
+        utils/estadisticas.py).
+        """
+        try:
+            data = estadisticas_equipo(pk)
+            if not data["temporadas"] and not Equipo.objects.filter(pk=pk).exists():
+                return error_response(
+                    message="Equipo no encontrado",
+                    data=None,
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            return success_response(
+                message="Estadísticas del equipo",
+                data=data,
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class EquipoEnfrentamientoView(APIView):
+    @get_condicional(Partido, Equipo, Torneo, Temporada)
+    def get(self, request, pk, rival):
+        """
+        Devuelve el historial entre dos equipos: el resumen de resultados desde
+        el lado de ``pk`` (con el mismo formato que las estadísticas del equipo)
+        y sus últimos partidos jugados, del más reciente al más antiguo.
+
+        Parameters:
+        - ultimos (int, opcional): Cantidad de partidos a devolver (10 por
+          defecto, 50 como máximo).
+
+        Ambas consultas recorren solo el rango del par en
+        partido_enfrentamiento_idx (ver utils/estadisticas.py).
+        """
+        try:
+            try:
+                ultimos = int(request.query_params.get("ultimos", ULTIMOS_POR_DEFECTO))
+            except ValueError:
+                ultimos = 0
+            if not 1 <= ultimos <= ULTIMOS_MAX:
+                return error_response(
+                    message=f"'ultimos' debe estar entre 1 y {ULTIMOS_MAX}",
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if pk == rival:
+                return error_response(
+                    message="Un equipo no puede enfrentarse a sí mismo.",
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            resumen = estadisticas_enfrentamiento(pk, rival)
+            if (
+                not resumen["partidosjugados"]
+                and Equipo.objects.filter(pk__in=[pk, rival]).count() < 2
+            ):
+                return error_response(
+                    message="Equipo no encontrado",
+                    data=None,
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            partidos = apply_select_related(
+                enfrentamientos(pk, rival).filter(
+                    marcadorequipolocal__isnull=False,
+                    marcadorequipovisitante__isnull=False,
+                ),
+                PartidoSerializer,
+            ).order_by("-fechapartido", "-idpartido")[:ultimos]
+            return success_response(
+                message="Historial entre equipos",
+                data={
+                    "idequipo": pk,
+                    "idrival": rival,
+                    "resumen": resumen,
+                    "partidos": PartidoSerializer(partidos, many=True).data,
+                },
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
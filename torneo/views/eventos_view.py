@@ -0,0 +1,69 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.views import View
+from rest_framework import status
+
+from torneo.models import Partido, Temporada, Torneo
+from torneo.utils.difusion import difusor, evento_partido
+from torneo.utils.responses import error_response, render_as_json
+
+MODELOS = {"partido": Partido, "torneo": Torneo, "temporada": Temporada}
+
+
+def formato_sse(evento):
+    datos = json.dumps(evento, cls=DjangoJSONEncoder)
+    return (
+        f"event: {evento['tipo']}\n"
+        f"id: {evento['idpartido']}-{evento['version']}\n"
+        f"data: {datos}\n\n"
+    )
+
+
+class EventosView(View):
+    """
+    Transmite con Server-Sent Events los cambios de marcador y estado de los
+    partidos de un partido, torneo o temporada (``tipo``, fijado en urls.py).
+
+    Es una vista asíncrona: cada conexión abierta es una cola del difusor del
+    proceso (ver utils/difusion.py), no un hilo. Necesita un servidor ASGI;
+    con WSGI el flujo nunca termina de armarse.
+    """
+
+    tipo = None
+
+    async def get(self, request, pk):
+        if not await MODELOS[self.tipo].objects.filter(pk=pk).aexists():
+            return render_as_json(
+                error_response(
+                    message=f"{self.tipo.capitalize()} no encontrado",
+                    data=None,
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            )
+        response = StreamingHttpResponse(
+            self.eventos(pk), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Evita que un proxy (nginx) acumule el flujo antes de enviarlo.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def eventos(self, pk):
+        """
+        Se suscribe antes de leer el estado inicial, así no se pierde un cambio
+        que ocurra entre ambos. Si no hay eventos envía un comentario cada
+        EVENTOS_KEEPALIVE segundos para que los proxies no corten la conexión.
+        La suscripción se cierra cuando el cliente se desconecta.
+        """
+        with difusor.suscribir((self.tipo, pk)) as suscripcion:
+            yield f"retry: {int(settings.EVENTOS_KEEPALIVE * 1000)}\n\n"
+            if self.tipo == "partido":
+                partido = await Partido.objects.filter(pk=pk).afirst()
+                if partido is not None:
+                    yield formato_sse(evento_partido(partido, "estado"))
+            while True:
+                evento = await suscripcion.recibir(settings.EVENTOS_KEEPALIVE)
+                yield formato_sse(evento) if evento else ": keep-alive\n\n"
@@ -0,0 +1,64 @@
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Torneo
+from torneo.serializers import FixtureSerializer, PartidoSerializer
+from torneo.utils.carga_masiva import crear_lote
+from torneo.utils.fixture import generar_fixture, resolver_equipos
+from torneo.utils.format_serializer import format_serializer_errors
+from torneo.utils.responses import error_response, success_response
+
+
+class TorneoFixtureView(APIView):
+    def post(self, request, pk):
+        """
+        Genera y guarda el fixture todos contra todos de un torneo.
+
+        Parameters:
+        - pk (int): Identificador del torneo.
+        - equipos (list): Identificadores de los equipos participantes.
+        - idayvuelta (bool, opcional): Genera también la segunda vuelta.
+
+        Returns:
+        - response (dict): Los partidos creados, ordenados por ronda.
+        """
+        try:
+            torneo = get_object_or_404(
+                Torneo.objects.select_related("idtemporada"), pk=pk
+            )
+            serializer = FixtureSerializer(data=request.data)
+            if not serializer.is_valid():
+                return error_response(
+                    message="Errores de validación",
+                    data=format_serializer_errors(serializer.errors),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            try:
+                equipos = resolver_equipos(serializer.validated_data["equipos"])
+                partidos = generar_fixture(
+                    torneo, equipos, serializer.validated_data["idayvuelta"]
+                )
+            except ValueError as e:
+                return error_response(
+                    message=str(e), data=None, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            partidos = crear_lote(partidos)
+            return success_response(
+                message="Fixture generado correctamente",
+                data=PartidoSerializer(partidos, many=True).data,
+                status=status.HTTP_201_CREATED,
+            )
+        except Http404:
+            return error_response(
+                message="Torneo no encontrado",
+                data=None,
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -9,6 +9,7 @@ from rest_framework import status
 
 from torneo.views import paginate_queryset
 from torneo.utils.format_serializer import format_serializer_errors
+from torneo.utils.cache_vistas import cache_respuesta
 from torneo.utils.responses import error_response, success_response
 
 
@@ -55,6 +56,7 @@ class InstitucionListCreateView(APIView):
 
 
 class InstitucionDetailView(APIView):
+    @cache_respuesta(fila=Institucion)
     def get(self, request, pk):
         """
         Obtiene una institución por su pk.
@@ -86,6 +88,7 @@ class InstitucionDetailView(APIView):
 
 
 class InstitucionAllView(APIView):
+    @cache_respuesta(Institucion)
     def get(self, request):
         """
         Obtiene todas las instituciones.
@@ -0,0 +1,110 @@
+from itertools import groupby
+
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Equipo, Llave, Partido, Torneo
+from torneo.serializers import LlaveSerializer, ParticipantesSerializer
+from torneo.views import apply_select_related
+from torneo.utils.fixture import resolver_equipos
+from torneo.utils.format_serializer import format_serializer_errors
+from torneo.utils.llaves import generar_llaves
+from torneo.utils.cache_vistas import get_condicional
+from torneo.utils.responses import error_response, success_response
+
+
+def _cuadro(torneo_id, llaves):
+    """Agrupa las casillas (ya ordenadas por ronda y posición) por ronda."""
+    data = LlaveSerializer(llaves, many=True).data
+    return {
+        "idtorneo": torneo_id,
+        "rondas": [
+            {"ronda": ronda, "llaves": list(casillas)}
+            for ronda, casillas in groupby(data, key=lambda llave: llave["ronda"])
+        ],
+    }
+
+
+class TorneoLlavesView(APIView):
+    @get_condicional(Partido, Equipo, Torneo, Llave)
+    def get(self, request, pk):
+        """
+        Devuelve el cuadro de eliminación directa completo del torneo, agrupado
+        por ronda, con los equipos y el partido de cada casilla.
+        """
+        try:
+            torneo = get_object_or_404(Torneo, pk=pk)
+            llaves = apply_select_related(
+                Llave.objects.filter(idtorneo=torneo), LlaveSerializer
+            ).order_by("ronda", "posicion")
+            return success_response(
+                message="Cuadro encontrado",
+                data=_cuadro(torneo.idtorneo, llaves),
+                status=status.HTTP_200_OK,
+            )
+        except Http404:
+            return error_response(
+                message="Torneo no encontrado",
+                data=None,
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def post(self, request, pk):
+        """
+        Genera el cuadro de eliminación directa del torneo y los partidos de la
+        primera ronda.
+
+        Parameters:
+        - pk (int): Identificador del torneo.
+        - equipos (list): Identificadores de los equipos en orden de siembra.
+
+        Returns:
+        - response (dict): El cuadro creado, con el mismo formato que el GET.
+        """
+        try:
+            torneo = get_object_or_404(
+                Torneo.objects.select_related("idtemporada"), pk=pk
+            )
+            serializer = ParticipantesSerializer(data=request.data)
+            if not serializer.is_valid():
+                return error_response(
+                    message="Errores de validación",
+                    data=format_serializer_errors(serializer.errors),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if Llave.objects.filter(idtorneo=torneo).exists():
+                return error_response(
+                    message="El torneo ya tiene un cuadro de eliminación",
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            try:
+                equipos = resolver_equipos(serializer.validated_data["equipos"])
+                llaves = generar_llaves(torneo, equipos)
+            except ValueError as e:
+                return error_response(
+                    message=str(e), data=None, status=status.HTTP_400_BAD_REQUEST
+                )
+
+            return success_response(
+                message="Cuadro generado correctamente",
+                data=_cuadro(torneo.idtorneo, llaves),
+                status=status.HTTP_201_CREATED,
+            )
+        except Http404:
+            return error_response(
+                message="Torneo no encontrado",
+                data=None,
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -1,14 +1,57 @@
+import base64
+import json
 from math import ceil
+from django.http import HttpResponse
 from rest_framework import status
 
-from torneo.utils.responses import error_response, pagination_response
+from torneo.utils.lectura import plan_lectura
+from torneo.utils.responses import (
+    cursor_pagination_response,
+    error_response,
+    pagination_response,
+)
+
+
+def apply_select_related(queryset, serializer_class):
+    """
+    Aplica lo declarado por el serializador en su Meta:
+
+    - select_related: los campos relacionados (StringRelatedField, etc.) se cargan
+      en el mismo JOIN en lugar de una consulta adicional por fila.
+    - defer: columnas pesadas que el serializador no necesita leer.
+    """
+    meta = getattr(serializer_class, "Meta", None)
+    related = getattr(meta, "select_related", ())
+    deferred = getattr(meta, "defer", ())
+    if related:
+        queryset = queryset.select_related(*related)
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    return queryset
 
 
 def paginate_queryset(queryset, serializer_class, request):
-    """Aplica paginación con parámetros opcionales: ?page=N&offset=M"""
+    """
+    Aplica paginación con parámetros opcionales.
+
+    - Modo página: ?page=N&offset=M (por defecto, compatible con clientes antiguos).
+    - Modo cursor: ?cursor=<opaco>&offset=M. Un cursor vacío (?cursor=) pide la
+      primera página. Busca por la clave de ordenamiento en vez de usar OFFSET.
+
+    En ambos modos ?count=false omite el conteo total. En modo cursor el conteo
+    solo se calcula si se pide explícitamente con ?count=true.
+
+    En modo página, ?render=db hace que PostgreSQL arme el JSON de la página
+    (ver PlanLectura.json_postgres) y se envía tal cual. Con otra base, o con
+    serializadores sin Meta.valores, se responde como siempre.
+    """
+    queryset = apply_select_related(queryset, serializer_class)
     try:
-        page = int(request.query_params.get("page", 1))
         offset = int(request.query_params.get("offset", 10))
+        if "cursor" in request.query_params:
+            page = 1
+        else:
+            page = int(request.query_params.get("page", 1))
 
         if page < 1 or offset < 1:
             return error_response(
@@ -21,17 +64,143 @@ def paginate_queryset(queryset, serializer_class, request):
             message="Paginación inválida", data=None, status=status.HTTP_400_BAD_REQUEST
         )
 
-    total = queryset.count()
+    if "cursor" in request.query_params:
+        return _paginate_cursor(queryset, serializer_class, request, offset)
+
+    include_count = _parse_count(request, default=True)
+    total = queryset.count() if include_count else None
     start = (page - 1) * offset
     end = start + offset
     paginated = queryset[start:end]
+    pages = ceil(total / offset) if total is not None else None
+
+    plan = plan_lectura(serializer_class)
+    if plan is not None and request.query_params.get("render") == "db":
+        contenido = plan.json_postgres(
+            paginated, count=total, page=page, offset=offset, pages=pages
+        )
+        if contenido is not None:
+            return HttpResponse(contenido, content_type="application/json")
 
-    serializer = serializer_class(paginated, many=True)
     return pagination_response(
-        data=serializer.data,
+        data=_serializar(paginated, serializer_class, request),
         page=page,
         offset=offset,
-        pages=ceil(total / offset) if offset > 0 else 1,
+        pages=pages,
+        total_items=total,
+        status=status.HTTP_200_OK,
+    )
+
+
+def _serializar(queryset, serializer_class, request):
+    """
+    Datos de la página: con values_list() si el serializador declara
+    Meta.valores (ver utils/lectura.py) y, si no, con el serializador.
+    """
+    plan = plan_lectura(serializer_class)
+    if plan is not None:
+        return plan.leer(queryset)
+    return serializer_class(queryset, many=True, context={"request": request}).data
+
+
+def _parse_count(request, default):
+    value = request.query_params.get("count")
+    if value is None:
+        return default
+    return value.lower() not in ("0", "false", "no")
+
+
+def _ordering_key(queryset):
+    """
+    Devuelve (campo, descendente) de la clave de búsqueda del cursor.
+
+    Solo se admite ordenar por la clave primaria (idpartido, idequipo, ...), que es
+    única y tiene índice; sin orden se usa la clave primaria ascendente. Con otro
+    orden (por ejemplo, la relevancia de una búsqueda) lanza ValueError: recorrer
+    por la clave primaria devolvería los resultados en otro orden.
+    """
+    pk_name = queryset.model._meta.pk.name
+    order_by = queryset.query.order_by
+    if not order_by:
+        return pk_name, False
+    if len(order_by) == 1 and order_by[0].lstrip("-") in (pk_name, "pk"):
+        return pk_name, order_by[0].startswith("-")
+    raise ValueError("El modo cursor solo admite listados ordenados por clave primaria")
+
+
+def encode_cursor(value, direction):
+    raw = json.dumps({"v": value, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decodifica un cursor opaco. Lanza ValueError si no es válido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value, direction = data["v"], data["d"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Cursor inválido")
+    if not isinstance(value, int) or direction not in ("next", "prev"):
+        raise ValueError("Cursor inválido")
+    return value, direction
+
+
+def _paginate_cursor(queryset, serializer_class, request, offset):
+    cursor = request.query_params.get("cursor", "").strip()
+    try:
+        value, direction = decode_cursor(cursor) if cursor else (None, "next")
+    except ValueError:
+        return error_response(
+            message="Cursor inválido", data=None, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        field, descending = _ordering_key(queryset)
+    except ValueError as e:
+        return error_response(
+            message=str(e), data=None, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    include_count = _parse_count(request, default=False)
+    total = queryset.count() if include_count else None
+
+    forward = direction == "next"
+    # Al retroceder se recorre el índice en sentido inverso y luego se invierte.
+    ascending = forward != descending
+    page = queryset.order_by(field if ascending else f"-{field}")
+    if value is not None:
+        lookup = "gt" if ascending else "lt"
+        page = page.filter(**{f"{field}__{lookup}": value})
+
+    plan = plan_lectura(serializer_class)
+    if plan is not None and field in plan.nombres:
+        rows = plan.leer(page[: offset + 1])
+        clave = dict.get
+    else:
+        plan = None
+        rows = list(page[: offset + 1])
+        clave = getattr
+    has_more = len(rows) > offset
+    rows = rows[:offset]
+    if not forward:
+        rows.reverse()
+
+    next_cursor = previous_cursor = None
+    if rows:
+        first, last = clave(rows[0], field), clave(rows[-1], field)
+        if has_more or not forward:
+            next_cursor = encode_cursor(last, "next")
+        if value is not None and (forward or has_more):
+            previous_cursor = encode_cursor(first, "prev")
+
+    if plan is None:
+        rows = serializer_class(rows, many=True, context={"request": request}).data
+    return cursor_pagination_response(
+        data=rows,
+        offset=offset,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
         total_items=total,
         status=status.HTTP_200_OK,
     )
@@ -1,15 +1,25 @@
+from django.conf import settings
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
-from rest_framework import status
-from django.db.models import Q
-
-from torneo.models import Partido
-from torneo.serializers import PartidoSerializer
-from torneo.views import paginate_queryset
+from rest_framework import serializers, status
+
+from torneo.models import Equipo, Partido, Temporada, Torneo
+from torneo.serializers import MarcadorSerializer, PartidoSerializer
+from torneo.views import apply_select_related, paginate_queryset
+from torneo.utils.carga_masiva import crear_lote, validar_lote
+from torneo.utils.llaves import CuadroJugado, SinHorario
+from torneo.utils.marcador import VersionDesactualizada, actualizar_marcador
+from torneo.utils.cache_vistas import cache_respuesta, get_condicional
 from torneo.utils.responses import error_response, success_response
+from torneo.utils.search import buscar_partidos
 from torneo.utils.format_serializer import format_serializer_errors
 
+# ``version`` opcional del PATCH completo (ver PartidoUpdateView).
+VERSION = serializers.IntegerField(min_value=0, allow_null=True, required=False)
+
 
 class PartidoListCreateView(APIView):
     def post(self, request):
@@ -32,7 +42,8 @@ class PartidoListCreateView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            partido = serializer.save()
+            with transaction.atomic():
+                partido = serializer.save()
             return success_response(
                 message="Partido creado correctamente",
                 status=status.HTTP_201_CREATED,
@@ -44,7 +55,59 @@ class PartidoListCreateView(APIView):
             )
 
 
+class PartidoBulkCreateView(APIView):
+    def post(self, request):
+        """
+        Crea varios partidos en una sola petición.
+
+        Parameters:
+        - request (list): Lista de partidos con los mismos campos que la creación
+          individual.
+
+        Returns:
+        - response (dict): Los partidos creados o, si algún elemento no es válido,
+          la lista de errores por índice. En ese caso no se crea ninguno.
+        """
+        try:
+            elementos = request.data
+            if not isinstance(elementos, list) or not elementos:
+                return error_response(
+                    message="Se esperaba una lista de partidos",
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if len(elementos) > settings.PARTIDOS_LOTE_MAX:
+                return error_response(
+                    message=(
+                        f"Se admiten como máximo {settings.PARTIDOS_LOTE_MAX} "
+                        "partidos por petición"
+                    ),
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            partidos, errores = validar_lote(elementos)
+            if errores:
+                return error_response(
+                    message="Errores de validación",
+                    data=errores,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            partidos = crear_lote(partidos)
+            return success_response(
+                message="Partidos creados correctamente",
+                status=status.HTTP_201_CREATED,
+                data=PartidoSerializer(partidos, many=True).data,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class PartidoByTemporadas(APIView):
+    @cache_respuesta(Partido, Equipo, Torneo, Temporada)
     def get(self, request):
         try:
             temporadaId = request.query_params.get("temporadaId", "").strip()
@@ -65,21 +128,15 @@ class PartidoByTemporadas(APIView):
 
 
 class PartidoSearchView(APIView):
+    @get_condicional(Partido, Equipo, Torneo, Temporada)
     def get(self, request):
+        """
+        Busca partidos por nombre de equipo, torneo o temporada (?search=),
+        sin distinguir mayúsculas ni tildes. Ver torneo.utils.search.
+        """
         try:
             search = request.query_params.get("search", "").strip()
-
-            partidos = Partido.objects.all()
-
-            if search:
-                partidos = partidos.filter(
-                    Q(idequipolocal__nombreequipo__icontains=search)
-                    | Q(idequipovisitante__nombreequipo__icontains=search)
-                    | Q(idtorneo__nombretorneo__icontains=search)
-                    | Q(idtemporada__nombretemporada__icontains=search)
-                )
-
-            partidos = partidos.order_by("idpartido")
+            partidos = buscar_partidos(Partido.objects.all(), search)
 
             return paginate_queryset(
                 partidos,
@@ -106,8 +163,11 @@ class PartidoDetailView(APIView):
         Returns:
         - partido (Partido): Partido asociado con el pk.
         """
-        return Partido.objects.filter(pk=pk).first()
+        return apply_select_related(
+            Partido.objects.filter(pk=pk), PartidoSerializer
+        ).first()
 
+    @cache_respuesta(Equipo, Torneo, Temporada, fila=Partido)
     def get(self, request, pk):
         try:
             partido = self.get_object(pk)
@@ -129,6 +189,7 @@ class PartidoDetailView(APIView):
 
 
 class PartidoAllView(APIView):
+    @cache_respuesta(Partido, Equipo, Torneo, Temporada)
     def get(self, request):
         """
         Obtiene todos los partidos.
@@ -157,29 +218,125 @@ class PartidoUpdateView(APIView):
 
         Returns:
         - response (dict): Contiene el mensaje de exito y el partido actualizado.
+          Si se envía ``version`` y el partido ya no está en esa versión, 409
+          con el estado actual del partido, como en /marcador/.
         """
+        # Un cuerpo que no es un objeto lo rechaza el serializador con 400.
+        datos = request.data if isinstance(request.data, dict) else {}
         try:
-            partido = Partido.objects.filter(pk=pk).first()
-            if not partido:
-                return error_response(
-                    message="Partido no encontrado",
-                    data=None,
-                    status=status.HTTP_404_NOT_FOUND,
-                )
+            version = VERSION.run_validation(datos.get("version"))
+        except ValidationError as e:
+            return error_response(
+                message="Errores de validación",
+                data=format_serializer_errors({"version": e.detail}),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            # La fila queda bloqueada hasta guardar: el marcador, la versión y
+            # la diferencia que se aplica a las posiciones salen del estado
+            # actual y no de uno leído antes de otra escritura.
+            with transaction.atomic():
+                partido = apply_select_related(
+                    Partido.objects.select_for_update(of=("self",)).filter(pk=pk),
+                    PartidoSerializer,
+                ).first()
+                if not partido:
+                    return error_response(
+                        message="Partido no encontrado",
+                        data=None,
+                        status=status.HTTP_404_NOT_FOUND,
+                    )
+                if version is not None and version != partido.version:
+                    raise VersionDesactualizada(partido)
+
+                serializer = PartidoSerializer(partido, data=request.data, partial=True)
+                if not serializer.is_valid():
+                    return error_response(
+                        message="Errores de validación",
+                        data=format_serializer_errors(serializer.errors),
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                serializer.save()
+            return success_response(
+                message="Partido actualizado correctamente",
+                data=serializer.data,
+                status=status.HTTP_200_OK,
+            )
+        except VersionDesactualizada as e:
+            return error_response(
+                message=str(e),
+                data=PartidoSerializer(e.partido).data,
+                status=status.HTTP_409_CONFLICT,
+            )
+        except (SinHorario, CuadroJugado) as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_409_CONFLICT
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+def _marcador(partido):
+    return {
+        "idpartido": partido.idpartido,
+        "marcadorequipolocal": partido.marcadorequipolocal,
+        "marcadorequipovisitante": partido.marcadorequipovisitante,
+        "version": partido.version,
+    }
 
-            serializer = PartidoSerializer(partido, data=request.data, partial=True)
+
+class PartidoMarcadorView(APIView):
+    def patch(self, request, pk):
+        """
+        Actualiza solo el marcador de un partido, para la carga en vivo.
+
+        No repite la validación completa del partido (fechas del torneo,
+        choques de horario, equipos): valida únicamente el marcador y lo guarda
+        con un UPDATE condicional (ver utils/marcador.py).
+
+        Parameters:
+        - request (dict): marcadorequipolocal / marcadorequipovisitante para
+          fijar un valor, sumarlocal / sumarvisitante para incrementarlo y,
+          opcionalmente, la version del partido que conoce el cliente.
+        - pk (int): Pk del partido a actualizar.
+
+        Returns:
+        - response (dict): El marcador y la versión nuevos. Si la versión no
+          coincide, 409 con el estado actual del partido.
+        """
+        try:
+            serializer = MarcadorSerializer(data=request.data)
             if not serializer.is_valid():
                 return error_response(
                     message="Errores de validación",
                     data=format_serializer_errors(serializer.errors),
                     status=status.HTTP_400_BAD_REQUEST,
                 )
-            serializer.save()
+
+            partido = actualizar_marcador(pk, serializer.validated_data)
             return success_response(
-                message="Partido actualizado correctamente",
-                data=serializer.data,
+                message="Marcador actualizado correctamente",
+                data=_marcador(partido),
                 status=status.HTTP_200_OK,
             )
+        except VersionDesactualizada as e:
+            return error_response(
+                message=str(e),
+                data=_marcador(e.partido),
+                status=status.HTTP_409_CONFLICT,
+            )
+        except (SinHorario, CuadroJugado) as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_409_CONFLICT
+            )
+        except Http404:
+            return error_response(
+                message="Partido no encontrado",
+                data=None,
+                status=status.HTTP_404_NOT_FOUND,
+            )
         except Exception as e:
             return error_response(
                 message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -199,21 +356,18 @@ class PartidoDeleteView(APIView):
         - response (dict): Contiene el mensaje de exito y el partido eliminado.
         """
         try:
-            partido = get_object_or_404(Partido, pk=pk)
-
-            if not partido:
-                return error_response(
-                    message="Partido no encontrado",
-                    data=None,
-                    status=status.HTTP_404_NOT_FOUND,
-                )
-
-            if partido.partidosubido:
-                return error_response(
-                    message="No se puede eliminar el partido porque ya ha sido analizado.",
-                    data=None,
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+            # Como en PartidoUpdateView: la fila queda bloqueada hasta borrarla
+            # y lo que se descuenta de las posiciones es el resultado actual.
+            with transaction.atomic():
+                partido = get_object_or_404(Partido.objects.select_for_update(), pk=pk)
+
+                if partido.partidosubido:
+                    return error_response(
+                        message="No se puede eliminar el partido porque ya ha sido analizado.",
+                        data=None,
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+                partido.delete()
 
             return success_response(
                 message="Partido eliminado correctamente",
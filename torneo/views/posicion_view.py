@@ -0,0 +1,51 @@
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Equipo, Partido, Posicion, Torneo
+from torneo.serializers import PosicionSerializer
+from torneo.views import apply_select_related
+from torneo.utils.desempate import ordenar_posiciones
+from torneo.utils.cache_vistas import get_condicional
+from torneo.utils.responses import error_response, success_response
+
+
+class TorneoPosicionesView(APIView):
+    @get_condicional(Partido, Equipo, Torneo, Posicion)
+    def get(self, request, pk):
+        """
+        Devuelve la tabla de posiciones del torneo, ordenada por puntos y luego
+        por los criterios de desempate del torneo (ver utils/desempate.py).
+
+        La tabla está materializada (ver utils/posiciones.py), así que se lee con
+        una sola consulta; solo si un empate llega a un criterio de resultados
+        directos se lee además la matriz de resultados del torneo.
+        """
+        try:
+            posiciones = list(
+                apply_select_related(
+                    Posicion.objects.filter(idtorneo=pk), PosicionSerializer
+                )
+                .select_related("idtorneo")
+                .order_by("-puntos", "-diferenciagoles", "-golesfavor", "idequipo")
+            )
+            if posiciones:
+                posiciones = ordenar_posiciones(posiciones[0].idtorneo, posiciones)
+            data = PosicionSerializer(posiciones, many=True).data
+            if not data and not Torneo.objects.filter(pk=pk).exists():
+                return error_response(
+                    message="Torneo no encontrado",
+                    data=None,
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            for numero, fila in enumerate(data, start=1):
+                fila["posicion"] = numero
+            return success_response(
+                message="Tabla de posiciones",
+                data=data,
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
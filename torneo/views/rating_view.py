@@ -0,0 +1,73 @@
+from django.db.models import OuterRef, Subquery
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Equipo, Partido, Rating
+from torneo.serializers import RatingSerializer
+from torneo.views import apply_select_related
+from torneo.utils.cache_vistas import get_condicional
+from torneo.utils.responses import error_response, success_response
+
+
+class RatingListView(APIView):
+    @get_condicional(Partido, Equipo, Rating)
+    def get(self, request):
+        """
+        Devuelve el ranking de equipos por su rating Elo actual, del más alto
+        al más bajo. Solo aparecen los equipos con algún partido jugado.
+
+        El rating actual es la última fila de cada equipo; se busca con una
+        subconsulta por equipo sobre rating_equipo_fecha_idx, todo en una sola
+        consulta.
+        """
+        try:
+            ultimo = (
+                Rating.objects.filter(idequipo=OuterRef("pk"))
+                .order_by("-fechapartido", "-idpartido")
+                .values("idrating")[:1]
+            )
+            actuales = Equipo.objects.annotate(ultimo=Subquery(ultimo)).values("ultimo")
+            ratings = apply_select_related(
+                Rating.objects.filter(idrating__in=actuales), RatingSerializer
+            ).order_by("-rating", "idequipo")
+            data = RatingSerializer(ratings, many=True).data
+            for numero, fila in enumerate(data, start=1):
+                fila["posicion"] = numero
+            return success_response(
+                message="Ranking de ratings",
+                data=data,
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class EquipoRatingsView(APIView):
+    @get_condicional(Partido, Equipo, Rating)
+    def get(self, request, pk):
+        """
+        Devuelve la evolución del rating Elo del equipo: una fila por partido
+        jugado, del más antiguo al más reciente.
+        """
+        try:
+            ratings = apply_select_related(
+                Rating.objects.filter(idequipo=pk), RatingSerializer
+            ).order_by("fechapartido", "idpartido")
+            data = RatingSerializer(ratings, many=True).data
+            if not data and not Equipo.objects.filter(pk=pk).exists():
+                return error_response(
+                    message="Equipo no encontrado",
+                    data=None,
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+            return success_response(
+                message="Ratings del equipo",
+                data=data,
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
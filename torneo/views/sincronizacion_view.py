@@ -0,0 +1,57 @@
+from rest_framework.views import APIView
+from rest_framework import status
+
+from torneo.models import Equipo, Institucion, Partido, Temporada, Torneo
+from torneo.utils.cache_vistas import get_condicional
+from torneo.utils.responses import error_response, success_response
+from torneo.utils.sincronizacion import cambios_desde
+
+LIMITE_POR_DEFECTO = 1000
+LIMITE_MAX = 5000
+
+
+class SincronizacionView(APIView):
+    @get_condicional(Institucion, Temporada, Torneo, Equipo, Partido)
+    def get(self, request):
+        """
+        Devuelve lo que cambió en instituciones, temporadas, torneos, equipos y
+        partidos después de una versión, para mantener una copia local sin
+        volver a descargar todo.
+
+        Parameters:
+        - since (int, opcional): Última versión que tiene el cliente (0 por
+          defecto: todo).
+        - limit (int, opcional): Cambios por respuesta (1000 por defecto, 5000
+          como máximo).
+
+        Cada cambio trae la fila completa o, si se borró, ``eliminado`` en
+        verdadero y ``datos`` en null. Mientras ``mas`` sea verdadero, el
+        cliente repite la petición con ``since`` igual a la ``version``
+        devuelta.
+        """
+        try:
+            try:
+                since = int(request.query_params.get("since", 0))
+                limite = int(request.query_params.get("limit", LIMITE_POR_DEFECTO))
+            except ValueError:
+                since = limite = -1
+            if since < 0 or not 1 <= limite <= LIMITE_MAX:
+                return error_response(
+                    message=(
+                        "'since' no puede ser negativo y 'limit' debe estar "
+                        f"entre 1 y {LIMITE_MAX}"
+                    ),
+                    data=None,
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            cambios, version, mas = cambios_desde(since, limite)
+            return success_response(
+                message="Cambios desde la versión",
+                data={"version": version, "mas": mas, "cambios": cambios},
+                status=status.HTTP_200_OK,
+            )
+        except Exception as e:
+            return error_response(
+                message=str(e), data=None, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -6,6 +6,7 @@ from torneo.models import Temporada
 from torneo.serializers import TemporadaSerializer
 from torneo.utils.format_serializer import format_serializer_errors
 from torneo.views import paginate_queryset
+from torneo.utils.cache_vistas import cache_respuesta
 from torneo.utils.responses import error_response, success_response
 
 
@@ -43,6 +44,7 @@ class TemporadaListCreateView(APIView):
 
 
 class TemporadaDetailView(APIView):
+    @cache_respuesta(fila=Temporada)
     def get(self, request, pk):
         """
         Obtiene una temporada por su pk.
@@ -74,6 +76,7 @@ class TemporadaDetailView(APIView):
 
 
 class TemporadaAllView(APIView):
+    @cache_respuesta(Temporada)
     def get(self, request):
         """
         Obtiene todas las temporadas.
@@ -2,9 +2,10 @@ from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework import status
 
-from torneo.models import Torneo
+from torneo.models import Temporada, Torneo
 from torneo.serializers import TorneoSerializer
-from torneo.views import paginate_queryset
+from torneo.views import apply_select_related, paginate_queryset
+from torneo.utils.cache_vistas import cache_respuesta
 from torneo.utils.responses import error_response, success_response
 from torneo.utils.format_serializer import format_serializer_errors
 
@@ -52,8 +53,11 @@ class TorneoDetailView(APIView):
         Returns:
         - torneo (Torneo): Torneo asociado con el pk.
         """
-        return Torneo.objects.filter(pk=pk).first()
+        return apply_select_related(
+            Torneo.objects.filter(pk=pk), TorneoSerializer
+        ).first()
 
+    @cache_respuesta(Temporada, fila=Torneo)
     def get(self, request, pk):
         """
         Obtiene un torneo por su pk.
@@ -81,6 +85,7 @@ class TorneoDetailView(APIView):
 
 
 class TorneoAllView(APIView):
+    @cache_respuesta(Torneo, Temporada)
     def get(self, request):
         """
         Obtiene todos los torneos.
@@ -111,7 +116,9 @@ class TorneoUpdateView(APIView):
         - response (dict): Contiene el mensaje de exito y el torneo actualizado.
         """
         try:
-            torneo = Torneo.objects.filter(pk=pk).first()
+            torneo = apply_select_related(
+                Torneo.objects.filter(pk=pk), TorneoSerializer
+            ).first()
             if not torneo:
                 raise Exception("Torneo no encontrado")
 